@@ -0,0 +1,2 @@
+# DESCRIPTION Benchmark check and release commands with synthetic packages
+& $env:MECO_PYTHON_EXECUTABLE_PATH -c "import mMecoRelease.cliLib;mMecoRelease.cliLib.benchmark()" $args
\ No newline at end of file
@@ -1,2 +1,2 @@
 # DESCRIPTION Check all packages to determine whether they are suitable for release
-& $env:MECO_PYTHON_EXECUTABLE_PATH -c "import mMecoRelease.releaseCmd;mMecoRelease.releaseCmd.checkAll()" $args
\ No newline at end of file
+& $env:MECO_PYTHON_EXECUTABLE_PATH -c "import mMecoRelease.cliLib;mMecoRelease.cliLib.checkAll()" $args
\ No newline at end of file
@@ -1,2 +1,2 @@
 # DESCRIPTION Check a package to determine whether its suitable for release
-& $env:MECO_PYTHON_EXECUTABLE_PATH -c "import mMecoRelease.releaseCmd;mMecoRelease.releaseCmd.check()" $args
\ No newline at end of file
+& $env:MECO_PYTHON_EXECUTABLE_PATH -c "import mMecoRelease.cliLib;mMecoRelease.cliLib.check()" $args
\ No newline at end of file
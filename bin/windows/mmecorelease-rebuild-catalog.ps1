@@ -0,0 +1,2 @@
+# DESCRIPTION Rebuild release catalogs from released packages
+& $env:MECO_PYTHON_EXECUTABLE_PATH -c "import mMecoRelease.cliLib;mMecoRelease.cliLib.rebuildCatalog()" $args
\ No newline at end of file
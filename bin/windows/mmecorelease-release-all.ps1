@@ -1,2 +1,2 @@
 # DESCRIPTION Release all packages in development environment via command line
-& $env:MECO_PYTHON_EXECUTABLE_PATH -c "import mMecoRelease.releaseCmd;mMecoRelease.releaseCmd.releaseAll()" $args
\ No newline at end of file
+& $env:MECO_PYTHON_EXECUTABLE_PATH -c "import mMecoRelease.cliLib;mMecoRelease.cliLib.releaseAll()" $args
\ No newline at end of file
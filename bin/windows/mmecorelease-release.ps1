@@ -1,2 +1,2 @@
 # DESCRIPTION Release a package in development environment via command line
-& $env:MECO_PYTHON_EXECUTABLE_PATH -c "import mMecoRelease.releaseCmd;mMecoRelease.releaseCmd.release()" $args
\ No newline at end of file
+& $env:MECO_PYTHON_EXECUTABLE_PATH -c "import mMecoRelease.cliLib;mMecoRelease.cliLib.release()" $args
\ No newline at end of file
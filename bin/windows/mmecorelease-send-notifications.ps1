@@ -0,0 +1,2 @@
+# DESCRIPTION Send release notifications queued in the outbox
+& $env:MECO_PYTHON_EXECUTABLE_PATH -c "import mMecoRelease.cliLib;mMecoRelease.cliLib.sendNotifications()" $args
\ No newline at end of file
@@ -0,0 +1,297 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/archiveLib.py @brief [ FILE   ] - Release archive module.
+## @package mMecoRelease.archiveLib    @brief [ MODULE ] - Release archive module.
+#
+#  A released version can have all of its files in a single zip archive, which is cheaper to ship
+#  than many small files. Central directory of the archive is its index, so each file can be read
+#  or extracted without reading the others.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORTS
+# ----------------------------------------------------------------------------------------------------
+import os
+import stat
+import time
+import shutil
+import zipfile
+
+import mFileSystem.directoryLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ str ] - Name of the archive file written into each released version.
+ARCHIVE_FILE_NAME  = '.mecoReleaseArchive.zip'
+
+## [ tuple ] - Earliest time zip format can represent.
+ZIP_EPOCH          = (1980, 1, 1, 0, 0, 0)
+
+#
+## @brief Get path of the archive file of given released version.
+#
+#  @param versionPath [ str | None | in  ] - Path of a released version.
+#
+#  @exception N/A
+#
+#  @return str - Path.
+def getArchiveFile(versionPath):
+
+    return mFileSystem.directoryLib.Directory.join(versionPath, ARCHIVE_FILE_NAME)
+
+#
+## @brief Get name of an archive member, members are separated by slashes on every platform.
+#
+#  @param relativePath [ str | None | in  ] - Relative path of a release file.
+#
+#  @exception N/A
+#
+#  @return str - Name.
+def getMemberName(relativePath):
+
+    return relativePath.replace(os.sep, '/')
+
+#
+## @brief [ CLASS ] - Class that writes release files into an archive as they are released.
+class ArchiveWriter(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param path [ str | None | in  ] - Path of the archive file.
+    #
+    #  @exception IOError - If the file can not be created.
+    #
+    #  @return None - None.
+    def __init__(self, path):
+
+        ## [ str ] - Path of the archive file.
+        self._path    = path
+
+        ## [ zipfile.ZipFile ] - Archive.
+        self._zipFile = zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED, allowZip64=True)
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Add a file to the archive, content is streamed in chunks.
+    #
+    #  @param relativePath [ str | None | in  ] - Relative path of the file in the release.
+    #  @param absolutePath [ str | None | in  ] - Path of the file to read.
+    #
+    #  @exception IOError - If the file can not be read or the archive can not be written.
+    #
+    #  @return None - None.
+    def addFile(self, relativePath, absolutePath):
+
+        try:
+            self._zipFile.write(absolutePath, getMemberName(relativePath))
+            return
+        except ValueError:
+            # Files older than zip epoch can not be written with their own time
+            pass
+
+        fileStat           = os.stat(absolutePath)
+        info               = zipfile.ZipInfo(getMemberName(relativePath), ZIP_EPOCH)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = (stat.S_IMODE(fileStat.st_mode) | stat.S_IFREG) << 16
+
+        with open(absolutePath, 'rb') as sourceFile:
+            self._zipFile.writestr(info, sourceFile.read())
+
+    #
+    ## @brief Write the index and close the archive, archive is made read only.
+    #
+    #  @exception IOError - If the archive can not be written.
+    #
+    #  @return None - None.
+    def close(self):
+
+        self._zipFile.close()
+
+        os.chmod(self._path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+
+    #
+    ## @brief Close and remove the archive.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def abort(self):
+
+        try:
+            self._zipFile.close()
+        except (IOError, OSError, ValueError):
+            pass
+
+        if os.path.exists(self._path):
+            os.remove(self._path)
+
+#
+## @brief [ CLASS ] - Class to read files of a released version from its archive.
+class ReleaseArchive(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor, index of the archive is read once.
+    #
+    #  @param path [ str | None | in  ] - Path of the archive file, or of a released version that has one.
+    #
+    #  @exception IOError            - If the archive can not be read.
+    #  @exception zipfile.BadZipfile - If the file is not a valid archive.
+    #
+    #  @return None - None.
+    def __init__(self, path):
+
+        if os.path.isdir(path):
+            path = getArchiveFile(path)
+
+        ## [ str ] - Path of the archive file.
+        self._path    = path
+
+        ## [ zipfile.ZipFile ] - Archive.
+        self._zipFile = zipfile.ZipFile(path, 'r')
+
+    #
+    ## @brief Enter a with statement.
+    #
+    #  @exception N/A
+    #
+    #  @return mMecoRelease.archiveLib.ReleaseArchive - This instance.
+    def __enter__(self):
+
+        return self
+
+    #
+    ## @brief Exit a with statement, archive is closed.
+    #
+    #  @param args [ list | None | in  ] - Exception type, value and traceback.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - False so exceptions are propagated.
+    def __exit__(self, *args):
+
+        self.close()
+
+        return False
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Get path of the archive file.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Path.
+    def path(self):
+
+        return self._path
+
+    #
+    ## @brief Get relative paths of the files in the archive.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Relative paths with slashes, sorted.
+    def files(self):
+
+        return sorted(self._zipFile.namelist())
+
+    #
+    ## @brief Get size of a file in the archive.
+    #
+    #  @param relativePath [ str | None | in  ] - Relative path of the file.
+    #
+    #  @exception KeyError - If the file is not in the archive.
+    #
+    #  @return int - Uncompressed size in bytes.
+    def getSize(self, relativePath):
+
+        return self._zipFile.getinfo(getMemberName(relativePath)).file_size
+
+    #
+    ## @brief Read a file from the archive.
+    #
+    #  @param relativePath [ str | None | in  ] - Relative path of the file.
+    #
+    #  @exception KeyError - If the file is not in the archive.
+    #
+    #  @return bytes - Content.
+    def read(self, relativePath):
+
+        return self._zipFile.read(getMemberName(relativePath))
+
+    #
+    ## @brief Extract a file from the archive.
+    #
+    #  @param relativePath [ str | None | in  ] - Relative path of the file.
+    #  @param directory    [ str | None | in  ] - Directory the file is extracted into along with its relative path.
+    #
+    #  @exception KeyError   - If the file is not in the archive.
+    #  @exception ValueError - If the relative path points outside of the directory.
+    #  @exception IOError    - If the file can not be written.
+    #
+    #  @return str - Path of the extracted file.
+    def extract(self, relativePath, directory):
+
+        info            = self._zipFile.getinfo(getMemberName(relativePath))
+        destinationFile = os.path.normpath(mFileSystem.directoryLib.Directory.join(directory, relativePath))
+
+        if os.path.isabs(relativePath) or not destinationFile.startswith(os.path.join(os.path.normpath(directory), '')):
+            raise ValueError('File would be extracted outside of the directory: {}'.format(relativePath))
+
+        if not os.path.isdir(os.path.dirname(destinationFile)):
+            os.makedirs(os.path.dirname(destinationFile))
+
+        with self._zipFile.open(info) as sourceFile, open(destinationFile, 'wb') as extractedFile:
+            shutil.copyfileobj(sourceFile, extractedFile)
+
+        modificationTime = time.mktime(info.date_time + (0, 0, -1))
+        os.utime(destinationFile, (modificationTime, modificationTime))
+
+        mode = info.external_attr >> 16
+        if mode:
+            os.chmod(destinationFile, stat.S_IMODE(mode))
+
+        return destinationFile
+
+    #
+    ## @brief Close the archive.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def close(self):
+
+        self._zipFile.close()
@@ -0,0 +1,729 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/benchmarkLib.py @brief [ FILE   ] - Benchmark module.
+## @package mMecoRelease.benchmarkLib    @brief [ MODULE ] - Benchmark module.
+#
+#  Synthetic packages are generated in a temporary development environment with temporary release
+#  roots, then check, check all, release and release all are timed end to end. Results are written
+#  as JSON so runs of different versions can be compared.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORTS
+# ----------------------------------------------------------------------------------------------------
+import os
+import sys
+import json
+import math
+import time
+import random
+import getpass
+import platform
+import tempfile
+
+import mMecoRelease.cacheLib
+import mMecoRelease.cliLib
+import mMecoRelease.daemonLib
+import mMecoRelease.outboxLib
+import mMecoRelease.packageInfoLib
+import mMecoRelease.versionLib
+
+import mMecoSettings.envVariablesLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ int ] - Format version of the result file.
+BENCHMARK_FORMAT    = 1
+
+## [ list of str ] - Scenarios in the order they are run.
+SCENARIOS           = ['check', 'checkAll', 'release', 'releaseAll']
+
+## [ str ] - Prefix of the names of the generated packages.
+PACKAGE_NAME_PREFIX = 'mBenchmark'
+
+## [ str ] - Version of the generated packages.
+PACKAGE_VERSION     = '1.0.0'
+
+## [ str ] - Content of the package info module of the generated packages.
+PACKAGE_INFO_TEMPLATE = """NAME                = '{name}'
+VERSION             = '{version}'
+DESCRIPTION         = 'Synthetic package generated by mMecoRelease.benchmarkLib.'
+KEYWORDS            = []
+PLATFORMS           = ['Linux', 'Darwin', 'Windows']
+DOCUMENTS           = []
+APPLICATIONS        = ['all']
+PYTHON_VERSIONS     = ['2', '3']
+IS_ACTIVE           = True
+IS_EXTERNAL         = {isExternal}
+DEVELOPERS          = []
+DEPENDENT_PACKAGES  = {dependencies!r}
+PYTHON_PACKAGES     = ['{name}']
+"""
+
+#
+## @brief Parse a file size distribution.
+#
+#  Supported distributions are fixed:SIZE, uniform:MIN-MAX and lognormal:MEDIAN, sizes are in bytes.
+#
+#  @param value [ str | None | in  ] - Distribution.
+#
+#  @exception ValueError - If the distribution is invalid.
+#
+#  @return callable - Callable that takes a random.Random instance and returns a size.
+def parseSizeDistribution(value):
+
+    kind, separator, parameters = value.partition(':')
+
+    try:
+        if kind == 'fixed':
+            size = int(parameters)
+            return lambda _random: size
+
+        if kind == 'uniform':
+            minimum, maximum = [int(parameter) for parameter in parameters.split('-')]
+            return lambda _random: _random.randint(minimum, maximum)
+
+        if kind == 'lognormal':
+            median = float(parameters)
+            return lambda _random: int(_random.lognormvariate(math.log(median), 1.0))
+
+    except ValueError:
+        pass
+
+    raise ValueError('Invalid file size distribution: {}'.format(value))
+
+#
+## @brief Generate a synthetic package.
+#
+#  @param packagePath  [ str         | None | in  ] - Root of the package to be created.
+#  @param name         [ str         | None | in  ] - Name of the package.
+#  @param fileCount    [ int         | None | in  ] - Number of files in addition to the package info module.
+#  @param depth        [ int         | None | in  ] - Maximum depth of the directories files are created in.
+#  @param getSize      [ callable    | None | in  ] - Callable that takes a random.Random instance and returns a file size.
+#  @param _random      [ random.Random | None | in  ] - Random number generator.
+#  @param dependencies [ list of str | None | in  ] - Names of the packages this package depends on.
+#
+#  @exception N/A
+#
+#  @return tuple - Number of files and their total size in bytes.
+def generatePackage(packagePath, name, fileCount, depth, getSize, _random, dependencies):
+
+    pythonPath = os.path.join(packagePath, 'python', name)
+    os.makedirs(pythonPath)
+
+    open(os.path.join(pythonPath, '__init__.py'), 'w').close()
+
+    with open(os.path.join(pythonPath, 'packageInfoLib.py'), 'w') as infoFile:
+        infoFile.write(PACKAGE_INFO_TEMPLATE.format(name=name, version=PACKAGE_VERSION, isExternal=False, dependencies=dependencies))
+
+    content   = bytearray(_random.getrandbits(8) for i in range(64 * 1024))
+
+    for index in range(fileCount):
+
+        directory = pythonPath
+        for level in range(_random.randint(0, depth)):
+            directory = os.path.join(directory, 'level{}_{}'.format(level, _random.randint(0, 3)))
+
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        with open(os.path.join(directory, 'file{:05d}.dat'.format(index)), 'wb') as dataFile:
+            remaining = max(0, getSize(_random))
+            while remaining > 0:
+                chunk      = content[:min(remaining, len(content))]
+                dataFile.write(chunk)
+                remaining -= len(chunk)
+
+    # Package info and init modules are released too, so everything is counted
+    fileCount = 0
+    totalSize = 0
+    for root, directories, files in os.walk(packagePath):
+        for fileName in files:
+            fileCount += 1
+            totalSize += os.path.getsize(os.path.join(root, fileName))
+
+    return fileCount, totalSize
+
+#
+## @brief [ CLASS ] - Class that sets up a synthetic development environment with temporary release roots.
+class BenchmarkEnvironment(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param workDirectory [ str | None | in  ] - Directory the environment is created in.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self, workDirectory):
+
+        ## [ str ] - Directory the environment is created in.
+        self._workDirectory       = workDirectory
+
+        ## [ str ] - Development packages path.
+        self._developmentPath     = os.path.join(workDirectory, 'development')
+
+        ## [ list of str ] - Release roots.
+        self._releasePaths        = [os.path.join(workDirectory, 'release', name) for name in ['projectInternal', 'projectExternal',
+                                                                                                'masterInternal',  'masterExternal']]
+
+        ## [ str ] - Cache directory.
+        self._cachePath           = os.path.join(workDirectory, 'cache')
+
+        ## [ list of str ] - Roots of the generated packages.
+        self._packagePaths        = []
+
+        ## [ int ] - Number of files in the generated packages.
+        self._fileCount           = 0
+
+        ## [ int ] - Size of the files in the generated packages in bytes.
+        self._size                = 0
+
+        ## [ dict ] - Environment before the environment has been set up.
+        self._previousEnvironment = None
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Generate synthetic packages.
+    #
+    #  Package at index i depends on package at index (i - 1) // 2, so release all runs in several waves.
+    #
+    #  @param packageCount [ int      | None | in  ] - Number of packages.
+    #  @param fileCount    [ int      | None | in  ] - Number of files in each package.
+    #  @param depth        [ int      | None | in  ] - Maximum directory depth.
+    #  @param getSize      [ callable | None | in  ] - Callable that takes a random.Random instance and returns a file size.
+    #  @param seed         [ int      | None | in  ] - Seed of the random number generator.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def generate(self, packageCount, fileCount, depth, getSize, seed):
+
+        _random = random.Random(seed)
+
+        for path in [self._developmentPath, self._cachePath] + self._releasePaths:
+            os.makedirs(path)
+
+        names = ['{}{:03d}'.format(PACKAGE_NAME_PREFIX, index) for index in range(packageCount)]
+
+        for index, name in enumerate(names):
+
+            packagePath     = os.path.join(self._developmentPath, name)
+            dependencies    = [names[(index - 1) // 2]] if index else []
+            count, size     = generatePackage(packagePath, name, fileCount, depth, getSize, _random, dependencies)
+
+            self._packagePaths.append(packagePath)
+            self._fileCount += count
+            self._size      += size
+
+    #
+    ## @brief Set environment variables of the environment.
+    #
+    #  Notification recipients and mail server of the caller are unset, so synthetic releases never mail anyone.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def activate(self):
+
+        self._previousEnvironment = dict(os.environ)
+
+        os.environ[mMecoSettings.envVariablesLib.MECO_DEVELOPER_NAME]                        = getpass.getuser()
+        os.environ[mMecoSettings.envVariablesLib.MECO_PROJECT_NAME]                          = 'benchmarkProject'
+        os.environ[mMecoSettings.envVariablesLib.MECO_MASTER_PROJECT_NAME]                   = 'benchmarkMasterProject'
+        os.environ[mMecoSettings.envVariablesLib.MECO_DEVELOPMENT_PACKAGES_PATH]             = self._developmentPath
+        os.environ[mMecoSettings.envVariablesLib.MECO_PROJECT_INTERNAL_PACKAGES_PATH]        = self._releasePaths[0]
+        os.environ[mMecoSettings.envVariablesLib.MECO_PROJECT_EXTERNAL_PACKAGES_PATH]        = self._releasePaths[1]
+        os.environ[mMecoSettings.envVariablesLib.MECO_MASTER_PROJECT_INTERNAL_PACKAGES_PATH] = self._releasePaths[2]
+        os.environ[mMecoSettings.envVariablesLib.MECO_MASTER_PROJECT_EXTERNAL_PACKAGES_PATH] = self._releasePaths[3]
+
+        os.environ[mMecoRelease.cacheLib.CACHE_DIRECTORY_ENV] = self._cachePath
+        os.environ[mMecoRelease.daemonLib.NO_DAEMON_ENV]      = '1'
+
+        for name in (mMecoRelease.outboxLib.NOTIFICATION_RECIPIENTS_ENV,
+                     mMecoRelease.outboxLib.NOTIFICATION_SENDER_ENV,
+                     mMecoRelease.outboxLib.SMTP_HOST_ENV,
+                     mMecoRelease.outboxLib.SMTP_PORT_ENV):
+            os.environ.pop(name, None)
+
+    #
+    ## @brief Restore environment variables.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def deactivate(self):
+
+        if self._previousEnvironment is None:
+            return
+
+        os.environ.clear()
+        os.environ.update(self._previousEnvironment)
+
+        self._previousEnvironment = None
+
+    #
+    ## @brief Remove released packages, and cached data unless asked otherwise.
+    #
+    #  @param keepCache [ bool | False | in  ] - Whether to keep cached data.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def reset(self, keepCache=False):
+
+        paths = list(self._releasePaths)
+        if not keepCache:
+            paths.append(self._cachePath)
+
+        for path in paths:
+            mMecoRelease.versionLib.removeTree(path)
+            os.makedirs(path)
+
+        # In memory caches are dropped along with the cache directory
+        if not keepCache and 'mMecoRelease.scanLib' in sys.modules:
+            sys.modules['mMecoRelease.scanLib']._releaseFileLists.clear()
+
+    #
+    ## @brief Get development packages path.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Path.
+    def developmentPath(self):
+
+        return self._developmentPath
+
+    #
+    ## @brief Get roots of the generated packages.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Paths.
+    def packagePaths(self):
+
+        return list(self._packagePaths)
+
+    #
+    ## @brief Get number of files in the generated packages.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Count.
+    def fileCount(self):
+
+        return self._fileCount
+
+    #
+    ## @brief Get size of the files in the generated packages.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Size in bytes.
+    def size(self):
+
+        return self._size
+
+    #
+    ## @brief Get number of released versions in the release roots.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Count.
+    def releasedVersionCount(self):
+
+        count = 0
+
+        for releasePath in self._releasePaths:
+            for name in os.listdir(releasePath):
+                if not name.startswith('.'):
+                    count += len(mMecoRelease.versionLib.getReleasedVersions(os.path.join(releasePath, name)))
+
+        return count
+
+#
+## @brief [ CLASS ] - Class that discards everything written to it.
+class _NullStream(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Discard given text.
+    #
+    #  @param text [ str | None | in  ] - Text.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def write(self, text):
+
+        pass
+
+    #
+    ## @brief Do nothing.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def flush(self):
+
+        pass
+
+    #
+    ## @brief Whether the stream is a terminal.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Always False.
+    def isatty(self):
+
+        return False
+
+#
+## @brief [ CLASS ] - Class that runs benchmark scenarios.
+class Benchmark(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param environment [ mMecoRelease.benchmarkLib.BenchmarkEnvironment | None  | in  ] - Environment.
+    #  @param jobs        [ int                                           | 1     | in  ] - Number of jobs given to the commands.
+    #  @param keepCache   [ bool                                          | False | in  ] - Whether to keep cached data between repetitions.
+    #  @param verbose     [ bool                                          | False | in  ] - Whether to display output of the commands.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self, environment, jobs=1, keepCache=False, verbose=False):
+
+        ## [ mMecoRelease.benchmarkLib.BenchmarkEnvironment ] - Environment.
+        self._environment = environment
+
+        ## [ int ] - Number of jobs given to the commands.
+        self._jobs        = jobs
+
+        ## [ bool ] - Whether to keep cached data between repetitions.
+        self._keepCache   = keepCache
+
+        ## [ bool ] - Whether to display output of the commands.
+        self._verbose     = verbose
+
+    #
+    ## @brief Call a function in given directory with output discarded.
+    #
+    #  @param directory [ str      | None | in  ] - Working directory.
+    #  @param function  [ callable | None | in  ] - Function.
+    #  @param stdin     [ str      | ''   | in  ] - Standard input given to the function.
+    #
+    #  @exception N/A
+    #
+    #  @return object - Return value of the function.
+    def _call(self, directory, function, stdin=''):
+
+        try:
+            from StringIO import StringIO
+        except ImportError:
+            from io import StringIO
+
+        currentDirectory = os.getcwd()
+        streams          = (sys.stdin, sys.stdout, sys.stderr)
+
+        os.chdir(directory)
+        sys.stdin = StringIO(stdin)
+
+        if not self._verbose:
+            sys.stdout = _NullStream()
+            sys.stderr = _NullStream()
+
+        try:
+            return function()
+        finally:
+            sys.stdin, sys.stdout, sys.stderr = streams
+            os.chdir(currentDirectory)
+
+    #
+    ## @brief Check each package.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Phase durations in seconds.
+    def _check(self):
+
+        import mMecoRelease.releaseCmd
+
+        for packagePath in self._environment.packagePaths():
+            self._call(packagePath, lambda: mMecoRelease.releaseCmd.check(mMecoRelease.cliLib.getCheckParser().parse_args([])))
+
+        return {}
+
+    #
+    ## @brief Check all packages.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Phase durations in seconds.
+    def _checkAll(self):
+
+        import mMecoRelease.releaseCmd
+
+        self._call(self._environment.developmentPath(),
+                   lambda: mMecoRelease.releaseCmd.checkAll(mMecoRelease.cliLib.getCheckAllParser().parse_args(['--jobs', str(self._jobs)])))
+
+        return {}
+
+    #
+    ## @brief Release each package with Release.run, pre-dependencies and the release are run as separate phases.
+    #
+    #  @exception RuntimeError - If a package fails to release.
+    #
+    #  @return dict - Phase durations in seconds.
+    def _release(self):
+
+        import mProcess.dataLib
+        import mMecoRelease.releaseCnt
+
+        phases = {'preDependencies':0.0, 'release':0.0}
+
+        for packagePath in self._environment.packagePaths():
+
+            startTime = time.time()
+
+            _preDependencyData = mProcess.dataLib.Data(runLevel=mProcess.dataLib.RunLevel.kPreDependenciesOnly)
+            _preDependencies   = mMecoRelease.releaseCnt.Release(data=_preDependencyData, packageRoot=packagePath, jobs=self._jobs)
+            result             = self._call(packagePath, _preDependencies.run)
+
+            phases['preDependencies'] += time.time() - startTime
+            startTime                  = time.time()
+
+            _releaseData    = mProcess.dataLib.Data(runLevel=mProcess.dataLib.RunLevel.kProcessAndPostDependenciesOnly)
+            _packageRelease = mMecoRelease.releaseCnt.Release(data=_releaseData,
+                                                              packageRoot=packagePath,
+                                                              jobs=self._jobs,
+                                                              context=_preDependencies.context())
+            result          = result and self._call(packagePath, _packageRelease.run)
+
+            phases['release'] += time.time() - startTime
+
+            if not result:
+                raise RuntimeError('Package could not be released: {}'.format(packagePath))
+
+        return phases
+
+    #
+    ## @brief Release all packages.
+    #
+    #  @exception RuntimeError - If not all packages are released.
+    #
+    #  @return dict - Phase durations in seconds.
+    def _releaseAll(self):
+
+        import mMecoRelease.releaseCmd
+
+        self._call(self._environment.developmentPath(),
+                   lambda: mMecoRelease.releaseCmd.releaseAll(mMecoRelease.cliLib.getReleaseAllParser().parse_args(['--jobs', str(self._jobs)])),
+                   stdin='yes\n')
+
+        if self._environment.releasedVersionCount() != len(self._environment.packagePaths()):
+            raise RuntimeError('{} of {} packages have been released.'.format(self._environment.releasedVersionCount(),
+                                                                             len(self._environment.packagePaths())))
+
+        return {}
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Run a scenario.
+    #
+    #  Release roots are emptied before each repetition, and so are the caches unless they are kept.
+    #
+    #  @param scenario [ str | None | in  ] - Scenario, one of SCENARIOS.
+    #  @param repeat   [ int | None | in  ] - Number of repetitions.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Result.
+    def run(self, scenario, repeat):
+
+        function = getattr(self, '_{}'.format(scenario))
+
+        times  = []
+        phases = {}
+        error  = None
+
+        for repetition in range(repeat):
+
+            self._environment.reset(keepCache=self._keepCache and repetition > 0)
+
+            startTime = time.time()
+
+            try:
+                repetitionPhases = function()
+            except RuntimeError as exception:
+                error = str(exception)
+                break
+
+            times.append(time.time() - startTime)
+
+            for name, duration in repetitionPhases.items():
+                phases.setdefault(name, []).append(duration)
+
+        result = {'runs'  : times,
+                  'files' : self._environment.fileCount(),
+                  'bytes' : self._environment.size(),
+                  'error' : error}
+
+        if times:
+            best = min(times)
+
+            result['best']               = best
+            result['mean']               = sum(times) / len(times)
+            result['filesPerSecond']     = self._environment.fileCount() / best if best else None
+            result['megabytesPerSecond'] = self._environment.size() / 1048576.0 / best if best else None
+            result['phases']             = dict([(name, min(durations)) for name, durations in phases.items()])
+
+        return result
+
+#
+## @brief Compare results with the results of a previous run.
+#
+#  @param results         [ dict | None | in  ] - Results.
+#  @param previousResults [ dict | None | in  ] - Previous results.
+#
+#  @exception N/A
+#
+#  @return list of str - Lines of the comparison.
+def compareResults(results, previousResults):
+
+    lines = []
+
+    for scenario in SCENARIOS:
+
+        current  = results['scenarios'].get(scenario, {}).get('best')
+        previous = previousResults.get('scenarios', {}).get(scenario, {}).get('best')
+
+        if not current or not previous:
+            continue
+
+        lines.append('{:<12} {:>9.3f}s -> {:>9.3f}s  {:+.1f}%'.format(scenario, previous, current, (current / previous - 1.0) * 100.0))
+
+    return lines
+
+#
+## @brief Run the benchmark.
+#
+#  @param args [ argparse.Namespace | None | in  ] - Parsed arguments of mMecoRelease.cliLib.getBenchmarkParser.
+#
+#  @exception ValueError - If a scenario or the file size distribution is invalid.
+#
+#  @return dict - Results.
+def runBenchmark(args):
+
+    _args = args
+
+    scenarios = [scenario for scenario in _args.scenarios.split(',') if scenario]
+    for scenario in scenarios:
+        if not scenario in SCENARIOS:
+            raise ValueError('Invalid scenario: {}'.format(scenario))
+
+    getSize = parseSizeDistribution(_args.file_size)
+
+    workDirectory = _args.work_directory or tempfile.mkdtemp(prefix='mmecorelease-benchmark.')
+    if _args.work_directory:
+        os.makedirs(workDirectory)
+
+    _environment = BenchmarkEnvironment(workDirectory)
+
+    try:
+        sys.stdout.write('Generating {} packages with {} files in: {}\n'.format(_args.package_count, _args.file_count, workDirectory))
+        sys.stdout.flush()
+
+        _environment.generate(_args.package_count, _args.file_count, _args.depth, getSize, _args.seed)
+        _environment.activate()
+
+        _benchmark = Benchmark(_environment, jobs=_args.jobs, keepCache=_args.warm_cache, verbose=_args.verbose)
+
+        results = {'format'    : BENCHMARK_FORMAT,
+                   'time'      : time.time(),
+                   'version'   : mMecoRelease.packageInfoLib.VERSION,
+                   'python'    : platform.python_version(),
+                   'platform'  : platform.platform(),
+                   'config'    : {'packageCount' : _args.package_count,
+                                  'fileCount'    : _args.file_count,
+                                  'depth'        : _args.depth,
+                                  'fileSize'     : _args.file_size,
+                                  'repeat'       : _args.repeat,
+                                  'seed'         : _args.seed,
+                                  'jobs'         : _args.jobs,
+                                  'warmCache'    : _args.warm_cache,
+                                  'files'        : _environment.fileCount(),
+                                  'bytes'        : _environment.size()},
+                   'scenarios' : {}}
+
+        for scenario in scenarios:
+
+            result                          = _benchmark.run(scenario, _args.repeat)
+            results['scenarios'][scenario]  = result
+
+            if result['error']:
+                sys.stdout.write('{:<12} FAILED: {}\n'.format(scenario, result['error']))
+            else:
+                sys.stdout.write('{:<12} {:>9.3f}s  {:>10.1f} files/s  {:>8.1f} MB/s  {}\n'.format(scenario,
+                                                                                                  result['best'],
+                                                                                                  result['filesPerSecond'] or 0.0,
+                                                                                                  result['megabytesPerSecond'] or 0.0,
+                                                                                                  ', '.join(['{} {:.3f}s'.format(name, duration)
+                                                                                                             for name, duration in sorted(result['phases'].items())])))
+            sys.stdout.flush()
+
+    finally:
+        _environment.deactivate()
+        if not _args.work_directory:
+            mMecoRelease.versionLib.removeTree(workDirectory)
+
+    with open(_args.output, 'w') as outputFile:
+        json.dump(results, outputFile, indent=4, sort_keys=True)
+
+    sys.stdout.write('Results have been written to: {}\n'.format(_args.output))
+
+    if _args.compare:
+        with open(_args.compare, 'r') as previousFile:
+            previousResults = json.load(previousFile)
+
+        for line in compareResults(results, previousResults):
+            sys.stdout.write('{}\n'.format(line))
+
+    return results
@@ -0,0 +1,145 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/cacheLib.py @brief [ FILE   ] - Local cache module.
+## @package mMecoRelease.cacheLib    @brief [ MODULE ] - Local cache module.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORTS
+# ----------------------------------------------------------------------------------------------------
+import os
+import json
+import errno
+import tempfile
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ str ] - Environment variable that overrides the cache directory.
+CACHE_DIRECTORY_ENV = 'MECO_RELEASE_CACHE_PATH'
+
+## [ str ] - Name of the cache directory.
+CACHE_DIRECTORY_NAME = 'mMecoRelease'
+
+#
+## @brief Get local cache directory, create it if it doesn't exist.
+#
+#  MECO_RELEASE_CACHE_PATH environment variable is used if set, otherwise a directory
+#  in the platform specific user cache location.
+#
+#  @exception N/A
+#
+#  @return str - Path.
+def getCacheDirectory():
+
+    cacheDirectory = os.environ.get(CACHE_DIRECTORY_ENV)
+
+    if not cacheDirectory:
+        if os.name == 'nt':
+            baseDirectory = os.environ.get('LOCALAPPDATA', os.path.expanduser('~'))
+        else:
+            baseDirectory = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+
+        cacheDirectory = os.path.join(baseDirectory, CACHE_DIRECTORY_NAME)
+
+    try:
+        os.makedirs(cacheDirectory)
+    except OSError as error:
+        if error.errno != errno.EEXIST:
+            raise
+
+    return cacheDirectory
+
+#
+## @brief Get path of a file in local cache directory.
+#
+#  @param fileName [ str | None | in  ] - Name of the file.
+#
+#  @exception N/A
+#
+#  @return str - Path.
+def getCacheFile(fileName):
+
+    return os.path.join(getCacheDirectory(), fileName)
+
+#
+## @brief Read a JSON file.
+#
+#  @param path    [ str    | None | in  ] - Path of the file.
+#  @param default [ object | None | in  ] - Value returned if the file doesn't exist or can not be read.
+#
+#  @exception N/A
+#
+#  @return object - Content.
+def readJson(path, default=None):
+
+    try:
+        with open(path, 'r') as jsonFile:
+            return json.load(jsonFile)
+    except (IOError, OSError, ValueError):
+        return default
+
+#
+## @brief Write a JSON file atomically, readers never see a partially written file.
+#
+#  @param path    [ str    | None | in  ] - Path of the file.
+#  @param content [ object | None | in  ] - Content.
+#
+#  @exception IOError - If the file can not be written.
+#
+#  @return None - None.
+def writeJson(path, content):
+
+    descriptor, temporaryPath = tempfile.mkstemp(prefix='.{}.'.format(os.path.basename(path)), dir=os.path.dirname(path))
+
+    try:
+        with os.fdopen(descriptor, 'w') as jsonFile:
+            json.dump(content, jsonFile, sort_keys=True)
+
+        replaceFile(temporaryPath, path)
+
+    except Exception:
+        if os.path.exists(temporaryPath):
+            os.remove(temporaryPath)
+        raise
+
+#
+## @brief Rename a file over another one.
+#
+#  @param source      [ str | None | in  ] - Path of the file to be renamed.
+#  @param destination [ str | None | in  ] - Path of the file to be replaced.
+#
+#  @exception OSError - If the file can not be renamed.
+#
+#  @return None - None.
+def replaceFile(source, destination):
+
+    if hasattr(os, 'replace'):
+        os.replace(source, destination)
+        return
+
+    # Python 2 on Windows can not rename over an existing file
+    if os.name == 'nt' and os.path.exists(destination):
+        os.remove(destination)
+
+    os.rename(source, destination)
@@ -0,0 +1,412 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/catalogLib.py @brief [ FILE   ] - Release catalog module.
+## @package mMecoRelease.catalogLib    @brief [ MODULE ] - Release catalog module.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORTS
+# ----------------------------------------------------------------------------------------------------
+import os
+import time
+
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
+
+import mMecoRelease.manifestLib
+import mMecoRelease.versionLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ str ] - Name of the catalog file created in each release root.
+CATALOG_FILE_NAME = '.mecoReleaseCatalog.sqlite'
+
+## [ int ] - Format version of the catalog file.
+CATALOG_FORMAT    = 1
+
+## [ float ] - Seconds to wait for a lock held by another process.
+CATALOG_TIMEOUT   = 30.0
+
+## [ str ] - Statements that create the catalog schema.
+CATALOG_SCHEMA    = """
+CREATE TABLE IF NOT EXISTS info     (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS releases (package     TEXT    NOT NULL,
+                                     version     TEXT    NOT NULL,
+                                     releaseTime REAL,
+                                     developer   TEXT,
+                                     fileCount   INTEGER,
+                                     size        INTEGER,
+                                     PRIMARY KEY (package, version));
+"""
+
+#
+## @brief Whether release catalogs are supported by this Python installation.
+#
+#  @exception N/A
+#
+#  @return bool - Result.
+def isAvailable():
+
+    return sqlite3 is not None
+
+#
+## @brief Get file count and size of a released version from its manifest, or from disk if it has none.
+#
+#  @param versionPath [ str | None | in  ] - Path of a released version.
+#
+#  @exception N/A
+#
+#  @return tuple - File count and size in bytes.
+def _getVersionContent(versionPath):
+
+    _manifest = mMecoRelease.manifestLib.Manifest.read(mMecoRelease.manifestLib.getManifestFile(versionPath))
+    if _manifest:
+        return len(_manifest.files()), _manifest.size()
+
+    fileCount = 0
+    size      = 0
+
+    for root, directories, files in os.walk(versionPath):
+        for name in files:
+            try:
+                size += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                continue
+            fileCount += 1
+
+    return fileCount, size
+
+#
+## @brief Make a catalog file created by this process writable by the group, so other developers can add releases.
+#
+#  @param path [ str | None | in  ] - Path of the catalog file.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def _setPermissions(path):
+
+    try:
+        os.chmod(path, 0o0664)
+    except OSError:
+        pass
+
+#
+## @brief Get path of the most recent released version other than the new version, using the catalog if available.
+#
+#  @param releaseRoot    [ str | None | in  ] - Release root, such as project internal packages path.
+#  @param newVersionPath [ str | None | in  ] - Path of the version being released.
+#
+#  @exception N/A
+#
+#  @return str  - Path of the previous version.
+#  @return None - If no other version has been released.
+def getPreviousVersionPath(releaseRoot, newVersionPath):
+
+    _catalog = ReleaseCatalog(releaseRoot)
+    if not _catalog.exists():
+        return mMecoRelease.versionLib.getPreviousVersionPath(newVersionPath)
+
+    newVersionPath      = os.path.normpath(newVersionPath)
+    packageVersionsPath = os.path.dirname(newVersionPath)
+    newVersion          = os.path.basename(newVersionPath)
+
+    try:
+        versions = [version for version in _catalog.getVersions(os.path.basename(packageVersionsPath)) if version != newVersion]
+    except sqlite3.Error:
+        return mMecoRelease.versionLib.getPreviousVersionPath(newVersionPath)
+
+    # Catalog may lag behind releases made without it, disk is listed if the latest entry is gone
+    if versions and os.path.isdir(os.path.join(packageVersionsPath, versions[-1])):
+        return os.path.join(packageVersionsPath, versions[-1])
+
+    return mMecoRelease.versionLib.getPreviousVersionPath(newVersionPath)
+
+#
+## @brief [ CLASS ] - Class that indexes released packages and versions of a release root in an SQLite file.
+#
+#  Catalog is an index only, released directories remain the source of truth and
+#  rebuild method reconstructs the catalog from them. Rollback journal is used rather
+#  than write ahead logging, which doesn't work on network file systems.
+class ReleaseCatalog(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param releaseRoot [ str | None | in  ] - Release root, such as project internal packages path.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self, releaseRoot):
+
+        ## [ str ] - Release root.
+        self._releaseRoot = releaseRoot
+
+        ## [ str ] - Path of the catalog file.
+        self._path        = os.path.join(releaseRoot, CATALOG_FILE_NAME)
+
+    #
+    ## @brief Open a connection to a catalog file and create its schema.
+    #
+    #  @param path [ str | None | in  ] - Path of the catalog file.
+    #
+    #  @exception sqlite3.Error - If the catalog can not be opened.
+    #
+    #  @return sqlite3.Connection - Connection.
+    def _connect(self, path):
+
+        connection = sqlite3.connect(path, timeout=CATALOG_TIMEOUT)
+        connection.executescript(CATALOG_SCHEMA)
+
+        with connection:
+            connection.execute('INSERT OR REPLACE INTO info VALUES (?, ?)', ('format', str(CATALOG_FORMAT)))
+
+        return connection
+
+    #
+    ## @brief Run a query on the catalog.
+    #
+    #  @param query      [ str   | None | in  ] - Query.
+    #  @param parameters [ tuple | ()   | in  ] - Parameters.
+    #
+    #  @exception sqlite3.Error - If the query fails.
+    #
+    #  @return list of tuple - Rows.
+    def _query(self, query, parameters=()):
+
+        connection = sqlite3.connect(self._path, timeout=CATALOG_TIMEOUT)
+
+        try:
+            return connection.execute(query, parameters).fetchall()
+        finally:
+            connection.close()
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Get path of the catalog file.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Path.
+    def path(self):
+
+        return self._path
+
+    #
+    ## @brief Whether the catalog exists and can be used.
+    #
+    #  Catalog created by adding a release to a release root without one doesn't list previous
+    #  releases, so it is not used until it is rebuilt.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def exists(self):
+
+        if not isAvailable() or not os.path.isfile(self._path):
+            return False
+
+        try:
+            rows = self._query('SELECT value FROM info WHERE key = ?', ('complete',))
+        except sqlite3.Error:
+            return False
+
+        return not rows or rows[0][0] != '0'
+
+    #
+    ## @brief Whether given version of a package is in the catalog.
+    #
+    #  @param packageName [ str | None | in  ] - Name of the package.
+    #  @param version     [ str | None | in  ] - Version.
+    #
+    #  @exception sqlite3.Error - If the catalog can not be read.
+    #
+    #  @return bool - Result.
+    def hasVersion(self, packageName, version):
+
+        return bool(self._query('SELECT 1 FROM releases WHERE package = ? AND version = ?', (packageName, version)))
+
+    #
+    ## @brief Get released versions of a package, sorted from oldest to newest.
+    #
+    #  @param packageName [ str | None | in  ] - Name of the package.
+    #
+    #  @exception sqlite3.Error - If the catalog can not be read.
+    #
+    #  @return list of str - Versions.
+    def getVersions(self, packageName):
+
+        return sorted([str(row[0]) for row in self._query('SELECT version FROM releases WHERE package = ?', (packageName,))],
+                      key=mMecoRelease.versionLib.getSortKey)
+
+    #
+    ## @brief Get latest released version of a package.
+    #
+    #  @param packageName [ str | None | in  ] - Name of the package.
+    #
+    #  @exception sqlite3.Error - If the catalog can not be read.
+    #
+    #  @return str  - Version.
+    #  @return None - If the package has not been released.
+    def getLatestVersion(self, packageName):
+
+        versions = self.getVersions(packageName)
+
+        return versions[-1] if versions else None
+
+    #
+    ## @brief Get names of the released packages.
+    #
+    #  @exception sqlite3.Error - If the catalog can not be read.
+    #
+    #  @return list of str - Sorted names.
+    def getPackageNames(self):
+
+        return [str(row[0]) for row in self._query('SELECT DISTINCT package FROM releases ORDER BY package')]
+
+    #
+    ## @brief Get releases in the catalog.
+    #
+    #  @param packageName [ str | None | in  ] - Name of a package to get releases of, all packages if None.
+    #
+    #  @exception sqlite3.Error - If the catalog can not be read.
+    #
+    #  @return list of tuple - Package, version, release time, developer, file count and size of each release.
+    def getReleases(self, packageName=None):
+
+        if packageName:
+            return self._query('SELECT package, version, releaseTime, developer, fileCount, size FROM releases WHERE package = ?',
+                               (packageName,))
+
+        return self._query('SELECT package, version, releaseTime, developer, fileCount, size FROM releases')
+
+    #
+    ## @brief Add a release to the catalog in a single transaction.
+    #
+    #  Release root is never listed here, as that may take long on a network file system. If the catalog
+    #  doesn't exist, it is created incomplete and not used until rebuild method is called.
+    #
+    #  @param packageName [ str   | None | in  ] - Name of the package.
+    #  @param version     [ str   | None | in  ] - Version.
+    #  @param developer   [ str   | None | in  ] - Name of the developer who released the package.
+    #  @param fileCount   [ int   | None | in  ] - Number of released files.
+    #  @param size        [ int   | None | in  ] - Size of released files in bytes.
+    #  @param releaseTime [ float | None | in  ] - Release time, current time if None.
+    #
+    #  @exception sqlite3.Error - If the catalog can not be written.
+    #
+    #  @return bool - Whether the catalog existed, False if it has been created incomplete and needs to be rebuilt.
+    def addRelease(self, packageName, version, developer, fileCount, size, releaseTime=None):
+
+        existed    = os.path.isfile(self._path)
+        connection = self._connect(self._path)
+
+        try:
+            with connection:
+                if not existed:
+                    connection.execute('INSERT OR IGNORE INTO info VALUES (?, ?)', ('complete', '0'))
+
+                connection.execute('INSERT OR REPLACE INTO releases VALUES (?, ?, ?, ?, ?, ?)',
+                                   (packageName, version, releaseTime or time.time(), developer, fileCount, size))
+        finally:
+            connection.close()
+
+        if not existed:
+            _setPermissions(self._path)
+
+        return existed
+
+    #
+    ## @brief Rebuild the catalog from released directories.
+    #
+    #  Released directories are listed first, then the catalog is updated in place in a single transaction,
+    #  so readers either see the previous catalog or the rebuilt one and releases being added meanwhile
+    #  write to the same file. Releases whose directories have been removed are deleted, releases added
+    #  after the listing are kept. Developers of the releases are kept as they can not be found on disk.
+    #
+    #  @exception sqlite3.Error - If the catalog can not be written.
+    #  @exception OSError       - If the release root can not be listed.
+    #
+    #  @return int - Number of releases in the catalog.
+    def rebuild(self):
+
+        rows = []
+
+        for packageName in sorted(os.listdir(self._releaseRoot)):
+
+            packageVersionsPath = os.path.join(self._releaseRoot, packageName)
+            if packageName.startswith('.') or not os.path.isdir(packageVersionsPath):
+                continue
+
+            for version in mMecoRelease.versionLib.getReleasedVersions(packageVersionsPath):
+
+                versionPath     = os.path.join(packageVersionsPath, version)
+                fileCount, size = _getVersionContent(versionPath)
+
+                rows.append((packageName, version, os.path.getmtime(versionPath), fileCount, size))
+
+        existed    = os.path.isfile(self._path)
+        connection = self._connect(self._path)
+
+        try:
+            connection.isolation_level = None
+            connection.execute('BEGIN IMMEDIATE')
+
+            try:
+                developers  = dict([((package, version), developer) for package, version, developer in
+                                    connection.execute('SELECT package, version, developer FROM releases')])
+                listed      = set([(packageName, version) for packageName, version, releaseTime, fileCount, size in rows])
+                removed     = [key for key in developers if not key in listed and
+                               not os.path.isdir(os.path.join(self._releaseRoot, key[0], key[1]))]
+
+                connection.executemany('DELETE FROM releases WHERE package = ? AND version = ?', removed)
+                connection.executemany('INSERT OR REPLACE INTO releases VALUES (?, ?, ?, ?, ?, ?)',
+                                       [(packageName, version, releaseTime, developers.get((packageName, version)), fileCount, size)
+                                        for packageName, version, releaseTime, fileCount, size in rows])
+                connection.execute('INSERT OR REPLACE INTO info VALUES (?, ?)', ('complete', '1'))
+
+                releaseCount = connection.execute('SELECT COUNT(*) FROM releases').fetchone()[0]
+
+                connection.execute('COMMIT')
+
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+
+        finally:
+            connection.close()
+
+        if not existed:
+            _setPermissions(self._path)
+
+        return releaseCount
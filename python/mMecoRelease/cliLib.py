@@ -0,0 +1,824 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/cliLib.py @brief [ FILE   ] - Command line entry module.
+## @package mMecoRelease.cliLib    @brief [ MODULE ] - Command line entry module.
+#
+#  This module is imported by the command line scripts, it must only import standard library
+#  modules and mMecoRelease.defaultsLib at module level. Arguments and environment are validated here before
+#  mMecoRelease.releaseCmd, which imports the rest of the framework, is imported.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORTS
+# ----------------------------------------------------------------------------------------------------
+import os
+import sys
+import argparse
+
+import mMecoRelease.defaultsLib
+
+import mMecoSettings.envVariablesLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ tuple of str ] - Packages that must not be imported by this module, see measureImportTime function.
+DEFERRED_PACKAGES        = ('mCore', 'mFileSystem', 'mMecoPackage', 'mProcess', 'multiprocessing', 'sqlite3')
+
+## [ str ] - Statement that builds all argument parsers of the module given by the format argument, see measureImportTime function.
+_BUILD_PARSERS_STATEMENT = ('for name in dir({0}):\n'
+                            '    if name.startswith("get") and name.endswith("Parser"):\n'
+                            '        getattr({0}, name)()')
+
+#
+## @brief Convert given command line value into a positive integer.
+#
+#  @param value [ str | None | in  ] - Value.
+#
+#  @exception argparse.ArgumentTypeError - If given value is not a positive integer.
+#
+#  @return int - Value.
+def _positiveInteger(value):
+
+    try:
+        value = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError('Invalid integer value: {}'.format(value))
+
+    if value < 1:
+        raise argparse.ArgumentTypeError('Value must be greater than zero: {}'.format(value))
+
+    return value
+
+#
+## @brief Add raise exceptions argument to given parser.
+#
+#  @param parser [ argparse.ArgumentParser | None | in  ] - Parser.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def _addRaiseExceptionsArgument(parser):
+
+    parser.add_argument('-re',
+                        '--raise-exceptions',
+                        help='Whether to raise exceptions. Default value is False.',
+                        default=False,
+                        required=False,
+                        action='store_true')
+
+#
+## @brief Add progress arguments to a parser.
+#
+#  @param parser [ argparse.ArgumentParser | None | in  ] - Parser.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def _addProgressArguments(parser):
+
+    parser.add_argument('-pr',
+                        '--progress',
+                        help='Whether to display files done, bytes done, throughput and ETA a few times per second instead of each copied file. Default value is False.',
+                        default=False,
+                        required=False,
+                        action='store_true')
+
+    parser.add_argument('-fl',
+                        '--file-log',
+                        help='File each copied file is appended to. Default value is None.',
+                        default=None,
+                        required=False,
+                        metavar='FILE')
+
+#
+## @brief Add trace arguments to given parser.
+#
+#  @param parser [ argparse.ArgumentParser | None | in  ] - Parser.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def _addTraceArguments(parser):
+
+    parser.add_argument('-t',
+                        '--trace',
+                        help='File timings of containers, processes and dependencies are written to in Chrome trace event format. Default value is None.',
+                        default=None,
+                        required=False,
+                        metavar='FILE')
+
+    parser.add_argument('-tf',
+                        '--trace-files',
+                        help='Whether to trace copy of each release file as well, requires --trace. Default value is False.',
+                        default=False,
+                        required=False,
+                        action='store_true')
+
+#
+## @brief Add archive argument to a parser.
+#
+#  @param parser [ argparse.ArgumentParser | None | in  ] - Parser.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def _addArchiveArgument(parser):
+
+    parser.add_argument('-ar',
+                        '--archive',
+                        help='Whether to write release files into a single zip archive in the released version as well. Default value is False.',
+                        default=False,
+                        required=False,
+                        action='store_true')
+
+#
+## @brief Display a failure message.
+#
+#  @param message    [ str  | None  | in  ] - Message.
+#  @param blankLine  [ bool | False | in  ] - Whether to display a blank line after the message.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def _displayFailure(message, blankLine=False):
+
+    import mCore.displayLib
+
+    mCore.displayLib.Display.displayFailure(message)
+
+    if blankLine:
+        mCore.displayLib.Display.displayBlankLine()
+
+#
+## @brief Get development packages path, display a failure if no development environment has been initialized.
+#
+#  @param purpose   [ str  | None  | in  ] - What the environment is needed for, completes the failure message.
+#  @param blankLine [ bool | False | in  ] - Whether to display a blank line after the failure message.
+#
+#  @exception N/A
+#
+#  @return str  - Path.
+#  @return None - If no development environment has been initialized.
+def getDevelopmentPackagesPath(purpose, blankLine=False):
+
+    developmentPackagePath = os.environ.get(mMecoSettings.envVariablesLib.MECO_DEVELOPMENT_PACKAGES_PATH)
+    if not developmentPackagePath:
+        _displayFailure('You must initialize development environment to {}.'.format(purpose), blankLine)
+        return None
+
+    return developmentPackagePath
+
+#
+## @brief Submit a job to the release daemon if one is running.
+#
+#  @param command [ str | None | in  ] - Command, see mMecoRelease.daemonLib.JOB_COMMANDS.
+#
+#  @exception SystemExit - If the job has failed.
+#
+#  @return bool - Whether the job has been run by the daemon.
+def _submitToDaemon(command):
+
+    import mMecoRelease.daemonLib
+
+    code = mMecoRelease.daemonLib.submit(command)
+    if code is None:
+        return False
+
+    if code:
+        sys.exit(code)
+
+    return True
+
+#
+## @brief Get argument parser of check command.
+#
+#  @exception N/A
+#
+#  @return argparse.ArgumentParser - Parser.
+def getCheckParser():
+
+    _parser = argparse.ArgumentParser(description='Check a package to determine whether it contains errors before releasing it.')
+
+    _addRaiseExceptionsArgument(_parser)
+
+    _addTraceArguments(_parser)
+
+    _parser.add_argument('-wa',
+                         '--watch',
+                         help='Whether to stay resident and check the package again whenever its files change. Default value is False.',
+                         default=False,
+                         required=False,
+                         action='store_true')
+
+    _parser.add_argument('-de',
+                         '--debounce',
+                         help='Seconds files have to stay unchanged before the package is checked again in watch mode. Default value is 0.5.',
+                         default=0.5,
+                         required=False,
+                         type=float)
+
+    return _parser
+
+#
+## @brief Get argument parser of check all command.
+#
+#  @exception N/A
+#
+#  @return argparse.ArgumentParser - Parser.
+def getCheckAllParser():
+
+    _parser = argparse.ArgumentParser(description='Check all packages to determine whether they contain errors before releasing them.')
+
+    _addRaiseExceptionsArgument(_parser)
+
+    _parser.add_argument('-j',
+                         '--jobs',
+                         help='Number of processes used to check packages, a summary table is displayed if greater than 1. Default value is 1.',
+                         default=1,
+                         required=False,
+                         type=_positiveInteger)
+
+    _parser.add_argument('-co',
+                         '--changed-only',
+                         help='Whether to skip packages that haven\'t changed since they have been successfully checked or released. Default value is False.',
+                         default=False,
+                         required=False,
+                         action='store_true')
+
+    _addTraceArguments(_parser)
+
+    return _parser
+
+#
+## @brief Get argument parser of release command.
+#
+#  @exception N/A
+#
+#  @return argparse.ArgumentParser - Parser.
+def getReleaseParser():
+
+    # Only imports standard library modules
+    import mMecoRelease.metricsLib
+
+    _parser = argparse.ArgumentParser(description='Release a package in development environment.')
+
+    _addRaiseExceptionsArgument(_parser)
+
+    _parser.add_argument('-j',
+                         '--jobs',
+                         help='Number of workers used to copy release files. Default value is {}.'.format(mMecoRelease.defaultsLib.DEFAULT_COPY_JOB_COUNT),
+                         default=mMecoRelease.defaultsLib.DEFAULT_COPY_JOB_COUNT,
+                         required=False,
+                         type=_positiveInteger)
+
+    _parser.add_argument('-dd',
+                         '--dedup',
+                         help='Whether to hard link files that are unchanged since the previous release instead of copying them. Default value is False.',
+                         default=False,
+                         required=False,
+                         action='store_true')
+
+    _parser.add_argument('-rs',
+                         '--resume',
+                         help='Whether to resume an interrupted release of this version by copying only the files it hasn\'t copied. Default value is False.',
+                         default=False,
+                         required=False,
+                         action='store_true')
+
+    _parser.add_argument('-m',
+                         '--metrics',
+                         help='Prometheus text file metrics of the run are merged into, for node exporter textfile collector. Default value is {} environment variable.'.format(mMecoRelease.metricsLib.METRICS_PATH_ENV),
+                         default=None,
+                         required=False,
+                         metavar='FILE')
+
+    _addArchiveArgument(_parser)
+    _addProgressArguments(_parser)
+    _addTraceArguments(_parser)
+
+    return _parser
+
+#
+## @brief Get argument parser of release all command.
+#
+#  @exception N/A
+#
+#  @return argparse.ArgumentParser - Parser.
+def getReleaseAllParser():
+
+    # Only imports standard library modules
+    import mMecoRelease.metricsLib
+
+    _parser = argparse.ArgumentParser(description='Release all packages in development environment.')
+
+    _parser.add_argument('-j',
+                         '--jobs',
+                         help='Number of processes used to run pre-dependencies of the packages and to release packages that don\'t depend on each other. Default value is 1.',
+                         default=1,
+                         required=False,
+                         type=_positiveInteger)
+
+    _parser.add_argument('-co',
+                         '--changed-only',
+                         help='Whether to skip packages that haven\'t changed since they have been successfully released. Default value is False.',
+                         default=False,
+                         required=False,
+                         action='store_true')
+
+    _parser.add_argument('-m',
+                         '--metrics',
+                         help='Prometheus text file metrics of the run are merged into, for node exporter textfile collector. Default value is {} environment variable.'.format(mMecoRelease.metricsLib.METRICS_PATH_ENV),
+                         default=None,
+                         required=False,
+                         metavar='FILE')
+
+    _addArchiveArgument(_parser)
+    _addProgressArguments(_parser)
+    _addTraceArguments(_parser)
+
+    return _parser
+
+#
+## @brief Get argument parser of rebuild catalog command.
+#
+#  @exception N/A
+#
+#  @return argparse.ArgumentParser - Parser.
+def getRebuildCatalogParser():
+
+    _parser = argparse.ArgumentParser(description='Rebuild release catalogs from released packages on disk.')
+
+    _parser.add_argument('-p',
+                         '--path',
+                         help='Release path to rebuild the catalog of. Default value is all release paths of the environment.',
+                         default=None,
+                         required=False)
+
+    return _parser
+
+#
+## @brief Get argument parser of send notifications command.
+#
+#  @exception N/A
+#
+#  @return argparse.ArgumentParser - Parser.
+def getSendNotificationsParser():
+
+    _parser = argparse.ArgumentParser(description='Send release notifications queued in the outbox, the way the background worker does.')
+
+    _parser.add_argument('-sh',
+                         '--smtp-host',
+                         help='Mail server host. Default value is MECO_RELEASE_SMTP_HOST environment variable or localhost.',
+                         default=None,
+                         required=False)
+
+    _parser.add_argument('-sp',
+                         '--smtp-port',
+                         help='Mail server port. Default value is MECO_RELEASE_SMTP_PORT environment variable or 25.',
+                         default=None,
+                         required=False,
+                         type=_positiveInteger)
+
+    return _parser
+
+#
+## @brief Get argument parser of daemon command.
+#
+#  @exception N/A
+#
+#  @return argparse.ArgumentParser - Parser.
+def getDaemonParser():
+
+    # Default number of jobs is defined by daemon module, which only imports standard library modules
+    import mMecoRelease.daemonLib
+
+    _parser = argparse.ArgumentParser(description='Run or control the release daemon, which runs check and release jobs of the command line scripts.')
+
+    _parser.add_argument('action',
+                         help='Action, start runs the daemon in foreground. Default value is status.',
+                         choices=['start', 'status', 'stop'],
+                         default='status',
+                         nargs='?')
+
+    _parser.add_argument('-j',
+                         '--jobs',
+                         help='Number of jobs the daemon runs at the same time. Default value is {}.'.format(mMecoRelease.daemonLib.DEFAULT_DAEMON_JOBS),
+                         default=mMecoRelease.daemonLib.DEFAULT_DAEMON_JOBS,
+                         required=False,
+                         type=_positiveInteger)
+
+    _parser.add_argument('-s',
+                         '--socket',
+                         help='Path of the daemon socket. Default value is {} environment variable or a path in user runtime directory.'.format(mMecoRelease.daemonLib.DAEMON_SOCKET_ENV),
+                         default=None,
+                         required=False)
+
+    return _parser
+
+#
+## @brief Get argument parser of benchmark command.
+#
+#  @exception N/A
+#
+#  @return argparse.ArgumentParser - Parser.
+def getBenchmarkParser():
+
+    _parser = argparse.ArgumentParser(description='Benchmark check, check all, release and release all with synthetic packages in temporary release roots.')
+
+    _parser.add_argument('-o',
+                         '--output',
+                         help='JSON file results are written to. Default value is mmecorelease-benchmark.json.',
+                         default='mmecorelease-benchmark.json',
+                         required=False)
+
+    _parser.add_argument('-pc',
+                         '--package-count',
+                         help='Number of generated packages. Default value is 5.',
+                         default=5,
+                         required=False,
+                         type=_positiveInteger)
+
+    _parser.add_argument('-fc',
+                         '--file-count',
+                         help='Number of files in each generated package. Default value is 200.',
+                         default=200,
+                         required=False,
+                         type=_positiveInteger)
+
+    _parser.add_argument('-d',
+                         '--depth',
+                         help='Maximum directory depth of the generated files. Default value is 3.',
+                         default=3,
+                         required=False,
+                         type=int)
+
+    _parser.add_argument('-fs',
+                         '--file-size',
+                         help='File size distribution in bytes, fixed:SIZE, uniform:MIN-MAX or lognormal:MEDIAN. Default value is lognormal:16384.',
+                         default='lognormal:16384',
+                         required=False)
+
+    _parser.add_argument('-r',
+                         '--repeat',
+                         help='Number of repetitions of each scenario, best one is reported. Default value is 3.',
+                         default=3,
+                         required=False,
+                         type=_positiveInteger)
+
+    _parser.add_argument('-s',
+                         '--seed',
+                         help='Seed of the generated packages. Default value is 0.',
+                         default=0,
+                         required=False,
+                         type=int)
+
+    _parser.add_argument('-j',
+                         '--jobs',
+                         help='Number of jobs given to the commands. Default value is 1.',
+                         default=1,
+                         required=False,
+                         type=_positiveInteger)
+
+    _parser.add_argument('-sc',
+                         '--scenarios',
+                         help='Comma separated scenarios to run, check, checkAll, release and releaseAll. Default value is all of them.',
+                         default='check,checkAll,release,releaseAll',
+                         required=False)
+
+    _parser.add_argument('-wc',
+                         '--warm-cache',
+                         help='Keep caches between repetitions, first repetition is still run with empty caches.',
+                         action='store_true',
+                         required=False)
+
+    _parser.add_argument('-c',
+                         '--compare',
+                         help='JSON file of a previous run to compare the results with.',
+                         default=None,
+                         required=False)
+
+    _parser.add_argument('-w',
+                         '--work-directory',
+                         help='Directory to generate packages in, it must not exist and is kept. Default value is a temporary directory, which is removed.',
+                         default=None,
+                         required=False)
+
+    _parser.add_argument('-v',
+                         '--verbose',
+                         help='Display output of the commands.',
+                         action='store_true',
+                         required=False)
+
+    return _parser
+
+#
+## @brief Check a package.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def check():
+
+    _args = getCheckParser().parse_args()
+
+    if not getDevelopmentPackagesPath('check a development package for release', True):
+        return
+
+    # Watch mode stays resident in this process, a daemon job would never finish
+    if not _args.watch and _submitToDaemon('check'):
+        return
+
+    import mMecoRelease.releaseCmd
+    mMecoRelease.releaseCmd.check(_args)
+
+#
+## @brief Check all packages in development package environment.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def checkAll():
+
+    _args = getCheckAllParser().parse_args()
+
+    if not getDevelopmentPackagesPath('check all development packages for release', True):
+        return
+
+    if _submitToDaemon('checkAll'):
+        return
+
+    import mMecoRelease.releaseCmd
+    mMecoRelease.releaseCmd.checkAll(_args)
+
+#
+## @brief Release a package.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def release():
+
+    _args = getReleaseParser().parse_args()
+
+    if not getDevelopmentPackagesPath('release a development package'):
+        return
+
+    if _submitToDaemon('release'):
+        return
+
+    import mMecoRelease.releaseCmd
+    mMecoRelease.releaseCmd.release(_args)
+
+#
+## @brief Release all packages in development package environment.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def releaseAll():
+
+    _args = getReleaseAllParser().parse_args()
+
+    if not getDevelopmentPackagesPath('release all development packages'):
+        return
+
+    if _submitToDaemon('releaseAll'):
+        return
+
+    import mMecoRelease.releaseCmd
+    mMecoRelease.releaseCmd.releaseAll(_args)
+
+#
+## @brief Rebuild release catalogs from released directories.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def rebuildCatalog():
+
+    _args = getRebuildCatalogParser().parse_args()
+
+    if _submitToDaemon('rebuildCatalog'):
+        return
+
+    import mMecoRelease.releaseCmd
+    mMecoRelease.releaseCmd.rebuildCatalog(_args)
+
+#
+## @brief Benchmark commands with synthetic packages.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def benchmark():
+
+    _parser = getBenchmarkParser()
+    _args   = _parser.parse_args()
+
+    import mMecoRelease.benchmarkLib
+
+    try:
+        mMecoRelease.benchmarkLib.runBenchmark(_args)
+    except ValueError as error:
+        _parser.error(str(error))
+
+#
+## @brief Send release notifications queued in the outbox.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def sendNotifications():
+
+    _args = getSendNotificationsParser().parse_args()
+
+    # Only imports standard library modules
+    import mMecoRelease.outboxLib
+
+    try:
+        sentCount = mMecoRelease.outboxLib.OutboxWorker(_args.smtp_host, _args.smtp_port).drain()
+    except (IOError, OSError) as error:
+        _displayFailure('Outbox could not be read: {}'.format(error))
+        return
+
+    if sentCount is None:
+        _displayFailure('Notifications are being sent by another worker.')
+        return
+
+    sys.stdout.write('{} notifications have been sent.\n'.format(sentCount))
+
+    pendingCount = len(mMecoRelease.outboxLib.getPendingNotifications())
+    if pendingCount:
+        sys.stdout.write('{} notifications are pending, see: {}\n'.format(pendingCount,
+                                                                         os.path.join(mMecoRelease.outboxLib.getOutboxDirectory(),
+                                                                                      mMecoRelease.outboxLib.WORKER_LOG_FILE_NAME)))
+
+#
+## @brief Run or control the release daemon.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def daemon():
+
+    _args = getDaemonParser().parse_args()
+
+    import mMecoRelease.daemonLib
+
+    if _args.action == 'start':
+
+        if not hasattr(os, 'fork') or not hasattr(mMecoRelease.daemonLib.socket, 'AF_UNIX'):
+            _displayFailure('Release daemon is not supported on this platform.')
+            return
+
+        _releaseDaemon = mMecoRelease.daemonLib.ReleaseDaemon(_args.socket, _args.jobs)
+
+        sys.stdout.write('Release daemon is serving {} jobs at a time: {}\n'.format(_args.jobs, _releaseDaemon.socketPath()))
+        sys.stdout.flush()
+
+        try:
+            _releaseDaemon.serve()
+        except RuntimeError as error:
+            _displayFailure(str(error))
+        except KeyboardInterrupt:
+            _releaseDaemon.stop()
+
+        return
+
+    response = mMecoRelease.daemonLib.request(_args.action, _args.socket)
+    if response is None:
+        _displayFailure('Release daemon is not running.')
+        return
+
+    if _args.action == 'stop':
+        sys.stdout.write('{}\n'.format(response.get('message', '')))
+        return
+
+    sys.stdout.write('Release daemon {} runs {} jobs at a time, {} jobs in queue\n'.format(response.get('pid'),
+                                                                                           response.get('jobs'),
+                                                                                           len(response.get('queue', []))))
+
+    for job in response.get('queue', []):
+        sys.stdout.write('{:>5}  {:<8} {:>8.1f}s  {} {} ({})\n'.format(job['id'],
+                                                                      job['state'],
+                                                                      job['elapsed'],
+                                                                      job['command'],
+                                                                      ' '.join(job['arguments']),
+                                                                      job['cwd']))
+
+#
+## @brief Measure import time of a module in fresh interpreters.
+#
+#  @param moduleName [ str | None | in  ] - Name of the module.
+#  @param runs       [ int | None | in  ] - Number of interpreters to measure in.
+#  @param statement  [ str | ''   | in  ] - Statement run after the import, its time and imports are measured as well.
+#
+#  @exception RuntimeError - If the module can not be imported or the statement fails.
+#
+#  @return tuple - Best import time in seconds and sorted names of the deferred packages imported along with the module.
+def _measureModuleImportTime(moduleName, runs, statement=''):
+
+    # Only needed to measure, not imported at module level to keep the entry module light
+    import json
+    import subprocess
+
+    code = ('import sys, time, json\n'
+            'startTime = time.time()\n'
+            'import {0}\n'
+            '{1}\n'
+            'elapsed = time.time() - startTime\n'
+            'sys.stdout.write(json.dumps([elapsed, sorted(set([name.split(".")[0] for name in sys.modules if sys.modules[name]]))]))\n').format(moduleName, statement)
+
+    bestTime = None
+    packages = []
+
+    for i in range(runs):
+
+        process = subprocess.Popen([sys.executable, '-c', code], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        output, error = process.communicate()
+        if process.returncode:
+            raise RuntimeError('{} could not be imported: {}'.format(moduleName, error.decode('utf-8', 'replace').strip()))
+
+        elapsed, loadedPackages = json.loads(output.decode('utf-8'))
+
+        bestTime = elapsed if bestTime is None else min(bestTime, elapsed)
+        packages = sorted([str(name) for name in loadedPackages if name in DEFERRED_PACKAGES])
+
+    return bestTime, packages
+
+#
+## @brief Measure import time of the command line entry module and check it for regressions.
+#
+#  Import time of this module, along with building all of its argument parsers as --help and invalid
+#  arguments do, is measured in fresh interpreters and compared to the import time of mMecoRelease.releaseCmd
+#  module. Exit code is non zero if any of DEFERRED_PACKAGES is imported by this module or its parsers, or
+#  its import time exceeds given maximum, so it can be run by continuous integration.
+#
+#  Usage: python -c "import mMecoRelease.cliLib;mMecoRelease.cliLib.measureImportTime()" --max-ms 50
+#
+#  @exception SystemExit - Always.
+#
+#  @return None - None.
+def measureImportTime():
+
+    _parser = argparse.ArgumentParser(description='Measure import time of the command line entry module.')
+
+    _parser.add_argument('-r',
+                         '--runs',
+                         help='Number of fresh interpreters the import time is measured in, best time is reported. Default value is 5.',
+                         default=5,
+                         required=False,
+                         type=_positiveInteger)
+
+    _parser.add_argument('-mm',
+                         '--max-ms',
+                         help='Maximum import time of the entry module in milliseconds. Default value is no maximum.',
+                         default=None,
+                         required=False,
+                         type=float)
+
+    _args = _parser.parse_args()
+
+    try:
+        entryTime, entryPackages = _measureModuleImportTime(__name__, _args.runs, _BUILD_PARSERS_STATEMENT.format(__name__))
+        fullTime, fullPackages   = _measureModuleImportTime('mMecoRelease.releaseCmd', _args.runs)
+    except RuntimeError as error:
+        sys.stderr.write('{}\n'.format(error))
+        sys.exit(2)
+
+    sys.stdout.write('{:<28} {:>8.1f} ms  {}\n'.format(__name__, entryTime * 1000.0, ', '.join(entryPackages)))
+    sys.stdout.write('{:<28} {:>8.1f} ms  {}\n'.format('mMecoRelease.releaseCmd', fullTime * 1000.0, ', '.join(fullPackages)))
+
+    failures = []
+
+    if entryPackages:
+        failures.append('{} imports deferred packages: {}'.format(__name__, ', '.join(entryPackages)))
+
+    if _args.max_ms is not None and entryTime * 1000.0 > _args.max_ms:
+        failures.append('{} import time {:.1f} ms exceeds {:.1f} ms'.format(__name__, entryTime * 1000.0, _args.max_ms))
+
+    for failure in failures:
+        sys.stderr.write('{}\n'.format(failure))
+
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,669 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/copyLib.py @brief [ FILE   ] - File copy module.
+## @package mMecoRelease.copyLib    @brief [ MODULE ] - File copy module.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORTS
+# ----------------------------------------------------------------------------------------------------
+import os
+import sys
+import stat
+import time
+import errno
+import hashlib
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+import mFileSystem.directoryLib
+
+import mMecoRelease.defaultsLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ int ] - Default number of copy workers.
+DEFAULT_JOB_COUNT = mMecoRelease.defaultsLib.DEFAULT_COPY_JOB_COUNT
+
+## [ str ] - Name of the content hash algorithm used by newHash function.
+HASH_ALGORITHM    = 'blake2b-160' if hasattr(hashlib, 'blake2b') else 'sha1'
+
+## [ int ] - Size of chunks files are read in.
+CHUNK_SIZE        = 1024 * 1024
+
+## [ object ] - Sentinel a worker puts into the result queue once it has stopped.
+_WORKER_DONE      = object()
+
+## [ str ] - File is cloned by sharing data blocks with the source, on copy on write file systems.
+COPY_METHOD_CLONE           = 'clone'
+
+## [ str ] - File is copied by the kernel with copy_file_range, which may be offloaded to the file server.
+COPY_METHOD_COPY_FILE_RANGE = 'copy_file_range'
+
+## [ str ] - File is copied by the kernel with sendfile.
+COPY_METHOD_SENDFILE        = 'sendfile'
+
+## [ str ] - File is read and written in user space.
+COPY_METHOD_STREAM          = 'stream'
+
+## [ str ] - File is hard linked from a previous release.
+COPY_METHOD_LINK            = 'link'
+
+## [ int ] - FICLONE ioctl request of Linux.
+FICLONE                     = 0x40049409
+
+## [ int ] - Maximum number of bytes copied by a single copy_file_range or sendfile call.
+KERNEL_COPY_CHUNK_SIZE      = 1024 * 1024 * 1024
+
+## [ int ] - Permission bits removed from released files.
+WRITE_PERMISSIONS           = stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH
+
+## [ int ] - Flags destination files are created with, binary flag is required on Windows.
+_CREATE_FLAGS               = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+
+## [ bool ] - Whether file times can be set through a descriptor.
+_UTIME_WITH_DESCRIPTOR      = os.utime in getattr(os, 'supports_fd', set())
+
+## [ tuple of int ] - Errors that mean a copy method is not supported for the files being copied.
+_UNSUPPORTED_ERRORS         = tuple([getattr(errno, name) for name in ['EXDEV', 'EOPNOTSUPP', 'ENOTSUP', 'EINVAL', 'ENOSYS', 'ENOTTY']
+                                     if hasattr(errno, name)])
+
+#
+## @brief Get copy methods the kernel provides, fastest first.
+#
+#  @exception N/A
+#
+#  @return list of str - Methods, empty if the platform provides none.
+def getKernelCopyMethods():
+
+    # sendfile of other platforms only writes to sockets
+    if not sys.platform.startswith('linux'):
+        return []
+
+    methods = []
+
+    if fcntl:
+        methods.append(COPY_METHOD_CLONE)
+
+    if hasattr(os, 'copy_file_range'):
+        methods.append(COPY_METHOD_COPY_FILE_RANGE)
+
+    if hasattr(os, 'sendfile'):
+        methods.append(COPY_METHOD_SENDFILE)
+
+    return methods
+
+#
+## @brief Create a new content hash object.
+#
+#  BLAKE2 is used where available, SHA-1 otherwise.
+#
+#  @exception N/A
+#
+#  @return object - Hash object.
+def newHash():
+
+    if hasattr(hashlib, 'blake2b'):
+        return hashlib.blake2b(digest_size=20)
+
+    return hashlib.sha1()
+
+#
+## @brief Get content hash of given file.
+#
+#  @param path [ str | None | in  ] - Path of the file.
+#
+#  @exception IOError - If the file can not be read.
+#
+#  @return str - Hex digest.
+def hashFile(path):
+
+    _hash = newHash()
+
+    with open(path, 'rb') as sourceFile:
+        while True:
+            chunk = sourceFile.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            _hash.update(chunk)
+
+    return _hash.hexdigest()
+
+#
+## @brief [ CLASS ] - Exception raised when a file can not be copied.
+class CopyError(Exception):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param relativePath [ str | None | in  ] - Relative path of the file that failed.
+    #  @param message      [ str | None | in  ] - Message.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self, relativePath, message):
+
+        Exception.__init__(self, '{}: {}'.format(relativePath, message))
+
+        ## [ str ] - Relative path of the file that failed.
+        self.relativePath = relativePath
+
+        ## [ str ] - Message.
+        self.message      = message
+
+#
+## @brief [ CLASS ] - Class that holds the result of a single file copy.
+class CopyResult(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param relativePath    [ str | None | in  ] - Relative path of the file.
+    #  @param sourceFile      [ str | None | in  ] - Absolute path of the source file.
+    #  @param destinationFile [ str | None | in  ] - Absolute path of the destination file.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self, relativePath, sourceFile, destinationFile):
+
+        ## [ str ] - Relative path of the file.
+        self.relativePath    = relativePath
+
+        ## [ str ] - Absolute path of the source file.
+        self.sourceFile      = sourceFile
+
+        ## [ str ] - Absolute path of the destination file.
+        self.destinationFile = destinationFile
+
+        ## [ bool ] - Whether the destination file is a hard link to a previously released file.
+        self.linked          = False
+
+        ## [ int ] - Size of the source file in bytes.
+        self.size            = 0
+
+        ## [ float ] - Modification time of the source file.
+        self.mtime           = 0.0
+
+        ## [ str ] - Content hash of the file, None if it has not been computed.
+        self.hash            = None
+
+        ## [ float ] - Time the copy has started, as returned by time.time.
+        self.startTime       = time.time()
+
+        ## [ float ] - Time the copy has ended, as returned by time.time.
+        self.endTime         = self.startTime
+
+        ## [ int ] - Identifier of the thread that has copied the file.
+        self.threadId        = threading.current_thread().ident
+
+        ## [ str ] - Method the file has been copied with, one of COPY_METHOD_* constants.
+        self.method          = None
+
+#
+## @brief [ CLASS ] - Class to copy files from a source root to a destination root.
+#
+#  Files are copied by a bounded pool of worker threads. Results are handed to the
+#  callback in the calling thread, the first failure stops the workers and is raised
+#  as CopyError once every worker has stopped, no result is reported after a failure.
+#
+#  If a link root is given, files that are identical to the ones in the link root
+#  (same size and content hash) are hard linked instead of being copied. If link paths
+#  are given as well, only those files are hard linked and they are not compared,
+#  which is used when a release plan already determined them to be unchanged.
+#
+#  On Linux files are copied by the kernel if possible, cloned on copy on write file
+#  systems or copied with copy_file_range or sendfile, so their content doesn't pass
+#  through user space. Methods that fail as unsupported are not tried again by the
+#  copier and the next one is used, down to reading and writing in user space.
+class FileCopier(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param sourceRoot      [ str | None              | in  ] - Source root.
+    #  @param destinationRoot [ str | None              | in  ] - Destination root.
+    #  @param jobs            [ int | DEFAULT_JOB_COUNT | in  ] - Number of copy workers.
+    #  @param linkRoot        [ str         | None              | in  ] - Root of a previous release unchanged files are hard linked from.
+    #  @param linkPaths       [ set of str  | None              | in  ] - Relative paths of files known to be unchanged in the link root.
+    #  @param hashFiles       [ bool        | False             | in  ] - Whether to compute content hash of copied files.
+    #  @param sourceStats     [ dict        | None              | in  ] - Size and modification time of source files already stated, keys are relative paths.
+    #  @param hashedPaths     [ set of str  | None              | in  ] - Relative paths of files whose content hash is known, these aren't hashed if hashFiles is True.
+    #  @param kernelCopy      [ bool        | True              | in  ] - Whether to let the kernel copy files if possible.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self, sourceRoot, destinationRoot, jobs=DEFAULT_JOB_COUNT, linkRoot=None, linkPaths=None, hashFiles=False, sourceStats=None,
+                 hashedPaths=None, kernelCopy=True):
+
+        ## [ str ] - Source root.
+        self._sourceRoot      = sourceRoot
+
+        ## [ str ] - Destination root.
+        self._destinationRoot = destinationRoot
+
+        ## [ int ] - Number of copy workers.
+        self._jobs            = max(1, int(jobs or DEFAULT_JOB_COUNT))
+
+        ## [ str ] - Root of a previous release unchanged files are hard linked from.
+        self._linkRoot        = linkRoot if linkRoot and hasattr(os, 'link') else None
+
+        ## [ set of str ] - Relative paths of files known to be unchanged in the link root.
+        self._linkPaths       = linkPaths
+
+        ## [ bool ] - Whether to compute content hash of copied files.
+        self._hashFiles       = hashFiles
+
+        ## [ dict ] - Size and modification time of source files already stated, keys are relative paths.
+        self._sourceStats     = sourceStats or {}
+
+        ## [ set of str ] - Relative paths of files whose content hash is known.
+        self._hashedPaths     = hashedPaths or set()
+
+        ## [ list of str ] - Kernel copy methods to try, fastest first.
+        self._copyMethods     = getKernelCopyMethods() if kernelCopy else []
+
+        ## [ set of str ] - Kernel copy methods that have failed as unsupported, shared by the workers.
+        self._unsupportedMethods = set()
+
+        ## [ int ] - File mode creation mask of the process, read once since reading it means setting it.
+        self._umask           = os.umask(0)
+        os.umask(self._umask)
+
+    #
+    ## @brief Create destination directories of given files.
+    #
+    #  Directories are created up front so workers never race on them. Each directory is created
+    #  once with a single call, parents sort before their children so no directory is checked first.
+    #
+    #  @param relativePaths [ list of str | None | in  ] - Relative file paths.
+    #
+    #  @exception CopyError - If a directory can not be created.
+    #
+    #  @return None - None.
+    def _createDirectories(self, relativePaths):
+
+        directories = set()
+
+        for relativePath in relativePaths:
+            directory = os.path.dirname(relativePath)
+            while directory and not directory in directories:
+                directories.add(directory)
+                directory = os.path.dirname(directory)
+
+        for directory in sorted(directories):
+
+            try:
+                os.mkdir(mFileSystem.directoryLib.Directory.join(self._destinationRoot, directory))
+            except OSError as error:
+                if error.errno != errno.EEXIST:
+                    raise CopyError(directory, str(error))
+
+    #
+    ## @brief Hard link a file from the link root if it is identical to the source file.
+    #
+    #  @param result [ mMecoRelease.copyLib.CopyResult | None | in  ] - Result of the file.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Whether the file has been linked.
+    def _linkFile(self, result):
+
+        linkFile = mFileSystem.directoryLib.Directory.join(self._linkRoot, result.relativePath)
+
+        try:
+            if self._linkPaths is None:
+
+                linkStat = os.stat(linkFile)
+                if not stat.S_ISREG(linkStat.st_mode) or linkStat.st_size != result.size:
+                    return False
+
+                result.hash = hashFile(result.sourceFile)
+                if hashFile(linkFile) != result.hash:
+                    return False
+
+            elif not result.relativePath in self._linkPaths:
+                return False
+
+            os.link(linkFile, result.destinationFile)
+
+        except (IOError, OSError):
+            return False
+
+        result.linked = True
+        result.method = COPY_METHOD_LINK
+
+        return True
+
+    #
+    ## @brief Copy content of a file with a kernel copy method.
+    #
+    #  @param method                [ str | None | in  ] - Method, one of COPY_METHOD_* constants.
+    #  @param sourceDescriptor      [ int | None | in  ] - Descriptor of the source file.
+    #  @param destinationDescriptor [ int | None | in  ] - Descriptor of the destination file.
+    #  @param size                  [ int | None | in  ] - Size of the source file.
+    #
+    #  @exception IOError - If the method fails.
+    #  @exception OSError - If the method fails.
+    #
+    #  @return bool - Whether the whole file has been copied.
+    def _kernelCopyFile(self, method, sourceDescriptor, destinationDescriptor, size):
+
+        if method == COPY_METHOD_CLONE:
+            fcntl.ioctl(destinationDescriptor, FICLONE, sourceDescriptor)
+            return True
+
+        copiedSize = 0
+
+        while copiedSize < size:
+
+            if method == COPY_METHOD_COPY_FILE_RANGE:
+                count = os.copy_file_range(sourceDescriptor, destinationDescriptor, min(size - copiedSize, KERNEL_COPY_CHUNK_SIZE))
+            else:
+                count = os.sendfile(destinationDescriptor, sourceDescriptor, copiedSize, min(size - copiedSize, KERNEL_COPY_CHUNK_SIZE))
+
+            # Some file systems report end of file early, such files are copied by the next method
+            if not count:
+                return False
+
+            copiedSize += count
+
+        return True
+
+    #
+    ## @brief Create a read only copy of a file with the times of the source file.
+    #
+    #  Mode and times are set through descriptors, so the destination is never looked up again.
+    #
+    #  @param sourceFile      [ str                             | None | in  ] - Absolute path of the source file.
+    #  @param destinationFile [ str                             | None | in  ] - Absolute path of the destination file, it must not exist.
+    #  @param result          [ mMecoRelease.copyLib.CopyResult | None | in  ] - Result, copy method and content hash are set.
+    #
+    #  @exception IOError - If a file can not be read or written.
+    #  @exception OSError - If a file can not be read or written.
+    #
+    #  @return None - None.
+    def _writeFile(self, sourceFile, destinationFile, result):
+
+        with open(sourceFile, 'rb') as source:
+
+            sourceStat = os.fstat(source.fileno())
+            size       = sourceStat.st_size
+            mode       = stat.S_IMODE(sourceStat.st_mode) & ~WRITE_PERMISSIONS
+
+            # File is created with its final read only mode, the descriptor is writable regardless
+            descriptor = os.open(destinationFile, _CREATE_FLAGS, mode)
+            if mode & self._umask and hasattr(os, 'fchmod'):
+                os.fchmod(descriptor, mode)
+
+            with os.fdopen(descriptor, 'wb') as destination:
+                self._writeContent(source, destination, size, result)
+
+                destination.flush()
+                if _UTIME_WITH_DESCRIPTOR:
+                    os.utime(destination.fileno(), ns=(sourceStat.st_atime_ns, sourceStat.st_mtime_ns))
+
+        if not _UTIME_WITH_DESCRIPTOR:
+            os.utime(destinationFile, (sourceStat.st_atime, sourceStat.st_mtime))
+
+    #
+    ## @brief Copy content of an open file, by the kernel if possible.
+    #
+    #  Kernel copies don't pass content through this process, so a file copied by the kernel is hashed
+    #  by reading its copy right after, while it is still in page cache. A file streamed in user space
+    #  is hashed in the same pass it is copied.
+    #
+    #  @param source      [ file                            | None | in  ] - Source file.
+    #  @param destination [ file                            | None | in  ] - Destination file.
+    #  @param size        [ int                             | None | in  ] - Size of the source file.
+    #  @param result      [ mMecoRelease.copyLib.CopyResult | None | in  ] - Result, copy method and content hash are set.
+    #
+    #  @exception IOError - If a file can not be read or written.
+    #  @exception OSError - If a file can not be read or written.
+    #
+    #  @return None - None.
+    def _writeContent(self, source, destination, size, result):
+
+        for method in self._copyMethods:
+
+            if method in self._unsupportedMethods:
+                continue
+
+            try:
+                if self._kernelCopyFile(method, source.fileno(), destination.fileno(), size):
+                    result.method = method
+                    break
+            except (IOError, OSError) as error:
+                if not error.errno in _UNSUPPORTED_ERRORS:
+                    raise
+                self._unsupportedMethods.add(method)
+
+            # Next method starts over
+            destination.truncate(0)
+            os.lseek(destination.fileno(), 0, os.SEEK_SET)
+            os.lseek(source.fileno(), 0, os.SEEK_SET)
+
+        if result.method:
+            if self._hashFiles and not result.relativePath in self._hashedPaths:
+                result.hash = hashFile(result.destinationFile)
+            return
+
+        _hash = newHash() if self._hashFiles else None
+
+        while True:
+            chunk = source.read(CHUNK_SIZE)
+            if not chunk:
+                break
+
+            destination.write(chunk)
+
+            if _hash:
+                _hash.update(chunk)
+
+        result.method = COPY_METHOD_STREAM
+        result.hash   = _hash.hexdigest() if _hash else None
+
+    #
+    ## @brief Copy a single file and make it read only.
+    #
+    #  @param relativePath [ str | None | in  ] - Relative path of the file.
+    #
+    #  @exception CopyError - If the file can not be copied.
+    #
+    #  @return mMecoRelease.copyLib.CopyResult - Result.
+    def _copyFile(self, relativePath):
+
+        sourceFile      = mFileSystem.directoryLib.Directory.join(self._sourceRoot, relativePath)
+        destinationFile = mFileSystem.directoryLib.Directory.join(self._destinationRoot, relativePath)
+
+        result = CopyResult(relativePath, sourceFile, destinationFile)
+
+        if relativePath in self._sourceStats:
+            result.size, result.mtime = self._sourceStats[relativePath]
+        else:
+            try:
+                sourceStat = os.stat(sourceFile)
+            except OSError:
+                raise CopyError(relativePath, 'File doesn\'t exist')
+
+            result.size  = sourceStat.st_size
+            result.mtime = sourceStat.st_mtime
+
+        try:
+            if self._linkRoot and self._linkFile(result):
+                result.endTime = time.time()
+                return result
+
+            self._writeFile(sourceFile, destinationFile, result)
+
+        except Exception as error:
+            raise CopyError(relativePath, str(error))
+
+        result.endTime = time.time()
+
+        return result
+
+    #
+    ## @brief Worker thread body.
+    #
+    #  @param pending [ queue.Queue     | None | in  ] - Relative paths waiting to be copied.
+    #  @param results [ queue.Queue     | None | in  ] - Queue results are put into.
+    #  @param abort   [ threading.Event | None | in  ] - Event set once a failure occurs.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def _work(self, pending, results, abort):
+
+        try:
+            while not abort.is_set():
+
+                try:
+                    relativePath = pending.get_nowait()
+                except queue.Empty:
+                    return
+
+                try:
+                    results.put((self._copyFile(relativePath), None))
+                except CopyError as error:
+                    abort.set()
+                    results.put((None, error))
+                    return
+
+        finally:
+            results.put(_WORKER_DONE)
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Get number of copy workers.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Value.
+    def jobs(self):
+
+        return self._jobs
+
+    #
+    ## @brief Get root of a previous release unchanged files are hard linked from.
+    #
+    #  @exception N/A
+    #
+    #  @return str  - Path.
+    #  @return None - If hard linking is disabled.
+    def linkRoot(self):
+
+        return self._linkRoot
+
+    #
+    ## @brief Copy given files.
+    #
+    #  @param relativePaths [ list of str | None | in  ] - Relative file paths.
+    #  @param callback      [ callable    | None | in  ] - Callable invoked with a CopyResult for each copied file.
+    #
+    #  @exception CopyError - If a file can not be copied.
+    #
+    #  @return None - None.
+    def copy(self, relativePaths, callback=None):
+
+        self._createDirectories(relativePaths)
+
+        jobs = min(self._jobs, len(relativePaths))
+
+        if jobs < 2:
+            for relativePath in relativePaths:
+                result = self._copyFile(relativePath)
+                if callback:
+                    callback(result)
+            return
+
+        pending = queue.Queue()
+        for relativePath in relativePaths:
+            pending.put(relativePath)
+
+        results = queue.Queue()
+        abort   = threading.Event()
+        workers = []
+
+        for i in range(jobs):
+            worker        = threading.Thread(target=self._work, args=(pending, results, abort))
+            worker.daemon = True
+            worker.start()
+            workers.append(worker)
+
+        failure       = None
+        finishedCount = 0
+
+        try:
+            while finishedCount < len(workers):
+
+                try:
+                    item = results.get(True, 0.1)
+                except queue.Empty:
+                    continue
+
+                if item is _WORKER_DONE:
+                    finishedCount += 1
+                    continue
+
+                result, error = item
+
+                if error:
+                    if failure is None:
+                        failure = error
+                    continue
+
+                if failure is None and callback:
+                    callback(result)
+
+        finally:
+            abort.set()
+            for worker in workers:
+                worker.join()
+
+        if failure:
+            raise failure
@@ -0,0 +1,1276 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/daemonLib.py @brief [ FILE   ] - Release daemon module.
+## @package mMecoRelease.daemonLib    @brief [ MODULE ] - Release daemon module.
+#
+#  Daemon keeps the framework imported and runs check and release jobs submitted by the command line
+#  scripts over a Unix domain socket. Each job runs in a process forked by a launcher process, with the
+#  environment, working directory and arguments of the client, and its output is streamed back.
+#
+#  Launcher is forked once the framework is imported and before the daemon starts any thread, so jobs
+#  are forked from a single threaded process and never inherit locks held by other threads.
+#
+#  Messages of clients are JSON objects separated by new lines, messages of the launcher are length
+#  prefixed as file descriptors follow them. This module must only import standard library
+#  modules at module level, since clients import it from mMecoRelease.cliLib.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORTS
+# ----------------------------------------------------------------------------------------------------
+import os
+import sys
+import json
+import array
+import time
+import errno
+import codecs
+import socket
+import select
+import struct
+import signal
+import threading
+import traceback
+
+import mMecoRelease.cacheLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ str ] - Environment variable that overrides the path of the daemon socket.
+DAEMON_SOCKET_ENV      = 'MECO_RELEASE_DAEMON_SOCKET'
+
+## [ str ] - Environment variable that makes the command line scripts run jobs locally if set.
+NO_DAEMON_ENV          = 'MECO_RELEASE_NO_DAEMON'
+
+## [ int ] - Default number of jobs the daemon runs at the same time.
+DEFAULT_DAEMON_JOBS    = 2
+
+## [ dict ] - Commands that can be submitted, keys are command names, values are functions of mMecoRelease.cliLib.
+JOB_COMMANDS           = {'check'          : 'check',
+                          'checkAll'       : 'checkAll',
+                          'release'        : 'release',
+                          'releaseAll'     : 'releaseAll',
+                          'rebuildCatalog' : 'rebuildCatalog'}
+
+## [ tuple of str ] - Commands that write to release paths, which are serialized per package.
+RELEASE_COMMANDS       = ('release', 'releaseAll')
+
+## [ int ] - Size of the chunks output of jobs is read in.
+OUTPUT_CHUNK_SIZE      = 64 * 1024
+
+## [ str ] - Format of the length prefix of the messages exchanged with the launcher.
+_FRAME_HEADER_FORMAT   = '!I'
+
+## [ int ] - Size of the length prefix of the messages exchanged with the launcher.
+_FRAME_HEADER_SIZE     = struct.calcsize(_FRAME_HEADER_FORMAT)
+
+#
+## @brief Get path of the daemon socket.
+#
+#  @exception N/A
+#
+#  @return str - Path.
+def getSocketPath():
+
+    socketPath = os.environ.get(DAEMON_SOCKET_ENV)
+    if socketPath:
+        return socketPath
+
+    runtimeDirectory = os.environ.get('XDG_RUNTIME_DIR')
+    if runtimeDirectory and os.path.isdir(runtimeDirectory):
+        return os.path.join(runtimeDirectory, 'mmecorelease.sock')
+
+    return os.path.join(mMecoRelease.cacheLib.getCacheDirectory(), 'daemon.sock')
+
+#
+## @brief Send a message.
+#
+#  @param connection [ socket.socket | None | in  ] - Connection.
+#  @param message    [ dict          | None | in  ] - Message.
+#
+#  @exception socket.error - If the message can not be sent.
+#
+#  @return None - None.
+def _sendMessage(connection, message):
+
+    connection.sendall('{}\n'.format(json.dumps(message)).encode('utf-8'))
+
+#
+## @brief Read messages from a connection.
+#
+#  @param connection [ socket.socket | None | in  ] - Connection.
+#
+#  @exception N/A
+#
+#  @return generator - Messages as dict instances, stops once the connection is closed.
+def _readMessages(connection):
+
+    buffer = b''
+
+    while True:
+
+        try:
+            data = connection.recv(OUTPUT_CHUNK_SIZE)
+        except socket.error:
+            return
+
+        if not data:
+            return
+
+        buffer += data
+
+        while b'\n' in buffer:
+
+            line, buffer = buffer.split(b'\n', 1)
+
+            try:
+                message = json.loads(line.decode('utf-8'))
+            except ValueError:
+                continue
+
+            if isinstance(message, dict):
+                yield message
+
+#
+## @brief Read given number of bytes from a connection.
+#
+#  @param connection [ socket.socket | None | in  ] - Connection.
+#  @param size       [ int           | None | in  ] - Number of bytes.
+#
+#  @exception N/A
+#
+#  @return bytes - Data.
+#  @return None  - If the connection is closed before all bytes are read.
+def _receiveExactly(connection, size):
+
+    data = b''
+
+    while len(data) < size:
+
+        try:
+            chunk = connection.recv(size - len(data))
+        except socket.error as error:
+            if error.args[0] == errno.EINTR:
+                continue
+            return None
+
+        if not chunk:
+            return None
+
+        data += chunk
+
+    return data
+
+#
+## @brief Send a length prefixed message, used where file descriptors follow messages on the same connection.
+#
+#  @param connection [ socket.socket | None | in  ] - Connection.
+#  @param message    [ dict          | None | in  ] - Message.
+#
+#  @exception socket.error - If the message can not be sent.
+#
+#  @return None - None.
+def _sendFrame(connection, message):
+
+    content = json.dumps(message).encode('utf-8')
+
+    connection.sendall(struct.pack(_FRAME_HEADER_FORMAT, len(content)) + content)
+
+#
+## @brief Read a length prefixed message, nothing beyond the message is read.
+#
+#  @param connection [ socket.socket | None | in  ] - Connection.
+#
+#  @exception N/A
+#
+#  @return dict - Message.
+#  @return None - If the connection is closed.
+def _readFrame(connection):
+
+    header = _receiveExactly(connection, _FRAME_HEADER_SIZE)
+    if header is None:
+        return None
+
+    content = _receiveExactly(connection, struct.unpack(_FRAME_HEADER_FORMAT, header)[0])
+    if content is None:
+        return None
+
+    try:
+        return json.loads(content.decode('utf-8'))
+    except ValueError:
+        return None
+
+#
+## @brief Send file descriptors over a Unix domain socket.
+#
+#  @param connection [ socket.socket | None | in  ] - Connection.
+#  @param fds        [ list of int   | None | in  ] - File descriptors.
+#
+#  @exception socket.error - If the file descriptors can not be sent.
+#
+#  @return None - None.
+def _sendFds(connection, fds):
+
+    if hasattr(connection, 'sendmsg'):
+        connection.sendmsg([b'\0'], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array('i', fds).tobytes())])
+        return
+
+    # Sockets of Python 2 can't send ancillary data
+    import _multiprocessing
+
+    for fd in fds:
+        _multiprocessing.sendfd(connection.fileno(), fd)
+
+#
+## @brief Receive file descriptors sent by _sendFds function.
+#
+#  @param connection [ socket.socket | None | in  ] - Connection.
+#  @param count      [ int           | None | in  ] - Number of file descriptors.
+#
+#  @exception socket.error - If the file descriptors can not be received.
+#
+#  @return list of int - File descriptors.
+def _receiveFds(connection, count):
+
+    if not hasattr(connection, 'recvmsg'):
+        import _multiprocessing
+        return [_multiprocessing.recvfd(connection.fileno()) for index in range(count)]
+
+    fds = array.array('i')
+
+    data, ancillary, flags, address = connection.recvmsg(1, socket.CMSG_SPACE(count * fds.itemsize))
+    if not data:
+        raise socket.error(errno.ECONNRESET, 'Connection has been closed')
+
+    for level, kind, content in ancillary:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(content[:len(content) - len(content) % fds.itemsize])
+
+    if len(fds) != count:
+        for fd in fds:
+            os.close(fd)
+        raise socket.error(errno.EBADMSG, 'Expected {} file descriptors, received {}'.format(count, len(fds)))
+
+    return list(fds)
+
+#
+## @brief Connect to the daemon.
+#
+#  @param socketPath [ str | None | in  ] - Path of the daemon socket, default one is used if None.
+#
+#  @exception N/A
+#
+#  @return socket.socket - Connection.
+#  @return None          - If no daemon is running.
+def connect(socketPath=None):
+
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+
+    socketPath = socketPath or getSocketPath()
+    if not os.path.exists(socketPath):
+        return None
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+    try:
+        connection.connect(socketPath)
+    except socket.error:
+        connection.close()
+        return None
+
+    return connection
+
+#
+## @brief Forward standard input of the client to the daemon, so jobs can ask for confirmation.
+#
+#  @param connection [ socket.socket | None | in  ] - Connection.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def _forwardInput(connection):
+
+    try:
+        while True:
+            line = sys.stdin.readline()
+            if not line:
+                break
+            _sendMessage(connection, {'type':'input', 'data':line})
+
+        _sendMessage(connection, {'type':'eof'})
+
+    except (IOError, OSError, ValueError, socket.error):
+        pass
+
+#
+## @brief Submit a job to the daemon and stream its output.
+#
+#  @param command   [ str         | None | in  ] - Command, one of JOB_COMMANDS.
+#  @param arguments [ list of str | None | in  ] - Command line arguments, sys.argv is used if None.
+#
+#  @exception N/A
+#
+#  @return int  - Exit code of the job.
+#  @return None - If no daemon is running or it is disabled, job should be run locally.
+def submit(command, arguments=None):
+
+    if os.environ.get(NO_DAEMON_ENV):
+        return None
+
+    connection = connect()
+    if not connection:
+        return None
+
+    try:
+        _sendMessage(connection, {'type'        : 'job',
+                                  'command'     : command,
+                                  'arguments'   : list(sys.argv[1:] if arguments is None else arguments),
+                                  'cwd'         : os.getcwd(),
+                                  'environment' : dict(os.environ)})
+    except socket.error:
+        connection.close()
+        return None
+
+    inputThread        = threading.Thread(target=_forwardInput, args=(connection,))
+    inputThread.daemon = True
+    inputThread.start()
+
+    try:
+        for message in _readMessages(connection):
+
+            if message.get('type') == 'output':
+                sys.stdout.write(message.get('data', ''))
+                sys.stdout.flush()
+
+            elif message.get('type') == 'status':
+                sys.stderr.write('{}\n'.format(message.get('message', '')))
+                sys.stderr.flush()
+
+            elif message.get('type') == 'exit':
+                return int(message.get('code', 1))
+
+    finally:
+        connection.close()
+
+    sys.stderr.write('Connection to the release daemon has been lost.\n')
+
+    return 1
+
+#
+## @brief Request status or shutdown of the daemon.
+#
+#  @param requestType [ str | None | in  ] - Request type, status or stop.
+#  @param socketPath  [ str | None | in  ] - Path of the daemon socket, default one is used if None.
+#
+#  @exception N/A
+#
+#  @return dict - Response.
+#  @return None - If no daemon is running.
+def request(requestType, socketPath=None):
+
+    connection = connect(socketPath)
+    if not connection:
+        return None
+
+    try:
+        _sendMessage(connection, {'type':requestType})
+        for message in _readMessages(connection):
+            return message
+    except socket.error:
+        return None
+    finally:
+        connection.close()
+
+    return None
+
+#
+## @brief Whether the resources of two jobs overlap, one being the same as or within the other.
+#
+#  @param first  [ str | None | in  ] - Resource path of the first job.
+#  @param second [ str | None | in  ] - Resource path of the second job.
+#
+#  @exception N/A
+#
+#  @return bool - Result.
+def _isOverlapping(first, second):
+
+    if not first or not second:
+        return False
+
+    first  = first.rstrip(os.sep)  + os.sep
+    second = second.rstrip(os.sep) + os.sep
+
+    return first.startswith(second) or second.startswith(first)
+
+#
+## @brief [ CLASS ] - Class that holds a job submitted to the daemon.
+class Job(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param jobId       [ int           | None | in  ] - Identifier.
+    #  @param connection  [ socket.socket | None | in  ] - Connection of the client.
+    #  @param command     [ str           | None | in  ] - Command, one of JOB_COMMANDS.
+    #  @param arguments   [ list of str   | None | in  ] - Command line arguments.
+    #  @param cwd         [ str           | None | in  ] - Working directory of the client.
+    #  @param environment [ dict          | None | in  ] - Environment of the client.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self, jobId, connection, command, arguments, cwd, environment):
+
+        ## [ int ] - Identifier.
+        self.jobId        = jobId
+
+        ## [ socket.socket ] - Connection of the client.
+        self.connection   = connection
+
+        ## [ str ] - Command.
+        self.command      = command
+
+        ## [ list of str ] - Command line arguments.
+        self.arguments    = arguments
+
+        ## [ str ] - Working directory of the client.
+        self.cwd          = cwd
+
+        ## [ dict ] - Environment of the client.
+        self.environment  = environment
+
+        ## [ str ] - Path the job releases to, jobs with overlapping resources don't run at the same time.
+        self.resource     = None
+
+        ## [ str ] - State, queued, running or done.
+        self.state        = 'queued'
+
+        ## [ int ] - Process identifier of the job process, None until it is started or if it can't be.
+        self.pid          = None
+
+        ## [ int ] - Exit code of the job process, None until it exits.
+        self.exitCode     = None
+
+        ## [ threading.Event ] - Event set once the job process has been started or has failed to start.
+        self.launched     = threading.Event()
+
+        ## [ threading.Event ] - Event set once the job process has exited.
+        self.exited       = threading.Event()
+
+        ## [ int ] - File descriptor standard input of the job process is written to.
+        self.inputFd      = None
+
+        ## [ list of str ] - Input received before the job has started.
+        self.pendingInput = []
+
+        ## [ bool ] - Whether the client has closed its standard input.
+        self.inputClosed  = False
+
+        ## [ int ] - Number of jobs ahead of this job last reported to the client.
+        self.position     = None
+
+        ## [ float ] - Submit time.
+        self.submitTime   = time.time()
+
+        ## [ float ] - Start time.
+        self.startTime    = None
+
+        ## [ threading.Lock ] - Lock that serializes messages sent to the client.
+        self._sendLock    = threading.Lock()
+
+        if command in RELEASE_COMMANDS:
+            if command == 'release':
+                self.resource = os.path.realpath(cwd)
+            else:
+                self.resource = os.path.realpath(environment.get('MECO_DEVELOPMENT_PACKAGES_PATH', cwd))
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Send a message to the client, errors are ignored as the client may have disconnected.
+    #
+    #  @param message [ dict | None | in  ] - Message.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def send(self, message):
+
+        with self._sendLock:
+            try:
+                _sendMessage(self.connection, message)
+            except socket.error:
+                pass
+
+    #
+    ## @brief Get status of the job.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Status.
+    def status(self):
+
+        return {'id'        : self.jobId,
+                'command'   : self.command,
+                'arguments' : self.arguments,
+                'cwd'       : self.cwd,
+                'state'     : self.state,
+                'elapsed'   : time.time() - (self.startTime or self.submitTime)}
+
+#
+## @brief Run a job in a forked process, never returns.
+#
+#  @param job      [ mMecoRelease.daemonLib.Job | None | in  ] - Job.
+#  @param inputFd  [ int                        | None | in  ] - File descriptor of standard input.
+#  @param outputFd [ int                        | None | in  ] - File descriptor of standard output and error.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def _runJobProcess(job, inputFd, outputFd):
+
+    code = 1
+
+    try:
+        os.dup2(inputFd, 0)
+        os.dup2(outputFd, 1)
+        os.dup2(outputFd, 2)
+
+        # Connections of other clients and the listening socket must not be kept open by the job
+        try:
+            maxFd = min(os.sysconf('SC_OPEN_MAX'), 65536)
+        except (AttributeError, ValueError, OSError):
+            maxFd = 1024
+        os.closerange(3, maxFd)
+
+        sys.stdin  = os.fdopen(0, 'r')
+        sys.stdout = os.fdopen(1, 'w', 1)
+        sys.stderr = os.fdopen(2, 'w', 1)
+
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT,  signal.SIG_DFL)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+
+        os.environ.clear()
+        os.environ.update(job.environment)
+        os.environ[NO_DAEMON_ENV] = '1'
+        os.chdir(job.cwd)
+
+        sys.argv = ['mmecorelease-{}'.format(job.command)] + job.arguments
+
+        import mMecoRelease.cliLib
+        getattr(mMecoRelease.cliLib, JOB_COMMANDS[job.command])()
+
+        code = 0
+
+    except SystemExit as error:
+        code = error.code if isinstance(error.code, int) else (0 if error.code is None else 1)
+
+    except BaseException:
+        traceback.print_exc()
+
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+#
+## @brief Get exit code of a process from its wait status.
+#
+#  @param status [ int | None | in  ] - Status as returned by os.waitpid.
+#
+#  @exception N/A
+#
+#  @return int - Exit code, 128 plus the signal number if the process has been killed.
+def _getExitCode(status):
+
+    if os.WIFEXITED(status):
+        return os.WEXITSTATUS(status)
+
+    return 128 + (os.WTERMSIG(status) if os.WIFSIGNALED(status) else 0)
+
+#
+## @brief Run the launcher process, never returns.
+#
+#  Launcher is single threaded, it forks a job process for each job the daemon sends along with the
+#  descriptors of its standard input and output, and reports its process identifier and exit code.
+#  Launcher exits once the daemon closes the connection.
+#
+#  @param channel [ socket.socket | None | in  ] - Connection to the daemon.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def _runLauncher(channel):
+
+    code = 0
+
+    try:
+        import fcntl
+
+        # Interrupt of the daemon is handled by the daemon, running jobs are reported until it closes the connection
+        signal.signal(signal.SIGINT,  signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+        # Exited jobs wake select up through a pipe
+        wakeRead, wakeWrite = os.pipe()
+        fcntl.fcntl(wakeWrite, fcntl.F_SETFL, fcntl.fcntl(wakeWrite, fcntl.F_GETFL) | os.O_NONBLOCK)
+
+        def wakeUp(signalNumber, frame):
+            try:
+                os.write(wakeWrite, b'\0')
+            except OSError:
+                pass
+
+        signal.signal(signal.SIGCHLD, wakeUp)
+        signal.siginterrupt(signal.SIGCHLD, False)
+
+        jobIds = {}
+
+        while True:
+
+            try:
+                readable = select.select([channel, wakeRead], [], [])[0]
+            except (select.error, OSError) as error:
+                if error.args[0] == errno.EINTR:
+                    continue
+                raise
+
+            if wakeRead in readable:
+                os.read(wakeRead, OUTPUT_CHUNK_SIZE)
+
+            while jobIds:
+
+                try:
+                    pid, status = os.waitpid(-1, os.WNOHANG)
+                except OSError as error:
+                    if error.errno == errno.EINTR:
+                        continue
+                    break
+
+                if not pid:
+                    break
+
+                if pid in jobIds:
+                    _sendFrame(channel, {'type':'exit', 'id':jobIds.pop(pid), 'code':_getExitCode(status)})
+
+            if not channel in readable:
+                continue
+
+            message = _readFrame(channel)
+            if message is None:
+                break
+
+            inputFd, outputFd = _receiveFds(channel, 2)
+
+            job = Job(message['id'], None, message['command'], message['arguments'], message['cwd'], message['environment'])
+
+            pid = os.fork()
+            if pid == 0:
+                signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                _runJobProcess(job, inputFd, outputFd)
+
+            os.close(inputFd)
+            os.close(outputFd)
+
+            jobIds[pid] = job.jobId
+
+            _sendFrame(channel, {'type':'started', 'id':job.jobId, 'pid':pid})
+
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+
+    finally:
+        os._exit(code)
+
+#
+## @brief [ CLASS ] - Class that starts job processes through a single threaded launcher process.
+#
+#  Forking a process that runs threads copies locks held by the other threads, such as locks of
+#  messages sent to clients or of the memory allocator, into the child where they are never released.
+#  Launcher must be created before the daemon starts any thread, job processes are forked by it.
+class JobLauncher(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor, fork the launcher process.
+    #
+    #  @exception OSError - If the launcher process can not be forked.
+    #
+    #  @return None - None.
+    def __init__(self):
+
+        channel, launcherChannel = socket.socketpair(socket.AF_UNIX, socket.SOCK_STREAM)
+
+        pid = os.fork()
+        if pid == 0:
+            channel.close()
+            _runLauncher(launcherChannel)
+
+        launcherChannel.close()
+
+        ## [ socket.socket ] - Connection to the launcher.
+        self._channel = channel
+
+        ## [ int ] - Process identifier of the launcher.
+        self._pid     = pid
+
+        ## [ dict ] - Jobs that haven't exited yet, keys are job identifiers.
+        self._jobs    = {}
+
+        ## [ threading.Lock ] - Lock that guards the jobs.
+        self._lock    = threading.Lock()
+
+        readerThread        = threading.Thread(target=self._readResponses)
+        readerThread.daemon = True
+        readerThread.start()
+
+    #
+    ## @brief Read messages of the launcher until it exits.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def _readResponses(self):
+
+        while True:
+
+            message = _readFrame(self._channel)
+            if message is None:
+                break
+
+            with self._lock:
+                job = self._jobs.get(message.get('id'))
+                if job is None:
+                    continue
+
+                if message.get('type') == 'started':
+                    job.pid = message.get('pid')
+                    job.launched.set()
+
+                elif message.get('type') == 'exit':
+                    del self._jobs[job.jobId]
+                    job.exitCode = message.get('code')
+                    job.exited.set()
+
+        # Jobs the launcher hasn't reported are considered failed
+        with self._lock:
+            for job in self._jobs.values():
+                job.exitCode = 1
+                job.launched.set()
+                job.exited.set()
+
+            self._jobs = {}
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Start a job process and wait until it is started.
+    #
+    #  Exit code of the job is set and its exited event is set once the job process exits.
+    #
+    #  @param job      [ mMecoRelease.daemonLib.Job | None | in  ] - Job.
+    #  @param inputFd  [ int                        | None | in  ] - File descriptor of standard input of the job process.
+    #  @param outputFd [ int                        | None | in  ] - File descriptor of standard output and error of the job process.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Whether the job process has been started.
+    def launch(self, job, inputFd, outputFd):
+
+        with self._lock:
+            self._jobs[job.jobId] = job
+
+        try:
+            _sendFrame(self._channel, {'id'          : job.jobId,
+                                       'command'     : job.command,
+                                       'arguments'   : job.arguments,
+                                       'cwd'         : job.cwd,
+                                       'environment' : job.environment})
+            _sendFds(self._channel, [inputFd, outputFd])
+        except socket.error:
+            with self._lock:
+                self._jobs.pop(job.jobId, None)
+            job.exitCode = 1
+            job.launched.set()
+            job.exited.set()
+            return False
+
+        job.launched.wait()
+
+        return job.pid is not None
+
+    #
+    ## @brief Stop the launcher, running job processes are not waited for.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def close(self):
+
+        try:
+            self._channel.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            pass
+        self._channel.close()
+
+        while True:
+            try:
+                os.waitpid(self._pid, 0)
+                break
+            except OSError as error:
+                if error.errno != errno.EINTR:
+                    break
+
+#
+## @brief [ CLASS ] - Class that queues and runs jobs submitted over a Unix domain socket.
+class ReleaseDaemon(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param socketPath [ str | None                | in  ] - Path of the socket, default one is used if None.
+    #  @param jobs       [ int | DEFAULT_DAEMON_JOBS | in  ] - Number of jobs run at the same time.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self, socketPath=None, jobs=DEFAULT_DAEMON_JOBS):
+
+        ## [ str ] - Path of the socket.
+        self._socketPath = socketPath or getSocketPath()
+
+        ## [ int ] - Number of jobs run at the same time.
+        self._jobs       = max(1, jobs)
+
+        ## [ list of mMecoRelease.daemonLib.Job ] - Queued and running jobs in submit order.
+        self._queue      = []
+
+        ## [ int ] - Identifier of the last submitted job.
+        self._lastJobId  = 0
+
+        ## [ threading.Condition ] - Condition that guards the queue.
+        self._condition  = threading.Condition()
+
+        ## [ socket.socket ] - Listening socket.
+        self._socket     = None
+
+        ## [ mMecoRelease.daemonLib.JobLauncher ] - Launcher job processes are forked by, created once the framework is imported.
+        self._launcher   = None
+
+        ## [ bool ] - Whether the daemon is shutting down.
+        self._stopping   = False
+
+    #
+    ## @brief Import the framework and the processes and dependencies of the release container.
+    #
+    #  Modules are imported once by the daemon and inherited by every job process.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def _preload(self):
+
+        import importlib
+
+        import mMecoRelease.releaseCmd
+        import mMecoRelease.releaseProList
+        import mMecoRelease.processes.releaseDepList
+
+        for moduleName in (mMecoRelease.releaseProList.PROCESS_LIST +
+                           mMecoRelease.processes.releaseDepList.PRE_DEPENDENCY_LIST +
+                           mMecoRelease.processes.releaseDepList.POST_DEPENDENCY_LIST):
+            importlib.import_module(moduleName)
+
+    #
+    ## @brief Whether the peer of a connection is the user running the daemon.
+    #
+    #  Jobs run as the user running the daemon, so jobs of other users are refused.
+    #
+    #  @param connection [ socket.socket | None | in  ] - Connection.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def _isPeerAllowed(self, connection):
+
+        peerCredentials = getattr(socket, 'SO_PEERCRED', None)
+        if peerCredentials is None:
+            # Socket file is only accessible by the user running the daemon
+            return True
+
+        try:
+            pid, uid, gid = struct.unpack('3i', connection.getsockopt(socket.SOL_SOCKET, peerCredentials, struct.calcsize('3i')))
+        except (socket.error, struct.error):
+            return False
+
+        return uid == os.getuid()
+
+    #
+    ## @brief Start jobs that can run, caller must hold the condition.
+    #
+    #  A job runs once fewer than the maximum number of jobs are running and no job submitted before it
+    #  releases to an overlapping path, so conflicting releases run in submit order.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def _schedule(self):
+
+        runningCount = len([job for job in self._queue if job.state == 'running'])
+
+        for index, job in enumerate(self._queue):
+
+            if runningCount >= self._jobs:
+                break
+
+            if job.state != 'queued':
+                continue
+
+            if any([_isOverlapping(job.resource, previousJob.resource) for previousJob in self._queue[:index]]):
+                continue
+
+            self._startJob(job)
+            runningCount += 1
+
+        for index, job in enumerate(self._queue):
+            if job.state == 'queued' and job.position != index:
+                job.position = index
+                job.send({'type':'status', 'message':'Release daemon: job {} is queued behind {} jobs.'.format(job.jobId, index)})
+
+    #
+    ## @brief Start a job process, caller must hold the condition.
+    #
+    #  @param job [ mMecoRelease.daemonLib.Job | None | in  ] - Job.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def _startJob(self, job):
+
+        inputRead, inputWrite   = os.pipe()
+        outputRead, outputWrite = os.pipe()
+
+        try:
+            if not self._launcher.launch(job, inputRead, outputWrite):
+                job.send({'type':'status', 'message':'Release daemon could not start job {}.'.format(job.jobId)})
+        finally:
+            # Output reaches end of file once the job process exits, or right away if it hasn't started
+            os.close(inputRead)
+            os.close(outputWrite)
+
+        job.inputFd   = inputWrite
+        job.state     = 'running'
+        job.startTime = time.time()
+
+        for data in job.pendingInput:
+            self._writeInput(job, data)
+        job.pendingInput = []
+
+        if job.inputClosed:
+            self._closeInput(job)
+
+        outputThread        = threading.Thread(target=self._streamOutput, args=(job, outputRead))
+        outputThread.daemon = True
+        outputThread.start()
+
+    #
+    ## @brief Write input to a running job.
+    #
+    #  @param job  [ mMecoRelease.daemonLib.Job | None | in  ] - Job.
+    #  @param data [ str                        | None | in  ] - Input.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def _writeInput(self, job, data):
+
+        if job.inputFd is None:
+            return
+
+        try:
+            os.write(job.inputFd, data.encode('utf-8'))
+        except OSError:
+            self._closeInput(job)
+
+    #
+    ## @brief Close standard input of a running job.
+    #
+    #  @param job [ mMecoRelease.daemonLib.Job | None | in  ] - Job.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def _closeInput(self, job):
+
+        if job.inputFd is None:
+            return
+
+        try:
+            os.close(job.inputFd)
+        except OSError:
+            pass
+
+        job.inputFd = None
+
+    #
+    ## @brief Stream output of a job process to its client until the process exits.
+    #
+    #  @param job      [ mMecoRelease.daemonLib.Job | None | in  ] - Job.
+    #  @param outputFd [ int                        | None | in  ] - File descriptor output is read from.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def _streamOutput(self, job, outputFd):
+
+        decoder = codecs.getincrementaldecoder('utf-8')('replace')
+
+        while True:
+
+            try:
+                data = os.read(outputFd, OUTPUT_CHUNK_SIZE)
+            except OSError as error:
+                if error.errno == errno.EINTR:
+                    continue
+                data = b''
+
+            text = decoder.decode(data, final=not data)
+            if text:
+                job.send({'type':'output', 'data':text})
+
+            if not data:
+                break
+
+        os.close(outputFd)
+
+        job.exited.wait()
+
+        job.send({'type':'exit', 'code':job.exitCode})
+
+        # Shutdown wakes the connection handler up, which is blocked reading from the client
+        try:
+            job.connection.shutdown(socket.SHUT_RDWR)
+        except socket.error:
+            pass
+        job.connection.close()
+
+        with self._condition:
+            self._closeInput(job)
+            job.state = 'done'
+            self._queue.remove(job)
+            self._schedule()
+            self._condition.notify_all()
+
+    #
+    ## @brief Handle a connection.
+    #
+    #  @param connection [ socket.socket | None | in  ] - Connection.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def _handleConnection(self, connection):
+
+        if not self._isPeerAllowed(connection):
+            try:
+                _sendMessage(connection, {'type':'status', 'message':'Release daemon only accepts jobs of its own user.'})
+                _sendMessage(connection, {'type':'exit', 'code':1})
+            except socket.error:
+                pass
+            connection.close()
+            return
+
+        messages = _readMessages(connection)
+        job      = None
+
+        for message in messages:
+
+            messageType = message.get('type')
+
+            if job is None:
+
+                if messageType == 'status':
+                    with self._condition:
+                        response = {'type':'status', 'pid':os.getpid(), 'jobs':self._jobs, 'queue':[queuedJob.status() for queuedJob in self._queue]}
+                    _sendMessage(connection, response)
+                    break
+
+                if messageType == 'stop':
+                    _sendMessage(connection, {'type':'status', 'message':'Release daemon is stopping.'})
+                    self.stop()
+                    break
+
+                if messageType != 'job' or not message.get('command') in JOB_COMMANDS:
+                    _sendMessage(connection, {'type':'status', 'message':'Invalid request.'})
+                    _sendMessage(connection, {'type':'exit', 'code':2})
+                    break
+
+                with self._condition:
+                    self._lastJobId += 1
+                    job = Job(self._lastJobId,
+                              connection,
+                              message['command'],
+                              [str(argument) for argument in message.get('arguments', [])],
+                              message.get('cwd') or '/',
+                              dict([(str(key), str(value)) for key, value in message.get('environment', {}).items()]))
+                    self._queue.append(job)
+                    self._schedule()
+
+                continue
+
+            with self._condition:
+                if messageType == 'input':
+                    if job.state == 'queued':
+                        job.pendingInput.append(message.get('data', ''))
+                    else:
+                        self._writeInput(job, message.get('data', ''))
+
+                elif messageType == 'eof':
+                    job.inputClosed = True
+                    self._closeInput(job)
+
+        if job is None:
+            connection.close()
+            return
+
+        # Client has disconnected, queued job is dropped and running job is terminated
+        with self._condition:
+            if job.state == 'queued':
+                self._queue.remove(job)
+                connection.close()
+                self._schedule()
+            elif job.state == 'running' and job.pid:
+                try:
+                    os.kill(job.pid, signal.SIGTERM)
+                except OSError:
+                    pass
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Get path of the socket.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Path.
+    def socketPath(self):
+
+        return self._socketPath
+
+    #
+    ## @brief Serve jobs until stop method is called.
+    #
+    #  @exception RuntimeError - If another daemon is already running on the same socket.
+    #
+    #  @return None - None.
+    def serve(self):
+
+        existingConnection = connect(self._socketPath)
+        if existingConnection:
+            existingConnection.close()
+            raise RuntimeError('Release daemon is already running: {}'.format(self._socketPath))
+
+        if os.path.exists(self._socketPath):
+            os.remove(self._socketPath)
+
+        self._preload()
+
+        # Launcher is forked before any thread is started
+        self._launcher = JobLauncher()
+
+        try:
+            previousUmask = os.umask(0o077)
+            try:
+                self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self._socket.bind(self._socketPath)
+            finally:
+                os.umask(previousUmask)
+
+            self._socket.listen(64)
+            self._socket.settimeout(1.0)
+
+            while not self._stopping:
+
+                try:
+                    connection, address = self._socket.accept()
+                except socket.timeout:
+                    continue
+                except socket.error as error:
+                    if error.errno == errno.EINTR:
+                        continue
+                    raise
+
+                connection.settimeout(None)
+
+                handlerThread        = threading.Thread(target=self._handleConnection, args=(connection,))
+                handlerThread.daemon = True
+                handlerThread.start()
+
+            # Running jobs are finished before the daemon exits
+            with self._condition:
+                while [job for job in self._queue if job.state == 'running']:
+                    self._condition.wait(1.0)
+
+        finally:
+            if self._socket:
+                self._socket.close()
+                if os.path.exists(self._socketPath):
+                    os.remove(self._socketPath)
+
+            self._launcher.close()
+
+    #
+    ## @brief Stop accepting jobs, queued jobs are dropped and running jobs are finished.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def stop(self):
+
+        self._stopping = True
+
+        with self._condition:
+            for job in [queuedJob for queuedJob in self._queue if queuedJob.state == 'queued']:
+                job.send({'type':'status', 'message':'Release daemon has been stopped before job {} has started.'.format(job.jobId)})
+                job.send({'type':'exit', 'code':1})
+                self._queue.remove(job)
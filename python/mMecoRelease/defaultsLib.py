@@ -0,0 +1,32 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/defaultsLib.py @brief [ FILE   ] - Default values module.
+## @package mMecoRelease.defaultsLib    @brief [ MODULE ] - Default values module.
+#
+#  Default values shared by mMecoRelease.cliLib and the libraries. This module must not import
+#  anything, so it can be imported by the command line entry module without loading the framework.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ int ] - Default number of workers used to copy release files.
+DEFAULT_COPY_JOB_COUNT = 1
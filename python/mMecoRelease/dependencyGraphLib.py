@@ -0,0 +1,262 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/dependencyGraphLib.py @brief [ FILE   ] - Package dependency graph module.
+## @package mMecoRelease.dependencyGraphLib    @brief [ MODULE ] - Package dependency graph module.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORTS
+# ----------------------------------------------------------------------------------------------------
+import os
+import ast
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ str ] - Name of the package info module file.
+PACKAGE_INFO_FILE_NAME = 'packageInfoLib.py'
+
+## [ str ] - Name of the variable that lists dependent packages in package info module.
+DEPENDENT_PACKAGES_KEY = 'DEPENDENT_PACKAGES'
+
+## [ str ] - Name of the variable that lists e-mail addresses of the developers in package info module.
+DEVELOPERS_KEY         = 'DEVELOPERS'
+
+#
+## @brief Get a list declared in package info module of a package.
+#
+#  Module is parsed rather than imported, so nothing in it is executed.
+#
+#  @param packagePath [ str | None | in  ] - Root of the package.
+#  @param packageName [ str | None | in  ] - Name of the package.
+#  @param key         [ str | None | in  ] - Name of the variable, such as DEPENDENT_PACKAGES.
+#
+#  @exception ValueError - If the module can not be parsed or the variable is not a literal list of strings.
+#
+#  @return list of str - Values, empty if the module or the variable doesn't exist.
+def getPackageInfoList(packagePath, packageName, key):
+
+    infoFile = os.path.join(packagePath, 'python', packageName, PACKAGE_INFO_FILE_NAME)
+
+    try:
+        with open(infoFile, 'r') as infoFileObject:
+            tree = ast.parse(infoFileObject.read(), infoFile)
+    except (IOError, OSError):
+        return []
+    except SyntaxError as error:
+        raise ValueError('Package info module can not be parsed: {}: {}'.format(infoFile, error))
+
+    values = []
+
+    # Last assignment wins, as it would when the module is imported
+    for node in tree.body:
+
+        if not isinstance(node, ast.Assign):
+            continue
+
+        for target in node.targets:
+
+            if not isinstance(target, ast.Name) or target.id != key:
+                continue
+
+            # Values computed at import time can not be read without executing the module
+            try:
+                value = ast.literal_eval(node.value)
+            except (ValueError, TypeError, SyntaxError):
+                raise ValueError('{} in {} is not a literal list, line {}'.format(key, infoFile, node.lineno))
+
+            if not isinstance(value, (list, tuple, set)):
+                raise ValueError('{} in {} is not a list, line {}'.format(key, infoFile, node.lineno))
+
+            values = [str(item) for item in value]
+
+    return values
+
+#
+## @brief Get dependent packages declared in package info module of a package.
+#
+#  @param packagePath [ str | None | in  ] - Root of the package.
+#  @param packageName [ str | None | in  ] - Name of the package.
+#
+#  @exception ValueError - If dependent packages can not be read, see getPackageInfoList.
+#
+#  @return list of str - Names of the dependent packages, empty if none could be found.
+def getDependentPackages(packagePath, packageName):
+
+    return getPackageInfoList(packagePath, packageName, DEPENDENT_PACKAGES_KEY)
+
+#
+## @brief [ CLASS ] - Class to order packages by their dependencies.
+class DependencyGraph(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param dependencies [ dict | None | in  ] - Keys are package names, values are lists of dependent package names.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self, dependencies):
+
+        ## [ dict ] - Keys are package names, values are lists of dependent package names.
+        self._dependencies = dependencies
+
+    #
+    ## @brief Get dependencies of a package that are part of the graph.
+    #
+    #  @param name [ str | None | in  ] - Name of the package.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Names.
+    def _getInternalDependencies(self, name):
+
+        return sorted(set([dependency for dependency in self._dependencies[name]
+                           if dependency in self._dependencies and dependency != name]))
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Get dependencies that are neither part of the graph nor known otherwise.
+    #
+    #  @param knownNames [ set of str | None | in  ] - Names of packages known to exist outside the graph, such as released ones.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are package names, values are sorted lists of unknown dependency names.
+    def getUnknownDependencies(self, knownNames):
+
+        unknownDependencies = {}
+
+        for name, dependencies in self._dependencies.items():
+
+            unknown = sorted(set([dependency for dependency in dependencies
+                                  if not dependency in self._dependencies and not dependency in knownNames]))
+            if unknown:
+                unknownDependencies[name] = unknown
+
+        return unknownDependencies
+
+    #
+    ## @brief Get dependency cycles.
+    #
+    #  @exception N/A
+    #
+    #  @return list of list of str - Each cycle as a list of package names, first name is repeated at the end.
+    def getCycles(self):
+
+        cycles   = []
+        visited  = set()
+
+        for start in sorted(self._dependencies.keys()):
+
+            if start in visited:
+                continue
+
+            # Iterative depth first search, stack holds (name, iterator over its dependencies)
+            path    = [start]
+            onPath  = set([start])
+            stack   = [(start, iter(self._getInternalDependencies(start)))]
+            visited.add(start)
+
+            while stack:
+
+                name, dependencies = stack[-1]
+
+                dependency = next(dependencies, None)
+                if dependency is None:
+                    stack.pop()
+                    path.pop()
+                    onPath.discard(name)
+                    continue
+
+                if dependency in onPath:
+                    cycles.append(path[path.index(dependency):] + [dependency])
+                    continue
+
+                if dependency in visited:
+                    continue
+
+                visited.add(dependency)
+                onPath.add(dependency)
+                path.append(dependency)
+                stack.append((dependency, iter(self._getInternalDependencies(dependency))))
+
+        return cycles
+
+    #
+    ## @brief Get packages grouped in waves, each wave only depends on the previous ones.
+    #
+    #  Packages in the same wave don't depend on each other and can be released concurrently.
+    #
+    #  @exception ValueError - If the graph contains cycles.
+    #
+    #  @return list of list of str - Sorted package names of each wave.
+    def getWaves(self):
+
+        remaining = dict([(name, set(self._getInternalDependencies(name))) for name in self._dependencies])
+        waves     = []
+
+        while remaining:
+
+            wave = sorted([name for name, dependencies in remaining.items() if not dependencies])
+            if not wave:
+                raise ValueError('Dependency cycle between packages: {}'.format(', '.join(sorted(remaining.keys()))))
+
+            for name in wave:
+                del remaining[name]
+
+            for dependencies in remaining.values():
+                dependencies.difference_update(wave)
+
+            waves.append(wave)
+
+        return waves
+
+    #
+    ## @brief Get packages that depend on given package, directly or indirectly.
+    #
+    #  @param name [ str | None | in  ] - Name of the package.
+    #
+    #  @exception N/A
+    #
+    #  @return set of str - Names.
+    def getDependents(self, name):
+
+        dependents = set()
+        pending    = [name]
+
+        while pending:
+            current = pending.pop()
+            for candidate in self._dependencies:
+                if not candidate in dependents and current in self._getInternalDependencies(candidate):
+                    dependents.add(candidate)
+                    pending.append(candidate)
+
+        return dependents
@@ -0,0 +1,223 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/fingerprintLib.py @brief [ FILE   ] - Package fingerprint module.
+## @package mMecoRelease.fingerprintLib    @brief [ MODULE ] - Package fingerprint module.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORTS
+# ----------------------------------------------------------------------------------------------------
+import os
+import hashlib
+
+import mMecoSettings.envVariablesLib
+
+import mMecoRelease.cacheLib
+import mMecoRelease.scanLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ str ] - Name of the fingerprint cache file.
+FINGERPRINT_CACHE_FILE_NAME = 'fingerprints.json'
+
+## [ str ] - Cache kind of successfully checked packages.
+KIND_CHECK                  = 'check'
+
+## [ str ] - Cache kind of successfully released packages.
+KIND_RELEASE                = 'release'
+
+#
+## @brief Compute fingerprint of a package.
+#
+#  Fingerprint covers the package location and version, the project environment and path,
+#  size and modification time of every release file. Content of the files is not read.
+#
+#  @param packagePath    [ str         | None | in  ] - Root of the package.
+#  @param packageVersion [ str         | None | in  ] - Version of the package.
+#  @param entries        [ list        | None | in  ] - Tuples of relative path, size and modification time of each release file.
+#
+#  @exception N/A
+#
+#  @return str - Hex digest.
+def computeFingerprint(packagePath, packageVersion, entries):
+
+    _hash = hashlib.sha1()
+
+    for value in [os.path.normpath(os.path.abspath(packagePath)),
+                  packageVersion,
+                  os.environ.get(mMecoSettings.envVariablesLib.MECO_DEVELOPER_NAME, ''),
+                  os.environ.get(mMecoSettings.envVariablesLib.MECO_PROJECT_NAME, ''),
+                  os.environ.get(mMecoSettings.envVariablesLib.MECO_MASTER_PROJECT_NAME, '')]:
+        _hash.update('{}\n'.format(value).encode('utf-8'))
+
+    for relativePath, size, mtime in sorted(entries):
+        _hash.update('{}\0{}\0{!r}\n'.format(relativePath, size, mtime).encode('utf-8'))
+
+    return _hash.hexdigest()
+
+#
+## @brief Compute fingerprint of a package from its release files.
+#
+#  @param package [ mMecoPackage.packageLib.Package | None | in  ] - Package.
+#
+#  @exception N/A
+#
+#  @return str - Hex digest.
+def getPackageFingerprint(package):
+
+    _releaseFileList = mMecoRelease.scanLib.getReleaseFileList(package)
+    entries          = []
+
+    for relativePath in _releaseFileList.relativePaths():
+
+        fileStat = _releaseFileList.getFileStat(relativePath)
+        if not fileStat:
+            entries.append((relativePath, -1, 0.0))
+            continue
+
+        entries.append((relativePath, fileStat[0], fileStat[1]))
+
+    return computeFingerprint(package.path(), package.version(), entries)
+
+#
+## @brief Compute fingerprint of a package from its release plan.
+#
+#  Release plan holds size and modification time of the release files, so nothing is stated again.
+#
+#  @param packagePath   [ str                                  | None | in  ] - Root of the package.
+#  @param version       [ str                                  | None | in  ] - Version of the package.
+#  @param relativePaths [ list of str                          | None | in  ] - Relative paths of release files.
+#  @param releasePlan   [ mMecoRelease.manifestLib.ReleasePlan | None | in  ] - Release plan of the files.
+#
+#  @exception N/A
+#
+#  @return str - Hex digest.
+def getReleasePlanFingerprint(packagePath, version, relativePaths, releasePlan):
+
+    entries = []
+
+    for relativePath in relativePaths:
+        entry = releasePlan.getEntry(relativePath)
+        if not entry:
+            entries.append((relativePath, -1, 0.0))
+            continue
+
+        entries.append((relativePath, entry['size'], entry['mtime']))
+
+    return computeFingerprint(packagePath, version, entries)
+
+#
+## @brief [ CLASS ] - Class that keeps fingerprints of packages which have been successfully checked or released.
+class FingerprintCache(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param path [ str | None | in  ] - Path of the cache file, default one in local cache directory is used if None.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self, path=None):
+
+        ## [ str ] - Path of the cache file.
+        self._path    = path if path else mMecoRelease.cacheLib.getCacheFile(FINGERPRINT_CACHE_FILE_NAME)
+
+        ## [ dict ] - Cached fingerprints, keys are kinds, values are dict instances of package paths and fingerprints.
+        self._content = mMecoRelease.cacheLib.readJson(self._path, {})
+
+        ## [ dict ] - Fingerprints set since the cache has been loaded, structured as the content.
+        self._updates = {}
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Whether given fingerprint matches the cached one.
+    #
+    #  @param kinds       [ list of str | None | in  ] - Kinds to look up, such as KIND_CHECK and KIND_RELEASE.
+    #  @param packagePath [ str         | None | in  ] - Root of the package.
+    #  @param fingerprint [ str         | None | in  ] - Fingerprint.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def matches(self, kinds, packagePath, fingerprint):
+
+        packagePath = os.path.normpath(os.path.abspath(packagePath))
+
+        for kind in kinds:
+            if self._content.get(kind, {}).get(packagePath) == fingerprint:
+                return True
+
+        return False
+
+    #
+    ## @brief Set fingerprint of a package.
+    #
+    #  @param kind        [ str | None | in  ] - Kind, such as KIND_CHECK and KIND_RELEASE.
+    #  @param packagePath [ str | None | in  ] - Root of the package.
+    #  @param fingerprint [ str | None | in  ] - Fingerprint.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def set(self, kind, packagePath, fingerprint):
+
+        packagePath = os.path.normpath(os.path.abspath(packagePath))
+
+        self._content.setdefault(kind, {})[packagePath] = fingerprint
+        self._updates.setdefault(kind, {})[packagePath] = fingerprint
+
+    #
+    ## @brief Save the cache.
+    #
+    #  Cache file is read again and updates are merged into it, so concurrent commands don't lose each other's updates.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def save(self):
+
+        if not self._updates:
+            return True
+
+        content = mMecoRelease.cacheLib.readJson(self._path, {})
+
+        for kind, fingerprints in self._updates.items():
+            content.setdefault(kind, {}).update(fingerprints)
+
+        try:
+            mMecoRelease.cacheLib.writeJson(self._path, content)
+        except (IOError, OSError):
+            return False
+
+        self._content = content
+        self._updates = {}
+
+        return True
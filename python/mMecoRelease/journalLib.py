@@ -0,0 +1,248 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/journalLib.py @brief [ FILE   ] - Copy journal module.
+## @package mMecoRelease.journalLib    @brief [ MODULE ] - Copy journal module.
+#
+#  Journal is an append only file in the staging directory of a release. A JSON line is appended for
+#  each file once it has been copied, so an interrupted release can be resumed by copying only the
+#  files that aren't in the journal. A line cut short by the interruption ends the journal.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORTS
+# ----------------------------------------------------------------------------------------------------
+import os
+import json
+
+import mFileSystem.directoryLib
+
+import mMecoRelease.cacheLib
+import mMecoRelease.copyLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ str ] - Name of the journal file in staging directory, it's removed before the release is published.
+JOURNAL_FILE_NAME = '.mecoReleaseJournal'
+
+## [ int ] - Format version of the journal file.
+JOURNAL_FORMAT    = 1
+
+#
+## @brief Get path of the journal file of given staging directory.
+#
+#  @param stagingPath [ str | None | in  ] - Path of a staging directory.
+#
+#  @exception N/A
+#
+#  @return str - Path.
+def getJournalFile(stagingPath):
+
+    return mFileSystem.directoryLib.Directory.join(stagingPath, JOURNAL_FILE_NAME)
+
+#
+## @brief Encode a journal line.
+#
+#  @param content [ dict | None | in  ] - Content.
+#
+#  @exception N/A
+#
+#  @return bytes - Line.
+def _encodeLine(content):
+
+    return '{}\n'.format(json.dumps(content, sort_keys=True)).encode('utf-8')
+
+#
+## @brief [ CLASS ] - Class that appends copied files to a journal.
+class CopyJournal(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  Journal is written from scratch with given entries, so a line cut short by an interrupted
+    #  release is never followed by new lines.
+    #
+    #  @param path           [ str  | None | in  ] - Path of the journal file.
+    #  @param packageName    [ str  | None | in  ] - Name of the package.
+    #  @param packageVersion [ str  | None | in  ] - Version of the package.
+    #  @param entries        [ dict | None | in  ] - Entries of the files already copied, keys are relative paths, values are dict instances with size, mtime and hash keys.
+    #
+    #  @exception OSError - If the journal can not be written.
+    #
+    #  @return None - None.
+    def __init__(self, path, packageName, packageVersion, entries=None):
+
+        ## [ str ] - Path of the journal file.
+        self._path       = path
+
+        ## [ int ] - Number of files in the journal.
+        self._entryCount = 0
+
+        ## [ int ] - File descriptor.
+        self._fd         = None
+
+        temporaryPath = '{}.tmp'.format(path)
+
+        fd = os.open(temporaryPath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            lines = [_encodeLine({'format'         : JOURNAL_FORMAT,
+                                  'packageName'    : packageName,
+                                  'packageVersion' : packageVersion,
+                                  'hashAlgorithm'  : mMecoRelease.copyLib.HASH_ALGORITHM})]
+
+            for relativePath in sorted(entries.keys() if entries else []):
+                lines.append(_encodeLine(dict(entries[relativePath], path=relativePath)))
+
+            self._write(fd, b''.join(lines))
+        finally:
+            os.close(fd)
+
+        mMecoRelease.cacheLib.replaceFile(temporaryPath, path)
+
+        self._entryCount = len(entries) if entries else 0
+        self._fd         = os.open(path, os.O_WRONLY | os.O_APPEND)
+
+    #
+    ## @brief Write all of given content.
+    #
+    #  @param fd      [ int   | None | in  ] - File descriptor.
+    #  @param content [ bytes | None | in  ] - Content.
+    #
+    #  @exception OSError - If the content can not be written.
+    #
+    #  @return None - None.
+    @staticmethod
+    def _write(fd, content):
+
+        while content:
+            content = content[os.write(fd, content):]
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Get path of the journal file.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Path.
+    def path(self):
+
+        return self._path
+
+    #
+    ## @brief Get number of files in the journal.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Value.
+    def entryCount(self):
+
+        return self._entryCount
+
+    #
+    ## @brief Append a copied file.
+    #
+    #  Line is written with a single unbuffered write, so it's in the journal even if the process is killed.
+    #  Neither the line nor the file is synced, files are hashed again when the release is resumed.
+    #
+    #  @param relativePath [ str   | None | in  ] - Relative path of the file.
+    #  @param size         [ int   | None | in  ] - Size in bytes.
+    #  @param mtime        [ float | None | in  ] - Modification time of the source file.
+    #  @param fileHash     [ str   | None | in  ] - Content hash.
+    #
+    #  @exception OSError - If the line can not be written.
+    #
+    #  @return None - None.
+    def append(self, relativePath, size, mtime, fileHash):
+
+        self._write(self._fd, _encodeLine({'path':relativePath, 'size':size, 'mtime':mtime, 'hash':fileHash}))
+        self._entryCount += 1
+
+    #
+    ## @brief Close the journal.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def close(self):
+
+        if self._fd is None:
+            return
+
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+
+        self._fd = None
+
+    #
+    ## @brief Read entries of a journal file.
+    #
+    #  Reading stops at the first line that can't be decoded, which is the one cut short by an interrupted release.
+    #
+    #  @param path           [ str | None | in  ] - Path of the journal file.
+    #  @param packageName    [ str | None | in  ] - Name of the package the journal must belong to.
+    #  @param packageVersion [ str | None | in  ] - Version of the package the journal must belong to.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are relative paths, values are dict instances with size, mtime and hash keys, empty if the
+    #                 journal can't be read or belongs to another package, version or hash algorithm.
+    @staticmethod
+    def read(path, packageName, packageVersion):
+
+        try:
+            with open(path, 'rb') as journalFile:
+                lines = journalFile.read().split(b'\n')
+        except (IOError, OSError):
+            return {}
+
+        try:
+            header = json.loads(lines[0].decode('utf-8'))
+        except ValueError:
+            return {}
+
+        if not isinstance(header, dict) or header != {'format'         : JOURNAL_FORMAT,
+                                                      'packageName'    : packageName,
+                                                      'packageVersion' : packageVersion,
+                                                      'hashAlgorithm'  : mMecoRelease.copyLib.HASH_ALGORITHM}:
+            return {}
+
+        entries = {}
+
+        # Last element is empty if the journal ends with a complete line, or the line cut short otherwise
+        for line in lines[1:-1]:
+
+            try:
+                entry = json.loads(line.decode('utf-8'))
+                entries[entry.pop('path')] = {'size':int(entry['size']), 'mtime':entry['mtime'], 'hash':entry['hash']}
+            except (ValueError, KeyError, TypeError, AttributeError):
+                break
+
+        return entries
@@ -0,0 +1,479 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/manifestLib.py @brief [ FILE   ] - Release manifest module.
+## @package mMecoRelease.manifestLib    @brief [ MODULE ] - Release manifest module.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORTS
+# ----------------------------------------------------------------------------------------------------
+import os
+import json
+import stat
+
+import mFileSystem.directoryLib
+
+import mMecoRelease.copyLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ str ] - Name of the manifest file written into each released version.
+MANIFEST_FILE_NAME = '.mecoReleaseManifest.json'
+
+## [ int ] - Format version of the manifest file.
+MANIFEST_FORMAT    = 1
+
+#
+## @brief Get path of the manifest file of given released version.
+#
+#  @param versionPath [ str | None | in  ] - Path of a released version.
+#
+#  @exception N/A
+#
+#  @return str - Path.
+def getManifestFile(versionPath):
+
+    return mFileSystem.directoryLib.Directory.join(versionPath, MANIFEST_FILE_NAME)
+
+#
+## @brief Get human readable representation of given size.
+#
+#  @param size [ int | None | in  ] - Size in bytes.
+#
+#  @exception N/A
+#
+#  @return str - Value.
+def formatSize(size):
+
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if abs(size) < 1024.0:
+            return '{:.1f} {}'.format(size, unit) if unit != 'B' else '{} {}'.format(size, unit)
+        size /= 1024.0
+
+    return '{:.1f} TB'.format(size)
+
+#
+## @brief [ CLASS ] - Class that lists files of a released version with their size, mtime and content hash.
+class Manifest(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param packageName    [ str | ''                                  | in  ] - Name of the package.
+    #  @param packageVersion [ str | ''                                  | in  ] - Version of the package.
+    #  @param hashAlgorithm  [ str | mMecoRelease.copyLib.HASH_ALGORITHM | in  ] - Content hash algorithm.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self, packageName='', packageVersion='', hashAlgorithm=mMecoRelease.copyLib.HASH_ALGORITHM):
+
+        ## [ str ] - Name of the package.
+        self._packageName    = packageName
+
+        ## [ str ] - Version of the package.
+        self._packageVersion = packageVersion
+
+        ## [ str ] - Content hash algorithm.
+        self._hashAlgorithm  = hashAlgorithm
+
+        ## [ dict ] - Keys are relative paths, values are dict instances with size, mtime and hash keys.
+        self._files          = {}
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Get name of the package.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Value.
+    def packageName(self):
+
+        return self._packageName
+
+    #
+    ## @brief Get version of the package.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Value.
+    def packageVersion(self):
+
+        return self._packageVersion
+
+    #
+    ## @brief Get content hash algorithm.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Value.
+    def hashAlgorithm(self):
+
+        return self._hashAlgorithm
+
+    #
+    ## @brief Get relative paths of the files, sorted.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Relative paths.
+    def files(self):
+
+        return sorted(self._files.keys())
+
+    #
+    ## @brief Get entry of a file.
+    #
+    #  @param relativePath [ str | None | in  ] - Relative path of the file.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Entry with size, mtime and hash keys.
+    #  @return None - If the file is not listed.
+    def getFile(self, relativePath):
+
+        return self._files.get(relativePath)
+
+    #
+    ## @brief Set entry of a file.
+    #
+    #  @param relativePath [ str   | None | in  ] - Relative path of the file.
+    #  @param size         [ int   | None | in  ] - Size in bytes.
+    #  @param mtime        [ float | None | in  ] - Modification time of the source file.
+    #  @param fileHash     [ str   | None | in  ] - Content hash.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def setFile(self, relativePath, size, mtime, fileHash):
+
+        self._files[relativePath] = {'size':size, 'mtime':mtime, 'hash':fileHash}
+
+    #
+    ## @brief Get total size of the files in bytes.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Value.
+    def size(self):
+
+        return sum([entry['size'] for entry in self._files.values()])
+
+    #
+    ## @brief Verify files of a released version against the manifest.
+    #
+    #  Size of each file is checked, content hash is checked as well if fullCheck is True.
+    #
+    #  @param versionPath [ str  | None | in  ] - Path of the released version.
+    #  @param fullCheck   [ bool | True | in  ] - Whether to compare content hashes.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Relative paths of missing or mismatching files.
+    def verify(self, versionPath, fullCheck=True):
+
+        canCompareHash = self._hashAlgorithm == mMecoRelease.copyLib.HASH_ALGORITHM
+        mismatches     = []
+
+        for relativePath in self.files():
+
+            entry        = self._files[relativePath]
+            absolutePath = mFileSystem.directoryLib.Directory.join(versionPath, relativePath)
+
+            try:
+                if os.path.getsize(absolutePath) != entry['size']:
+                    mismatches.append(relativePath)
+
+                elif fullCheck and canCompareHash and mMecoRelease.copyLib.hashFile(absolutePath) != entry['hash']:
+                    mismatches.append(relativePath)
+
+            except (IOError, OSError):
+                mismatches.append(relativePath)
+
+        return mismatches
+
+    #
+    ## @brief Write the manifest to given file as read only.
+    #
+    #  File is written under a temporary name first and renamed, so readers never see a partial manifest.
+    #
+    #  @param path [ str | None | in  ] - Path of the manifest file.
+    #
+    #  @exception IOError - If the file can not be written.
+    #
+    #  @return None - None.
+    def write(self, path):
+
+        content = {'format'         : MANIFEST_FORMAT,
+                   'packageName'    : self._packageName,
+                   'packageVersion' : self._packageVersion,
+                   'hashAlgorithm'  : self._hashAlgorithm,
+                   'files'          : self._files}
+
+        temporaryPath = '{}.tmp'.format(path)
+
+        with open(temporaryPath, 'w') as manifestFile:
+            json.dump(content, manifestFile, indent=1, sort_keys=True)
+
+        os.chmod(temporaryPath, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+
+        if os.path.exists(path):
+            os.chmod(path, stat.S_IRUSR | stat.S_IWUSR)
+            os.remove(path)
+
+        os.rename(temporaryPath, path)
+
+    #
+    ## @brief Read a manifest file.
+    #
+    #  @param path [ str | None | in  ] - Path of the manifest file.
+    #
+    #  @exception N/A
+    #
+    #  @return mMecoRelease.manifestLib.Manifest - Manifest.
+    #  @return None                              - If the file doesn't exist or can not be read.
+    @staticmethod
+    def read(path):
+
+        try:
+            with open(path, 'r') as manifestFile:
+                content = json.load(manifestFile)
+        except (IOError, OSError, ValueError):
+            return None
+
+        if content.get('format') != MANIFEST_FORMAT:
+            return None
+
+        _manifest        = Manifest(content.get('packageName', ''),
+                                    content.get('packageVersion', ''),
+                                    content.get('hashAlgorithm', ''))
+        _manifest._files = content.get('files', {})
+
+        return _manifest
+
+#
+## @brief [ CLASS ] - Class that classifies release files against the manifest of the previous release.
+#
+#  Files whose size and mtime match the manifest are unchanged. Files whose size matches
+#  but mtime doesn't are hashed and compared, so touched but identical files are unchanged too.
+class ReleasePlan(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param packageRoot   [ str                               | None | in  ] - Root of the package.
+    #  @param relativePaths [ list of str                       | None | in  ] - Relative paths of release files.
+    #  @param manifest      [ mMecoRelease.manifestLib.Manifest | None | in  ] - Manifest of the previous release.
+    #  @param fileStats     [ dict                              | None | in  ] - Size and modification time of files already stated, keys are relative paths.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self, packageRoot, relativePaths, manifest=None, fileStats=None):
+
+        ## [ mMecoRelease.manifestLib.Manifest ] - Manifest of the previous release.
+        self._manifest       = manifest
+
+        ## [ list of str ] - New files.
+        self._newFiles       = []
+
+        ## [ list of str ] - Changed files.
+        self._changedFiles   = []
+
+        ## [ list of str ] - Unchanged files.
+        self._unchangedFiles = []
+
+        ## [ list of str ] - Files listed in the manifest that no longer exist.
+        self._deletedFiles   = []
+
+        ## [ dict ] - Keys are relative paths, values are dict instances with size, mtime and hash keys.
+        self._entries        = {}
+
+        self._classify(packageRoot, relativePaths, fileStats or {})
+
+    #
+    ## @brief Classify given files.
+    #
+    #  @param packageRoot   [ str         | None | in  ] - Root of the package.
+    #  @param relativePaths [ list of str | None | in  ] - Relative paths of release files.
+    #  @param fileStats     [ dict        | None | in  ] - Size and modification time of files already stated, keys are relative paths.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def _classify(self, packageRoot, relativePaths, fileStats):
+
+        canCompareHash = self._manifest and self._manifest.hashAlgorithm() == mMecoRelease.copyLib.HASH_ALGORITHM
+
+        for relativePath in relativePaths:
+
+            absolutePath = mFileSystem.directoryLib.Directory.join(packageRoot, relativePath)
+
+            if relativePath in fileStats:
+                size, mtime = fileStats[relativePath]
+            else:
+                try:
+                    fileStat = os.stat(absolutePath)
+                except OSError:
+                    self._newFiles.append(relativePath)
+                    continue
+
+                size, mtime = fileStat.st_size, fileStat.st_mtime
+
+            entry = {'size':size, 'mtime':mtime, 'hash':None}
+            self._entries[relativePath] = entry
+
+            previousEntry = self._manifest.getFile(relativePath) if self._manifest else None
+
+            if not previousEntry:
+                self._newFiles.append(relativePath)
+
+            elif previousEntry['size'] != entry['size']:
+                self._changedFiles.append(relativePath)
+
+            elif not canCompareHash or not previousEntry['hash']:
+                self._changedFiles.append(relativePath)
+
+            elif previousEntry['mtime'] == entry['mtime'] or mMecoRelease.copyLib.hashFile(absolutePath) == previousEntry['hash']:
+                entry['hash'] = previousEntry['hash']
+                self._unchangedFiles.append(relativePath)
+
+            else:
+                self._changedFiles.append(relativePath)
+
+        if self._manifest:
+            currentFiles       = set(relativePaths)
+            self._deletedFiles = [relativePath for relativePath in self._manifest.files() if not relativePath in currentFiles]
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Get manifest of the previous release.
+    #
+    #  @exception N/A
+    #
+    #  @return mMecoRelease.manifestLib.Manifest - Manifest.
+    #  @return None                              - If no manifest has been found.
+    def manifest(self):
+
+        return self._manifest
+
+    #
+    ## @brief Get new files.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Relative paths.
+    def newFiles(self):
+
+        return self._newFiles
+
+    #
+    ## @brief Get changed files.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Relative paths.
+    def changedFiles(self):
+
+        return self._changedFiles
+
+    #
+    ## @brief Get unchanged files.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Relative paths.
+    def unchangedFiles(self):
+
+        return self._unchangedFiles
+
+    #
+    ## @brief Get files listed in the previous manifest that no longer exist.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Relative paths.
+    def deletedFiles(self):
+
+        return self._deletedFiles
+
+    #
+    ## @brief Get files that have to be transferred, new and changed ones.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Relative paths.
+    def transferFiles(self):
+
+        return self._newFiles + self._changedFiles
+
+    #
+    ## @brief Get size of the files that have to be transferred in bytes.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Value.
+    def transferSize(self):
+
+        return sum([self._entries[relativePath]['size'] for relativePath in self.transferFiles() if relativePath in self._entries])
+
+    #
+    ## @brief Get entry of a release file.
+    #
+    #  @param relativePath [ str | None | in  ] - Relative path of the file.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Entry with size, mtime and hash keys, hash is None unless the file is unchanged.
+    #  @return None - If the file could not be found.
+    def getEntry(self, relativePath):
+
+        return self._entries.get(relativePath)
+
+    #
+    ## @brief Get summary of the plan.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Summary.
+    def summary(self):
+
+        return '{} new, {} changed, {} unchanged, {} deleted files, {} files ({}) to transfer'.format(len(self._newFiles),
+                                                                                                      len(self._changedFiles),
+                                                                                                      len(self._unchangedFiles),
+                                                                                                      len(self._deletedFiles),
+                                                                                                      len(self.transferFiles()),
+                                                                                                      formatSize(self.transferSize()))
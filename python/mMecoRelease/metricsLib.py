@@ -0,0 +1,441 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/metricsLib.py @brief [ FILE   ] - Release metrics module.
+## @package mMecoRelease.metricsLib    @brief [ MODULE ] - Release metrics module.
+#
+#  Metrics are written in Prometheus text format to be collected by node exporter textfile collector.
+#  Counters and histograms accumulate across runs, their values are kept in a JSON state file next to
+#  the metrics file, which the collector ignores since it only reads files ending with .prom.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORTS
+# ----------------------------------------------------------------------------------------------------
+import os
+import time
+import tempfile
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+import mMecoRelease.cacheLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ str ] - Environment variable that sets the metrics file if not given on command line.
+METRICS_PATH_ENV  = 'MECO_RELEASE_METRICS_PATH'
+
+## [ int ] - Format of the state file.
+METRICS_FORMAT    = 1
+
+## [ str ] - Prefix of the metric names.
+METRIC_PREFIX     = 'mmecorelease_'
+
+## [ tuple of float ] - Upper bounds of the duration histogram buckets in seconds.
+DURATION_BUCKETS  = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+
+## [ str ] - Failure stage of packages that can not be initialized.
+STAGE_INITIALIZE  = 'initialize'
+
+## [ str ] - Failure stage of packages whose release process has failed.
+STAGE_RELEASE     = 'release'
+
+## [ dict ] - Type and help text of the metrics, keys are metric names without prefix.
+METRICS           = {'releases_total'                : ('counter'  , 'Number of released packages.'),
+                     'release_failures_total'        : ('counter'  , 'Number of failed package runs by stage.'),
+                     'copied_files_total'            : ('counter'  , 'Number of files copied or hard linked to releases.'),
+                     'copied_bytes_total'            : ('counter'  , 'Number of bytes copied or hard linked to releases.'),
+                     'copy_method_files_total'       : ('counter'  , 'Number of files released by copy method, such as clone, copy_file_range or stream.'),
+                     'copy_duration_seconds'         : ('histogram', 'Duration of copying release files of a package.'),
+                     'dependency_duration_seconds'   : ('histogram', 'Duration of pre and post dependencies of a package.'),
+                     'last_run_timestamp_seconds'    : ('gauge'    , 'Time packages have been run last.')}
+
+#
+## @brief Get default metrics file.
+#
+#  @exception N/A
+#
+#  @return str  - Path.
+#  @return None - If METRICS_PATH_ENV environment variable is not set.
+def getDefaultMetricsPath():
+
+    return os.environ.get(METRICS_PATH_ENV) or None
+
+#
+## @brief Get state file of a metrics file.
+#
+#  @param path [ str | None | in  ] - Path of the metrics file.
+#
+#  @exception N/A
+#
+#  @return str - Path.
+def getStateFile(path):
+
+    return '{}.json'.format(path)
+
+#
+## @brief Get label value of a dependency name, display names are padded for alignment.
+#
+#  @param name [ str | None | in  ] - Name.
+#
+#  @exception N/A
+#
+#  @return str - Name with consecutive white spaces collapsed.
+def _getLabelName(name):
+
+    return ' '.join(name.split())
+
+#
+## @brief Get stage a package run has failed at.
+#
+#  @param result             [ bool          | None | in  ] - Whether the run has succeeded.
+#  @param failedDependencies [ list of tuple | None | in  ] - Names of failed dependencies and whether they are ignorable.
+#  @param containerError     [ str           | None | in  ] - Error that prevented the container from running.
+#
+#  @exception N/A
+#
+#  @return str  - Stage, name of the failed dependency, STAGE_INITIALIZE or STAGE_RELEASE.
+#  @return None - If the run has succeeded.
+def getFailureStage(result, failedDependencies, containerError):
+
+    if result:
+        return None
+
+    if containerError:
+        return STAGE_INITIALIZE
+
+    for name, isIgnorable in failedDependencies:
+        if not isIgnorable:
+            return _getLabelName(name)
+
+    return STAGE_RELEASE
+
+#
+## @brief Merge metrics of package runs into a metrics file, a warning is displayed if it can not be written.
+#
+#  @param path        [ str           | None | in  ] - Path of the metrics file.
+#  @param projectName [ str           | None | in  ] - Name of the project.
+#  @param packageRuns [ list of tuple | None | in  ] - Name of each package, whether it is external, whether it has been published,
+#                                                      whether the run has succeeded, failed dependencies, container error and trace events.
+#
+#  @exception N/A
+#
+#  @return bool - Whether the metrics file has been written.
+def savePackageRuns(path, projectName, packageRuns):
+
+    _metrics = ReleaseMetrics()
+
+    for packageName, isExternal, published, result, failedDependencies, containerError, traceEvents in packageRuns:
+        _metrics.addPackageRun(packageName,
+                               projectName,
+                               isExternal,
+                               published,
+                               getFailureStage(result, failedDependencies, containerError),
+                               traceEvents)
+
+    try:
+        _metrics.save(path)
+    except (IOError, OSError) as error:
+        # Imported only here, parsers import this module for its defaults
+        import mCore.displayLib
+        mCore.displayLib.Display.displayWarning('Metrics could not be written: {}'.format(error))
+        return False
+
+    return True
+
+#
+## @brief Escape a label value.
+#
+#  @param value [ str | None | in  ] - Value.
+#
+#  @exception N/A
+#
+#  @return str - Escaped value.
+def _escapeLabelValue(value):
+
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+#
+## @brief Get label string of a sample, such as package="mCore",project="x".
+#
+#  @param labels [ dict | None | in  ] - Labels.
+#
+#  @exception N/A
+#
+#  @return str - Label string.
+def _getLabelString(labels):
+
+    return ','.join(['{}="{}"'.format(name, _escapeLabelValue(labels[name])) for name in sorted(labels.keys())])
+
+#
+## @brief Format a sample value.
+#
+#  @param value [ float | None | in  ] - Value.
+#
+#  @exception N/A
+#
+#  @return str - Formatted value.
+def _formatValue(value):
+
+    if isinstance(value, float) and value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+
+    return repr(value)
+
+#
+## @brief [ CLASS ] - Class that collects metrics of package runs and merges them into a metrics file.
+class ReleaseMetrics(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self):
+
+        ## [ dict ] - Keys are metric names, values are dicts of label strings and values, or histograms.
+        self._samples = {}
+
+    #
+    ## @brief Add to a counter, or set a gauge.
+    #
+    #  @param name   [ str   | None | in  ] - Metric name without prefix.
+    #  @param labels [ dict  | None | in  ] - Labels.
+    #  @param value  [ float | None | in  ] - Value.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def _add(self, name, labels, value):
+
+        samples     = self._samples.setdefault(name, {})
+        labelString = _getLabelString(labels)
+
+        if METRICS[name][0] == 'gauge':
+            samples[labelString] = value
+        else:
+            samples[labelString] = samples.get(labelString, 0) + value
+
+    #
+    ## @brief Observe a value in a histogram.
+    #
+    #  @param name   [ str   | None | in  ] - Metric name without prefix.
+    #  @param labels [ dict  | None | in  ] - Labels.
+    #  @param value  [ float | None | in  ] - Value.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def _observe(self, name, labels, value):
+
+        samples   = self._samples.setdefault(name, {})
+        histogram = samples.setdefault(_getLabelString(labels), {'buckets':[0] * len(DURATION_BUCKETS), 'sum':0.0, 'count':0})
+
+        for index, bound in enumerate(DURATION_BUCKETS):
+            if value <= bound:
+                histogram['buckets'][index] += 1
+
+        histogram['sum']   += value
+        histogram['count'] += 1
+
+    #
+    ## @brief Merge samples into a state.
+    #
+    #  @param state [ dict | None | in  ] - State read from the state file.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Merged state.
+    def _merge(self, state):
+
+        if not isinstance(state, dict) or state.get('format') != METRICS_FORMAT or state.get('buckets') != list(DURATION_BUCKETS):
+            state = {'format':METRICS_FORMAT, 'buckets':list(DURATION_BUCKETS), 'samples':{}}
+
+        for name, samples in self._samples.items():
+
+            stateSamples = state['samples'].setdefault(name, {})
+
+            for labelString, value in samples.items():
+
+                if METRICS[name][0] == 'histogram':
+                    histogram = stateSamples.setdefault(labelString, {'buckets':[0] * len(DURATION_BUCKETS), 'sum':0.0, 'count':0})
+                    histogram['buckets'] = [a + b for a, b in zip(histogram['buckets'], value['buckets'])]
+                    histogram['sum']    += value['sum']
+                    histogram['count']  += value['count']
+
+                elif METRICS[name][0] == 'gauge':
+                    stateSamples[labelString] = value
+
+                else:
+                    stateSamples[labelString] = stateSamples.get(labelString, 0) + value
+
+        return state
+
+    #
+    ## @brief Render a state in Prometheus text format.
+    #
+    #  @param state [ dict | None | in  ] - State.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Text.
+    def _render(self, state):
+
+        lines = []
+
+        for name in sorted(state['samples'].keys()):
+
+            if not name in METRICS:
+                continue
+
+            metricType, helpText = METRICS[name]
+            fullName             = '{}{}'.format(METRIC_PREFIX, name)
+            samples              = state['samples'][name]
+
+            lines.append('# HELP {} {}'.format(fullName, helpText))
+            lines.append('# TYPE {} {}'.format(fullName, metricType))
+
+            for labelString in sorted(samples.keys()):
+
+                if metricType != 'histogram':
+                    lines.append('{}{{{}}} {}'.format(fullName, labelString, _formatValue(samples[labelString])))
+                    continue
+
+                histogram = samples[labelString]
+                separator = ',' if labelString else ''
+
+                for bound, count in zip(DURATION_BUCKETS, histogram['buckets']):
+                    lines.append('{}_bucket{{{}{}le="{}"}} {}'.format(fullName, labelString, separator, repr(bound), count))
+
+                lines.append('{}_bucket{{{}{}le="+Inf"}} {}'.format(fullName, labelString, separator, histogram['count']))
+                lines.append('{}_sum{{{}}} {}'.format(fullName, labelString, _formatValue(histogram['sum'])))
+                lines.append('{}_count{{{}}} {}'.format(fullName, labelString, histogram['count']))
+
+        return '{}\n'.format('\n'.join(lines)) if lines else ''
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Add metrics of a package run.
+    #
+    #  Durations are read from trace events of the run, see mMecoRelease.traceLib.
+    #
+    #  @param packageName  [ str          | None | in  ] - Name of the package.
+    #  @param projectName  [ str          | None | in  ] - Name of the project.
+    #  @param isExternal   [ bool         | None | in  ] - Whether the package is external.
+    #  @param published    [ bool         | None | in  ] - Whether the package has been released by the run.
+    #  @param failureStage [ str          | None | in  ] - Stage the run has failed at, None if it has succeeded.
+    #  @param traceEvents  [ list of dict | None | in  ] - Trace events of the run.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def addPackageRun(self, packageName, projectName, isExternal, published, failureStage, traceEvents):
+
+        labels = {'package':packageName, 'project':projectName or '', 'external':'true' if isExternal else 'false'}
+
+        for event in traceEvents:
+
+            if event['cat'] == 'dependency':
+                dependencyLabels               = dict(labels)
+                dependencyLabels['dependency'] = _getLabelName(event['name'])
+                self._observe('dependency_duration_seconds', dependencyLabels, event['dur'] / 1000000.0)
+
+            elif event['cat'] == 'process' and 'copiedSize' in event.get('args', {}):
+                self._observe('copy_duration_seconds', labels, event['dur'] / 1000000.0)
+                self._add('copied_files_total', labels, event['args']['fileCount'])
+                self._add('copied_bytes_total', labels, event['args']['copiedSize'])
+
+                for method, count in event['args'].get('methods', {}).items():
+                    methodLabels           = dict(labels)
+                    methodLabels['method'] = method
+                    self._add('copy_method_files_total', methodLabels, count)
+
+        if published:
+            self._add('releases_total', labels, 1)
+
+        if failureStage:
+            failureLabels          = dict(labels)
+            failureLabels['stage'] = failureStage
+            self._add('release_failures_total', failureLabels, 1)
+
+        self._add('last_run_timestamp_seconds', labels, time.time())
+
+    #
+    ## @brief Merge collected metrics into a metrics file.
+    #
+    #  State file is locked while it is updated, so concurrent runs don't lose each other's samples.
+    #  Both files are replaced by a rename, so the collector never reads a partial file.
+    #
+    #  @param path [ str | None | in  ] - Path of the metrics file, such as /var/lib/node_exporter/mmecorelease.prom.
+    #
+    #  @exception IOError - If the file can not be written.
+    #  @exception OSError - If the file can not be written.
+    #
+    #  @return None - None.
+    def save(self, path):
+
+        path      = os.path.abspath(path)
+        stateFile = getStateFile(path)
+
+        lockFile  = None
+        if fcntl:
+            lockFile = open('{}.lock'.format(path), 'a')
+            fcntl.flock(lockFile.fileno(), fcntl.LOCK_EX)
+
+        try:
+            state = self._merge(mMecoRelease.cacheLib.readJson(stateFile, {}))
+
+            mMecoRelease.cacheLib.writeJson(stateFile, state)
+
+            # Temporary file doesn't end with .prom, so the collector ignores it
+            descriptor, temporaryPath = tempfile.mkstemp(prefix='.{}.'.format(os.path.basename(path)), dir=os.path.dirname(path))
+
+            try:
+                with os.fdopen(descriptor, 'w') as metricsFile:
+                    metricsFile.write(self._render(state))
+
+                # Collector runs as another user
+                os.chmod(temporaryPath, 0o644)
+
+                mMecoRelease.cacheLib.replaceFile(temporaryPath, path)
+
+            except Exception:
+                if os.path.exists(temporaryPath):
+                    os.remove(temporaryPath)
+                raise
+
+        finally:
+            if lockFile:
+                lockFile.close()
+
+        self._samples = {}
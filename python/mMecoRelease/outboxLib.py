@@ -0,0 +1,558 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/outboxLib.py @brief [ FILE   ] - Notification outbox module.
+## @package mMecoRelease.outboxLib    @brief [ MODULE ] - Notification outbox module.
+#
+#  Release notifications are queued as JSON files in a spool directory in local cache and sent by a
+#  background worker, so releasing doesn't wait for the mail server. Notifications queued in the
+#  same batch, such as by release all, are held until the batch is closed and sent as one digest.
+#
+#  Mail server is set with MECO_RELEASE_SMTP_HOST and MECO_RELEASE_SMTP_PORT environment variables,
+#  a local stand-in can be used to test, such as: python -m aiosmtpd -n -l localhost:8025
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORTS
+# ----------------------------------------------------------------------------------------------------
+import os
+import sys
+import time
+import uuid
+import errno
+import socket
+import smtplib
+import subprocess
+
+import email.mime.text
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+import mMecoRelease.cacheLib
+import mMecoRelease.dependencyGraphLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ str ] - Environment variable that sets the mail server host.
+SMTP_HOST_ENV               = 'MECO_RELEASE_SMTP_HOST'
+
+## [ str ] - Environment variable that sets the mail server port.
+SMTP_PORT_ENV               = 'MECO_RELEASE_SMTP_PORT'
+
+## [ str ] - Environment variable that sets the sender address of the notifications.
+NOTIFICATION_SENDER_ENV     = 'MECO_RELEASE_NOTIFICATION_SENDER'
+
+## [ str ] - Environment variable that sets comma separated addresses notified in addition to the developers of the package.
+NOTIFICATION_RECIPIENTS_ENV = 'MECO_RELEASE_NOTIFICATION_RECIPIENTS'
+
+## [ str ] - Default mail server host.
+DEFAULT_SMTP_HOST           = 'localhost'
+
+## [ int ] - Default mail server port.
+DEFAULT_SMTP_PORT           = 25
+
+## [ float ] - Timeout of mail server connections in seconds.
+SMTP_TIMEOUT                = 30.0
+
+## [ int ] - Format of the notification files.
+NOTIFICATION_FORMAT         = 1
+
+## [ str ] - Name of the outbox directory in local cache.
+OUTBOX_DIRECTORY_NAME       = 'outbox'
+
+## [ str ] - Name of the directory of notifications waiting to be sent.
+PENDING_DIRECTORY_NAME      = 'pending'
+
+## [ str ] - Name of the directory of notifications given up on.
+FAILED_DIRECTORY_NAME       = 'failed'
+
+## [ str ] - Name of the directory of open batches.
+BATCHES_DIRECTORY_NAME      = 'batches'
+
+## [ str ] - Name of the log file of the worker.
+WORKER_LOG_FILE_NAME        = 'worker.log'
+
+## [ int ] - Number of attempts to send a notification before it is moved to failed directory.
+MAX_ATTEMPTS                = 5
+
+## [ int ] - Age in seconds after which an open batch is sent anyway, in case the process that opened it has died.
+BATCH_TIMEOUT               = 60 * 60
+
+## [ int ] - Seconds the background worker waits before it retries failed notifications and checks open batches again.
+RETRY_INTERVAL              = 5 * 60
+
+#
+## @brief Get outbox directory, create it if it doesn't exist.
+#
+#  @param name [ str | None | in  ] - Name of a directory in the outbox, outbox itself is returned if None.
+#
+#  @exception OSError - If the directory can not be created.
+#
+#  @return str - Path.
+def getOutboxDirectory(name=None):
+
+    directory = os.path.join(mMecoRelease.cacheLib.getCacheDirectory(), OUTBOX_DIRECTORY_NAME)
+    if name:
+        directory = os.path.join(directory, name)
+
+    try:
+        os.makedirs(directory)
+    except OSError as error:
+        if error.errno != errno.EEXIST:
+            raise
+
+    return directory
+
+#
+## @brief Get addresses notified about a release of a package.
+#
+#  @param packagePath [ str | None | in  ] - Root of the package.
+#  @param packageName [ str | None | in  ] - Name of the package.
+#
+#  @exception ValueError - If developers can not be read from package info module.
+#
+#  @return list of str - Addresses, developers of the package first.
+def getRecipients(packagePath, packageName):
+
+    recipients = mMecoRelease.dependencyGraphLib.getPackageInfoList(packagePath, packageName, mMecoRelease.dependencyGraphLib.DEVELOPERS_KEY)
+    recipients.extend([address.strip() for address in os.environ.get(NOTIFICATION_RECIPIENTS_ENV, '').split(',')])
+
+    uniqueRecipients = []
+    for address in recipients:
+        if address and not address in uniqueRecipients:
+            uniqueRecipients.append(address)
+
+    return uniqueRecipients
+
+#
+## @brief Get notifications waiting to be sent.
+#
+#  @exception N/A
+#
+#  @return list of str - Paths of the notification files, in the order they have been queued.
+def getPendingNotifications():
+
+    pendingDirectory = getOutboxDirectory(PENDING_DIRECTORY_NAME)
+
+    return [os.path.join(pendingDirectory, name) for name in sorted(os.listdir(pendingDirectory))
+            if not name.startswith('.') and name.endswith('.json')]
+
+#
+## @brief Queue a notification about a released package.
+#
+#  @param packageName [ str         | None | in  ] - Name of the package.
+#  @param version     [ str         | None | in  ] - Released version.
+#  @param versionPath [ str         | None | in  ] - Path of the released version.
+#  @param projectName [ str         | None | in  ] - Name of the project.
+#  @param developer   [ str         | None | in  ] - Name of the developer who has released the package.
+#  @param recipients  [ list of str | None | in  ] - Addresses to notify.
+#  @param batch       [ str         | None | in  ] - Batch the notification is sent with, see openBatch function.
+#
+#  @exception IOError - If the notification can not be written.
+#
+#  @return str - Path of the notification file.
+def enqueue(packageName, version, versionPath, projectName, developer, recipients, batch=None):
+
+    currentTime = time.time()
+
+    # Names sort in the order notifications are queued
+    path = os.path.join(getOutboxDirectory(PENDING_DIRECTORY_NAME), '{:.6f}.{}.json'.format(currentTime, uuid.uuid4().hex))
+
+    mMecoRelease.cacheLib.writeJson(path, {'format'      : NOTIFICATION_FORMAT,
+                                           'packageName' : packageName,
+                                           'version'     : version,
+                                           'versionPath' : versionPath,
+                                           'projectName' : projectName,
+                                           'developer'   : developer,
+                                           'recipients'  : list(recipients),
+                                           'batch'       : batch,
+                                           'time'        : currentTime,
+                                           'attempts'    : 0})
+
+    return path
+
+#
+## @brief Open a batch, notifications queued in it are held until it's closed.
+#
+#  @exception IOError - If the batch can not be written.
+#
+#  @return str - Batch id.
+def openBatch():
+
+    batch = uuid.uuid4().hex
+    mMecoRelease.cacheLib.writeJson(os.path.join(getOutboxDirectory(BATCHES_DIRECTORY_NAME), '{}.json'.format(batch)),
+                                    {'time':time.time(), 'pid':os.getpid()})
+
+    return batch
+
+#
+## @brief Close a batch, so its notifications can be sent as one digest.
+#
+#  @param batch [ str | None | in  ] - Batch id.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def closeBatch(batch):
+
+    try:
+        os.remove(os.path.join(getOutboxDirectory(BATCHES_DIRECTORY_NAME), '{}.json'.format(batch)))
+    except OSError:
+        pass
+
+#
+## @brief Whether a batch is still open.
+#
+#  @param batch [ str | None | in  ] - Batch id.
+#
+#  @exception N/A
+#
+#  @return bool - Result.
+def _isBatchOpen(batch):
+
+    try:
+        return time.time() - os.path.getmtime(os.path.join(getOutboxDirectory(BATCHES_DIRECTORY_NAME), '{}.json'.format(batch))) < BATCH_TIMEOUT
+    except OSError:
+        return False
+
+#
+## @brief Compose a mail message about released packages.
+#
+#  @param notifications [ list of dict | None | in  ] - Notifications, a single one or a batch of them.
+#  @param sender        [ str          | None | in  ] - Sender address.
+#  @param recipients    [ list of str  | None | in  ] - Addresses to notify.
+#
+#  @exception N/A
+#
+#  @return email.mime.text.MIMEText - Message.
+def composeMessage(notifications, sender, recipients):
+
+    projectNames = sorted(set([notification['projectName'] or '' for notification in notifications]))
+
+    if len(notifications) == 1:
+        subject = 'Released {} {} in project {}'.format(notifications[0]['packageName'], notifications[0]['version'], ', '.join(projectNames))
+    else:
+        subject = 'Released {} packages in project {}'.format(len(notifications), ', '.join(projectNames))
+
+    lines = []
+    for notification in sorted(notifications, key=lambda item: item['packageName']):
+        lines.append('{} {}\n    Path      : {}\n    Developer : {}\n    Time      : {}\n'.format(notification['packageName'],
+                                                                                                notification['version'],
+                                                                                                notification['versionPath'],
+                                                                                                notification['developer'],
+                                                                                                time.strftime('%Y-%m-%d %H:%M:%S',
+                                                                                                              time.localtime(notification['time']))))
+
+    message            = email.mime.text.MIMEText('\n'.join(lines), 'plain', 'utf-8')
+    message['Subject'] = subject
+    message['From']    = sender
+    message['To']      = ', '.join(recipients)
+
+    return message
+
+#
+## @brief [ CLASS ] - Class that sends queued notifications.
+class OutboxWorker(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param host   [ str | None | in  ] - Mail server host, MECO_RELEASE_SMTP_HOST environment variable or localhost if None.
+    #  @param port   [ int | None | in  ] - Mail server port, MECO_RELEASE_SMTP_PORT environment variable or 25 if None.
+    #  @param sender [ str | None | in  ] - Sender address, MECO_RELEASE_NOTIFICATION_SENDER environment variable or one derived from host name if None.
+    #
+    #  @exception ValueError - If the port is not a number.
+    #
+    #  @return None - None.
+    def __init__(self, host=None, port=None, sender=None):
+
+        ## [ str ] - Mail server host.
+        self._host   = host if host else os.environ.get(SMTP_HOST_ENV, DEFAULT_SMTP_HOST)
+
+        ## [ int ] - Mail server port.
+        self._port   = int(port if port else os.environ.get(SMTP_PORT_ENV, DEFAULT_SMTP_PORT))
+
+        ## [ str ] - Sender address.
+        self._sender = sender if sender else os.environ.get(NOTIFICATION_SENDER_ENV, 'mmecorelease@{}'.format(socket.getfqdn()))
+
+    #
+    ## @brief Append a line to the worker log.
+    #
+    #  @param message [ str | None | in  ] - Message.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def _log(self, message):
+
+        try:
+            with open(os.path.join(getOutboxDirectory(), WORKER_LOG_FILE_NAME), 'a') as logFile:
+                logFile.write('{} [{}] {}\n'.format(time.strftime('%Y-%m-%d %H:%M:%S'), os.getpid(), message))
+        except (IOError, OSError):
+            pass
+
+    #
+    ## @brief Get notifications that are ready to be sent, grouped by batch.
+    #
+    #  @param attemptedPaths [ set of str | None | in  ] - Paths of the notifications already attempted by this worker, they are skipped.
+    #
+    #  @exception N/A
+    #
+    #  @return list of list of tuple - Path and content of each notification of each group.
+    def _getReadyGroups(self, attemptedPaths):
+
+        groups      = {}
+        openBatches = {}
+
+        for path in getPendingNotifications():
+
+            if path in attemptedPaths:
+                continue
+
+            notification = mMecoRelease.cacheLib.readJson(path)
+            if not isinstance(notification, dict) or notification.get('format') != NOTIFICATION_FORMAT:
+                self._moveToFailed(path, 'Notification can not be read')
+                continue
+
+            batch = notification.get('batch')
+            if batch:
+                if not batch in openBatches:
+                    openBatches[batch] = _isBatchOpen(batch)
+
+                if openBatches[batch]:
+                    continue
+
+            groups.setdefault(batch or path, []).append((path, notification))
+
+        return [groups[key] for key in sorted(groups.keys(), key=lambda key: groups[key][0][0])]
+
+    #
+    ## @brief Move a notification to failed directory.
+    #
+    #  @param path   [ str | None | in  ] - Path of the notification file.
+    #  @param reason [ str | None | in  ] - Reason.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def _moveToFailed(self, path, reason):
+
+        try:
+            os.rename(path, os.path.join(getOutboxDirectory(FAILED_DIRECTORY_NAME), os.path.basename(path)))
+        except OSError:
+            pass
+
+        self._log('{}, moved to failed directory: {}'.format(reason, os.path.basename(path)))
+
+    #
+    ## @brief Record a failed attempt to send notifications.
+    #
+    #  @param group [ list of tuple | None | in  ] - Path and content of each notification.
+    #  @param error [ Exception     | None | in  ] - Error.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def _setAttemptFailed(self, group, error):
+
+        for path, notification in group:
+
+            notification['attempts'] = notification.get('attempts', 0) + 1
+            if notification['attempts'] >= MAX_ATTEMPTS:
+                self._moveToFailed(path, 'Notification could not be sent {} times: {}'.format(MAX_ATTEMPTS, error))
+                continue
+
+            try:
+                mMecoRelease.cacheLib.writeJson(path, notification)
+            except (IOError, OSError):
+                pass
+
+        self._log('Notifications could not be sent, {} will be retried: {}'.format(len(group), error))
+
+    #
+    ## @brief Send ready notifications, one message per batch.
+    #
+    #  @param attemptedPaths [ set of str | None | in  ] - Paths of the notifications already attempted by this worker, attempted ones are added to it.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of notifications sent.
+    def _send(self, attemptedPaths):
+
+        groups = self._getReadyGroups(attemptedPaths)
+        if not groups:
+            return 0
+
+        for group in groups:
+            attemptedPaths.update([path for path, notification in group])
+
+        try:
+            connection = smtplib.SMTP(self._host, self._port, timeout=SMTP_TIMEOUT)
+        except (smtplib.SMTPException, socket.error) as error:
+            for group in groups:
+                self._setAttemptFailed(group, error)
+            return 0
+
+        sentCount = 0
+
+        try:
+            for group in groups:
+
+                recipients = []
+                for path, notification in group:
+                    recipients.extend([address for address in notification['recipients'] if not address in recipients])
+
+                if not recipients:
+                    for path, notification in group:
+                        self._moveToFailed(path, 'Notification has no recipients')
+                    continue
+
+                message = composeMessage([notification for path, notification in group], self._sender, recipients)
+
+                try:
+                    connection.sendmail(self._sender, recipients, message.as_string())
+                except (smtplib.SMTPException, socket.error) as error:
+                    self._setAttemptFailed(group, error)
+                    continue
+
+                for path, notification in group:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+                sentCount += len(group)
+                self._log('Sent {} notifications to {}: {}'.format(len(group), ', '.join(recipients), message['Subject']))
+
+        finally:
+            try:
+                connection.quit()
+            except (smtplib.SMTPException, socket.error):
+                pass
+
+        return sentCount
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Send ready notifications unless another worker is already sending them.
+    #
+    #  Notifications queued while sending are sent as well before the worker gives up the outbox. Outbox is
+    #  checked again once the lock is released, as a worker started meanwhile gives up without sending.
+    #
+    #  @param retryInterval [ float | None | in  ] - Seconds to wait before failed notifications are retried and open batches
+    #                                                 are checked again, until no notification is pending. Returns once none is ready if None.
+    #
+    #  @exception N/A
+    #
+    #  @return int  - Number of notifications sent.
+    #  @return None - If another worker is sending notifications.
+    def drain(self, retryInterval=None):
+
+        sentCount      = None
+        attemptedPaths = set()
+
+        while True:
+
+            lockFile = open(os.path.join(getOutboxDirectory(), '.lock'), 'a')
+
+            try:
+                if fcntl:
+                    try:
+                        fcntl.flock(lockFile.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except (IOError, OSError):
+                        return sentCount
+
+                sentCount = sentCount or 0
+
+                while True:
+                    attemptedCount  = len(attemptedPaths)
+                    sentCount      += self._send(attemptedPaths)
+
+                    if len(attemptedPaths) == attemptedCount:
+                        break
+
+            finally:
+                lockFile.close()
+
+            # Notification queued after the last scan, whose worker has found the lock held
+            if self._getReadyGroups(attemptedPaths):
+                continue
+
+            if retryInterval is None or not getPendingNotifications():
+                return sentCount
+
+            time.sleep(retryInterval)
+            attemptedPaths = set()
+
+#
+## @brief Send ready notifications in the foreground.
+#
+#  Used by the background worker started by startWorker function, which stays until no notification is pending,
+#  so failed notifications are retried and batches left open are sent once they time out.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def drain():
+
+    OutboxWorker().drain(RETRY_INTERVAL)
+
+#
+## @brief Start a background worker that sends ready notifications.
+#
+#  Worker is detached from the calling process, which returns without waiting for the mail server.
+#
+#  @exception N/A
+#
+#  @return bool - Whether the worker has been started.
+def startWorker():
+
+    kwargs = {}
+    if os.name == 'posix':
+        kwargs['preexec_fn'] = os.setsid
+    else:
+        # DETACHED_PROCESS | CREATE_NEW_PROCESS_GROUP
+        kwargs['creationflags'] = 0x00000008 | 0x00000200
+
+    try:
+        with open(os.devnull, 'r+') as nullFile:
+            subprocess.Popen([sys.executable, '-c', 'import mMecoRelease.outboxLib;mMecoRelease.outboxLib.drain()'],
+                             stdin=nullFile,
+                             stdout=nullFile,
+                             stderr=nullFile,
+                             close_fds=os.name == 'posix',
+                             cwd=getOutboxDirectory(),
+                             **kwargs)
+    except (IOError, OSError):
+        return False
+
+    return True
@@ -79,7 +79,7 @@ DEVELOPERS          = ['safak@safakoner.com']
 DEPENDENT_PACKAGES  = ['mCore',
                        'mDeveloper',
                        'mFileSystem',
-                       'mMeco'
+                       'mMeco',
                        'mMecoPackage',
                        'mMecoSettings',
                        'mProcess'
@@ -33,6 +33,7 @@
 # ----------------------------------------------------------------------------------------------------
 ## [ list of str ] - Pre dependency list.
 PRE_DEPENDENCY_LIST  = ['mMecoRelease.processes.releasePreDep.genericDisplayPackageInfoDep',
+                        'mMecoRelease.processes.releasePreDep.genericDisplayReleasePlanDep',
 
                         'mMecoRelease.processes.releasePreDep.genericCheckEndOfWeekDep',
                         'mMecoRelease.processes.releasePreDep.genericCheckPackageDevelopmentLocationDep',
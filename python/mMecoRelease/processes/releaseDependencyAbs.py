@@ -0,0 +1,189 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/processes/releaseDependencyAbs.py @brief [ FILE   ] - Abstract dependency module.
+## @package mMecoRelease.processes.releaseDependencyAbs    @brief [ MODULE ] - Abstract dependency module.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import mProcess.dependencyAbs
+
+import mMecoRelease.traceLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+#
+## @brief [ ABSTRACT CLASS ] - Base class of release dependencies.
+#
+#  Failures are recorded in failedDependencies data key, so commands can report
+#  which dependencies of a package have failed. Runs are traced if the container
+#  has a tracer, see mMecoRelease.traceLib.
+#
+#  Child classes can list what their result depends on in _cacheKeys, such results
+#  are replayed from mMecoRelease.resultCacheLib while none of those change.
+class ReleaseDependency(mProcess.dependencyAbs.Dependency):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param parent [ QObject               | None | in  ] - Parent.
+    #  @param data   [ mProcess.dataLib.Data | None | in  ] - Data.
+    #  @param kwargs [ dict                  | None | in  ] - Keyword arguments.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self, parent=None, data=None, **kwargs):
+
+        mProcess.dependencyAbs.Dependency.__dict__['__init__'](self, parent, data, **kwargs)
+
+        ## [ tuple of str ] - mMecoRelease.resultCacheLib.KEY_* constants the result depends on, result isn't cached if empty.
+        self._cacheKeys      = ()
+
+        ## [ dict ] - Infos, success and failure set during the run, None if the run isn't recorded for the cache.
+        self._record         = None
+
+        # Implementation of the child class is wrapped per instance, so dependencies don't need to trace themselves
+        runForTerminal       = self._runForTerminal
+        self._runForTerminal = lambda: self._runTraced(runForTerminal)
+
+    #
+    ## @brief Run the dependency, traced if the container has a tracer.
+    #
+    #  @param runForTerminal [ callable | None | in  ] - Implementation of _runForTerminal method.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def _runTraced(self, runForTerminal):
+
+        traceArgs = {}
+
+        with mMecoRelease.traceLib.span(self._data['tracer'], self._name, 'dependency', traceArgs):
+            return self._runCached(runForTerminal, traceArgs)
+
+    #
+    ## @brief Run the dependency or replay its cached result.
+    #
+    #  Results are only stored if the run returns, exceptions are never cached.
+    #
+    #  @param runForTerminal [ callable | None | in  ] - Implementation of _runForTerminal method.
+    #  @param traceArgs      [ dict     | None | in  ] - Arguments of the trace span, cached key is set.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def _runCached(self, runForTerminal, traceArgs):
+
+        _resultCache = self._data['resultCache']
+        if not self._cacheKeys or not _resultCache:
+            return runForTerminal()
+
+        cacheKey = _resultCache.getCacheKey(self, self._cacheKeys, self._data)
+        entry    = _resultCache.get(cacheKey)
+
+        traceArgs['cached'] = entry is not None
+
+        if entry is not None:
+            for message in entry.get('infos', []):
+                self._setInfo(message)
+
+            if entry.get('failure') is not None:
+                return self._setFailure(entry['failure'])
+
+            if entry.get('success'):
+                return self._setSuccess()
+
+            return bool(entry.get('result'))
+
+        self._record = {'infos':[], 'success':False, 'failure':None}
+
+        try:
+            result = runForTerminal()
+        finally:
+            record       = self._record
+            self._record = None
+
+        record['result'] = bool(result)
+        _resultCache.set(cacheKey, record)
+
+        return result
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # REIMPLEMENTED PROTECTED METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Set info.
+    #
+    #  @param args   [ list | None | in  ] - Arguments.
+    #  @param kwargs [ dict | None | in  ] - Keyword arguments.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def _setInfo(self, *args, **kwargs):
+
+        if self._record is not None and args:
+            self._record['infos'].append(args[0])
+
+        return mProcess.dependencyAbs.Dependency.__dict__['_setInfo'](self, *args, **kwargs)
+
+    #
+    ## @brief Set success.
+    #
+    #  @param args   [ list | None | in  ] - Arguments.
+    #  @param kwargs [ dict | None | in  ] - Keyword arguments.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def _setSuccess(self, *args, **kwargs):
+
+        if self._record is not None:
+            self._record['success'] = True
+
+        return mProcess.dependencyAbs.Dependency.__dict__['_setSuccess'](self, *args, **kwargs)
+
+    #
+    ## @brief Set failure.
+    #
+    #  @param args   [ list | None | in  ] - Arguments.
+    #  @param kwargs [ dict | None | in  ] - Keyword arguments.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def _setFailure(self, *args, **kwargs):
+
+        if self._record is not None:
+            self._record['failure'] = args[0] if args else ''
+
+        self._data['failedDependencies'].append((self._name, bool(getattr(self, '_isIgnorable', False))))
+
+        return mProcess.dependencyAbs.Dependency.__dict__['_setFailure'](self, *args, **kwargs)
@@ -25,7 +25,12 @@
 # ----------------------------------------------------------------------------------------------------
 # IMPORT
 # ----------------------------------------------------------------------------------------------------
-import mProcess.dependencyAbs
+import os
+
+import mMecoSettings.envVariablesLib
+
+import mMecoRelease.outboxLib
+import mMecoRelease.processes.releaseDependencyAbs
 
 
 #
@@ -34,7 +39,7 @@ import mProcess.dependencyAbs
 # ----------------------------------------------------------------------------------------------------
 #
 ## @brief [ DEPENDENCY CLASS ] - Dependency class.
-class GenericSendNotification(mProcess.dependencyAbs.Dependency):
+class GenericSendNotification(mMecoRelease.processes.releaseDependencyAbs.ReleaseDependency):
     #
     # ------------------------------------------------------------------------------------------------
     # PRIVATE METHODS
@@ -51,7 +56,7 @@ class GenericSendNotification(mProcess.dependencyAbs.Dependency):
     #  @return None - None.
     def __init__(self, parent=None, data=None, **kwargs):
 
-        mProcess.dependencyAbs.Dependency.__dict__['__init__'](self, parent, data, **kwargs)
+        mMecoRelease.processes.releaseDependencyAbs.ReleaseDependency.__dict__['__init__'](self, parent, data, **kwargs)
 
         ## [ str ] - Name of the dependency.
         self._name          = 'Generic    - Send Notification'
@@ -59,13 +64,47 @@ class GenericSendNotification(mProcess.dependencyAbs.Dependency):
         ## [ str ] - Description of the dependency.
         self._description   = 'Send notification about the recently released package.'
 
+        ## [ bool ] - Whether this dependency is ignorable.
+        self._isIgnorable   = True
+
     #
     ## @brief Run the dependency for terminal.
     #
+    #  Notification is queued to the outbox and sent by a background worker, see mMecoRelease.outboxLib.
+    #  Notifications of a batch are sent as one digest once the batch is closed.
+    #
     #  @exception N/A
     #
     #  @return bool - Result.
     def _runForTerminal(self):
 
+        _package   = self._data['package']
+
+        try:
+            recipients = mMecoRelease.outboxLib.getRecipients(_package.path(), _package.name())
+        except ValueError as error:
+            return self._setFailure('Recipients could not be read: {}'.format(error))
+
+        if not recipients:
+            self._setInfo('No one to notify, set DEVELOPERS in package info module or {} environment variable.'.format(mMecoRelease.outboxLib.NOTIFICATION_RECIPIENTS_ENV))
+            return self._setSuccess()
+
+        try:
+            mMecoRelease.outboxLib.enqueue(_package.name(),
+                                           _package.version(),
+                                           self._data['newVersionPath'],
+                                           os.environ.get(mMecoSettings.envVariablesLib.MECO_PROJECT_NAME),
+                                           os.environ.get(mMecoSettings.envVariablesLib.MECO_DEVELOPER_NAME),
+                                           recipients,
+                                           self._data['notificationBatch'])
+        except (IOError, OSError) as error:
+            return self._setFailure('Notification could not be queued: {}'.format(error))
+
+        if self._data['notificationBatch']:
+            self._setInfo('Notification has been queued for the digest: {}'.format(', '.join(recipients)))
+            return self._setSuccess()
+
+        mMecoRelease.outboxLib.startWorker()
+        self._setInfo('Notification has been queued: {}'.format(', '.join(recipients)))
 
         return self._setSuccess()
@@ -27,7 +27,7 @@
 # ----------------------------------------------------------------------------------------------------
 from    datetime import date
 
-import  mProcess.dependencyAbs
+import  mMecoRelease.processes.releaseDependencyAbs
 
 
 #
@@ -36,7 +36,7 @@ import  mProcess.dependencyAbs
 # ----------------------------------------------------------------------------------------------------
 #
 ## @brief [ DEPENDENCY CLASS ] - Dependency class.
-class GenericCheckEndOfWeek(mProcess.dependencyAbs.Dependency):
+class GenericCheckEndOfWeek(mMecoRelease.processes.releaseDependencyAbs.ReleaseDependency):
     #
     # ------------------------------------------------------------------------------------------------
     # PRIVATE METHODS
@@ -53,7 +53,7 @@ class GenericCheckEndOfWeek(mProcess.dependencyAbs.Dependency):
     #  @return None - None.
     def __init__(self, parent=None, data=None, **kwargs):
 
-        mProcess.dependencyAbs.Dependency.__dict__['__init__'](self, parent, data, **kwargs)
+        mMecoRelease.processes.releaseDependencyAbs.ReleaseDependency.__dict__['__init__'](self, parent, data, **kwargs)
 
         ## [ str ] - Name of the dependency.
         self._name          = 'Generic    - Check end of Week'
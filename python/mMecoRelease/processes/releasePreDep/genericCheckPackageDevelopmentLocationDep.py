@@ -27,7 +27,8 @@
 # ----------------------------------------------------------------------------------------------------
 import os
 
-import mProcess.dependencyAbs
+import mMecoRelease.processes.releaseDependencyAbs
+import mMecoRelease.resultCacheLib
 
 import mMecoSettings.envVariablesLib
 
@@ -38,7 +39,7 @@ import mMecoSettings.envVariablesLib
 # ----------------------------------------------------------------------------------------------------
 #
 ## @brief [ DEPENDENCY CLASS ] - Dependency class.
-class GenericCheckPackageDevelopmentLocation(mProcess.dependencyAbs.Dependency):
+class GenericCheckPackageDevelopmentLocation(mMecoRelease.processes.releaseDependencyAbs.ReleaseDependency):
     #
     # ------------------------------------------------------------------------------------------------
     # PRIVATE METHODS
@@ -55,7 +56,7 @@ class GenericCheckPackageDevelopmentLocation(mProcess.dependencyAbs.Dependency):
     #  @return None - None.
     def __init__(self, parent=None, data=None, **kwargs):
 
-        mProcess.dependencyAbs.Dependency.__dict__['__init__'](self, parent, data, **kwargs)
+        mMecoRelease.processes.releaseDependencyAbs.ReleaseDependency.__dict__['__init__'](self, parent, data, **kwargs)
 
         ## [ str ] - Name of the dependency.
         self._name          = 'Generic    - Check Package Development Location'
@@ -70,6 +71,9 @@ class GenericCheckPackageDevelopmentLocation(mProcess.dependencyAbs.Dependency):
         ## [ mMecoPackage.packageLib.Package ] - mMecoPackage.packageLib.Package class instance.
         self._package       = None
 
+        ## [ tuple of str ] - What the result depends on, see mMecoRelease.resultCacheLib.
+        self._cacheKeys     = (mMecoRelease.resultCacheLib.KEY_PACKAGE_VERSION, mMecoRelease.resultCacheLib.KEY_ENVIRONMENT)
+
     #
     # ------------------------------------------------------------------------------------------------
     # REIMPLEMENTED PROTECTED METHODS
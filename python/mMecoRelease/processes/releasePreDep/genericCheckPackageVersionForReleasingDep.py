@@ -27,7 +27,9 @@
 # ----------------------------------------------------------------------------------------------------
 import os
 
-import mProcess.dependencyAbs
+import mMecoRelease.catalogLib
+import mMecoRelease.processes.releaseDependencyAbs
+import mMecoRelease.resultCacheLib
 
 
 #
@@ -36,7 +38,7 @@ import mProcess.dependencyAbs
 # ----------------------------------------------------------------------------------------------------
 #
 ## @brief [ DEPENDENCY CLASS ] - Dependency class.
-class GenericCheckPackageVersionForReleasing(mProcess.dependencyAbs.Dependency):
+class GenericCheckPackageVersionForReleasing(mMecoRelease.processes.releaseDependencyAbs.ReleaseDependency):
     #
     # ------------------------------------------------------------------------------------------------
     # PRIVATE METHODS
@@ -53,7 +55,7 @@ class GenericCheckPackageVersionForReleasing(mProcess.dependencyAbs.Dependency):
     #  @return None - None.
     def __init__(self, parent=None, data=None, **kwargs):
 
-        mProcess.dependencyAbs.Dependency.__dict__['__init__'](self, parent, data, **kwargs)
+        mMecoRelease.processes.releaseDependencyAbs.ReleaseDependency.__dict__['__init__'](self, parent, data, **kwargs)
 
         ## [ str ] - Name of the dependency.
         self._name        = 'Generic    - Check Package Version for Releasing'
@@ -64,6 +66,9 @@ class GenericCheckPackageVersionForReleasing(mProcess.dependencyAbs.Dependency):
         ## [ str ] - Description of the dependency.
         self._description = 'Check whether this version of the package previously released.'
 
+        ## [ tuple of str ] - What the result depends on, see mMecoRelease.resultCacheLib.
+        self._cacheKeys   = (mMecoRelease.resultCacheLib.KEY_PACKAGE_VERSION, mMecoRelease.resultCacheLib.KEY_RELEASE_PATH)
+
     #
     # ------------------------------------------------------------------------------------------------
     # REIMPLEMENTED PROTECTED METHODS
@@ -78,6 +83,15 @@ class GenericCheckPackageVersionForReleasing(mProcess.dependencyAbs.Dependency):
 
         newVersionPath = self._data['newVersionPath']
 
+        _catalog = mMecoRelease.catalogLib.ReleaseCatalog(self._data['packageReleasePath'])
+        if _catalog.exists():
+            try:
+                if _catalog.hasVersion(self._data['package'].name(), self._data['package'].version()):
+                    return self._setFailure('This version of the package has been previously released: {}'.format(newVersionPath))
+            except mMecoRelease.catalogLib.sqlite3.Error as error:
+                self._setInfo('Release catalog could not be read: {}'.format(error))
+
+        # Catalog may miss releases made without it, a single stat is cheap enough to be sure
         if os.path.isdir(newVersionPath):
             return self._setFailure('This version of the package has been previously released: {}'.format(newVersionPath))
 
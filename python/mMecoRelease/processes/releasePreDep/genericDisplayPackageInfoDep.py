@@ -25,7 +25,7 @@
 # ----------------------------------------------------------------------------------------------------
 # IMPORT
 # ----------------------------------------------------------------------------------------------------
-import mProcess.dependencyAbs
+import mMecoRelease.processes.releaseDependencyAbs
 
 
 #
@@ -34,7 +34,7 @@ import mProcess.dependencyAbs
 # ----------------------------------------------------------------------------------------------------
 #
 ## @brief [ DEPENDENCY CLASS ] - Dependency class.
-class GenericDisplayPackageInfo(mProcess.dependencyAbs.Dependency):
+class GenericDisplayPackageInfo(mMecoRelease.processes.releaseDependencyAbs.ReleaseDependency):
     #
     # ------------------------------------------------------------------------------------------------
     # PRIVATE METHODS
@@ -51,7 +51,7 @@ class GenericDisplayPackageInfo(mProcess.dependencyAbs.Dependency):
     #  @return None - None.
     def __init__(self, parent=None, data=None, **kwargs):
 
-        mProcess.dependencyAbs.Dependency.__dict__['__init__'](self, parent, data, **kwargs)
+        mMecoRelease.processes.releaseDependencyAbs.ReleaseDependency.__dict__['__init__'](self, parent, data, **kwargs)
 
         ## [ str ] - Name of the dependency.
         self._name        = 'Generic    - Display Package Info'
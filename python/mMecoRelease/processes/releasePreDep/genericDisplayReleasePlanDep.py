@@ -0,0 +1,84 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/processes/releasePreDep/genericDisplayReleasePlanDep.py @brief [ FILE   ] - Dependency module.
+## @package mMecoRelease.processes.releasePreDep.genericDisplayReleasePlanDep    @brief [ MODULE ] - Dependency module.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORT
+# ----------------------------------------------------------------------------------------------------
+import mMecoRelease.processes.releaseDependencyAbs
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+#
+## @brief [ DEPENDENCY CLASS ] - Dependency class.
+class GenericDisplayReleasePlan(mMecoRelease.processes.releaseDependencyAbs.ReleaseDependency):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param parent [ QObject               | None | in  ] - Parent.
+    #  @param data   [ mProcess.dataLib.Data | None | in  ] - Data.
+    #  @param kwargs [ dict                  | None | in  ] - Keyword arguments.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self, parent=None, data=None, **kwargs):
+
+        mMecoRelease.processes.releaseDependencyAbs.ReleaseDependency.__dict__['__init__'](self, parent, data, **kwargs)
+
+        ## [ str ] - Name of the dependency.
+        self._name        = 'Generic    - Display Release Plan'
+
+        ## [ str ] - Description of the dependency.
+        self._description = 'Display files to be transferred compared to the previous release.'
+
+        ## [ bool ] - Whether this dependency is ignorable.
+        self._isIgnorable = True
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # REIMPLEMENTED PROTECTED METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Run the dependency for terminal.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def _runForTerminal(self):
+
+        _releasePlan = self._data['releasePlan']
+
+        if _releasePlan.manifest():
+            self._setInfo('Compared to {}: {}'.format(self._data['previousVersionPath'], _releasePlan.summary()))
+        else:
+            self._setInfo('No previous release manifest found: {}'.format(_releasePlan.summary()))
+
+        return True
\ No newline at end of file
@@ -26,13 +26,22 @@
 # IMPORTS
 # ----------------------------------------------------------------------------------------------------
 import os
-import stat
 
 import mFileSystem.directoryLib
-import mFileSystem.fileLib
 
 import mProcess.processAbs
 
+import mMecoRelease.archiveLib
+import mMecoRelease.catalogLib
+import mMecoRelease.copyLib
+import mMecoRelease.journalLib
+import mMecoRelease.manifestLib
+import mMecoRelease.progressLib
+import mMecoRelease.traceLib
+import mMecoRelease.versionLib
+
+import mMecoSettings.envVariablesLib
+
 
 #
 # ----------------------------------------------------------------------------------------------------
@@ -66,15 +75,198 @@ class PackageRelease(mProcess.processAbs.Process):
         ## [ str ] - Dependency list module.
         self._dependencyListModule   = 'mMecoRelease.processes.releaseDepList'
 
+        #
+
+        ## [ int ] - Number of files hard linked from the previous release.
+        self._linkedFileCount        = 0
+
+        ## [ mMecoRelease.manifestLib.Manifest ] - Manifest of the version being released.
+        self._manifest               = None
+
+        ## [ dict ] - Number of files copied with each method, see mMecoRelease.copyLib.
+        self._copyMethodCounts       = {}
+
+        ## [ mMecoRelease.archiveLib.ArchiveWriter ] - Archive release files are added to, None unless requested.
+        self._archiveWriter          = None
+
+        ## [ mMecoRelease.progressLib.CopyProgress ] - Copy progress, a line is displayed for each file if None.
+        self._progress               = None
+
+        ## [ mMecoRelease.progressLib.FileLog ] - Log copied files are written to, None unless requested.
+        self._fileLog                = None
+
+        ## [ mMecoRelease.journalLib.CopyJournal ] - Journal copied files are appended to, so an interrupted release can be resumed.
+        self._journal                = None
+
         mProcess.processAbs.Process.__dict__['__init__'](self, parent, data, **kwargs)
 
     #
-    ## @brief Run the process for terminal.
+    ## @brief Invoked for each file copied.
+    #
+    #  @param result [ mMecoRelease.copyLib.CopyResult | None | in  ] - Copy result.
+    #
+    #  @exception mMecoRelease.copyLib.CopyError - If the file can not be added to the journal, the archive or the file log.
+    #
+    #  @return None - None.
+    def _fileCopied(self, result):
+
+        if result.linked:
+            self._linkedFileCount += 1
+
+        self._copyMethodCounts[result.method] = self._copyMethodCounts.get(result.method, 0) + 1
+
+        # Released copy is read while it is still in page cache
+        if self._archiveWriter:
+            try:
+                self._archiveWriter.addFile(result.relativePath, result.destinationFile)
+            except (IOError, OSError) as error:
+                raise mMecoRelease.copyLib.CopyError(result.relativePath, 'File could not be added to the archive: {}'.format(error))
+
+        fileHash = result.hash
+        if not fileHash:
+            entry    = self._data['releasePlan'].getEntry(result.relativePath)
+            fileHash = entry['hash'] if entry else None
+
+        self._manifest.setFile(result.relativePath, result.size, result.mtime, fileHash)
+
+        try:
+            self._journal.append(result.relativePath, result.size, result.mtime, fileHash)
+        except OSError as error:
+            raise mMecoRelease.copyLib.CopyError(result.relativePath, 'File could not be added to the journal: {}'.format(error))
+
+        _tracer = self._data['tracer']
+        if _tracer and _tracer.tracesFiles():
+            _tracer.addEvent(result.relativePath, 'file', result.startTime, result.endTime,
+                             {'size':result.size, 'linked':result.linked}, threadId=result.threadId)
+
+        destinationFile = mFileSystem.directoryLib.Directory.join(self._data['newVersionPath'], result.relativePath)
+
+        if self._fileLog:
+            try:
+                self._fileLog.write(destinationFile)
+            except OSError as error:
+                raise mMecoRelease.copyLib.CopyError(result.relativePath, 'File could not be written to the file log: {}'.format(error))
+
+        if self._progress:
+            self._progress.update(result.size)
+        else:
+            self._setInfo(destinationFile)
+
+    #
+    ## @brief Claim the staging directory of an interrupted release of this version.
+    #
+    #  Staging directory is renamed to the one of this process, so only one process can resume it.
+    #
+    #  @param stagingPath [ str | None | in  ] - Path of the staging directory of this process.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Journal entries of the interrupted release, see mMecoRelease.journalLib.CopyJournal.read.
+    #  @return None - If there is no interrupted release to resume.
+    def _claimInterruptedRelease(self, stagingPath):
+
+        for interruptedStagingPath in mMecoRelease.versionLib.getStaleStagingPaths(self._data['newVersionPath']):
+
+            if not os.path.isfile(mMecoRelease.journalLib.getJournalFile(interruptedStagingPath)):
+                continue
+
+            try:
+                os.rename(interruptedStagingPath, stagingPath)
+            except OSError:
+                continue
+
+            self._setInfo('Resuming interrupted release: {}'.format(interruptedStagingPath))
+
+            return mMecoRelease.journalLib.CopyJournal.read(mMecoRelease.journalLib.getJournalFile(stagingPath),
+                                                            self._package.name(),
+                                                            self._package.version())
+
+        self._setInfo('No interrupted release to resume, all files are copied.')
+
+        return None
+
+    #
+    ## @brief Verify files copied by an interrupted release and remove everything else in its staging directory.
+    #
+    #  A journaled file is kept if its source hasn't changed since and its staged copy still has the
+    #  journaled size and hash. Journal isn't synced with the copied files, so a line may outlive the
+    #  content of its file after a crash, staged copy is hashed again instead of being trusted.
+    #  Other files are removed, since files are created exclusively and may have been cut short.
+    #
+    #  @param stagingPath [ str  | None | in  ] - Path of the claimed staging directory.
+    #  @param entries     [ dict | None | in  ] - Journal entries of the interrupted release.
+    #
+    #  @exception OSError - If a file can not be removed.
+    #
+    #  @return dict - Entries of the files that don't need to be copied again.
+    def _verifyInterruptedRelease(self, stagingPath, entries):
+
+        sourceStats = self._data['releaseFileList'].fileStats()
+        journalFile = mMecoRelease.journalLib.getJournalFile(stagingPath)
+        verified    = {}
+
+        for relativePath, entry in entries.items():
+
+            sourceStat = sourceStats.get(relativePath)
+            if not sourceStat or sourceStat[0] != entry['size'] or sourceStat[1] != entry['mtime']:
+                continue
+
+            if not entry['hash']:
+                continue
+
+            stagedFile = mFileSystem.directoryLib.Directory.join(stagingPath, relativePath)
+
+            try:
+                if os.path.getsize(stagedFile) != entry['size'] or mMecoRelease.copyLib.hashFile(stagedFile) != entry['hash']:
+                    continue
+            except (IOError, OSError):
+                continue
+
+            verified[relativePath] = entry
+
+        for root, directories, files in os.walk(stagingPath, topdown=False):
+
+            for name in files:
+                path = os.path.join(root, name)
+                if path != journalFile and not os.path.relpath(path, stagingPath) in verified:
+                    os.remove(path)
+
+            if root != stagingPath:
+                try:
+                    os.rmdir(root)
+                except OSError:
+                    # Directory still has verified files
+                    pass
+
+        return verified
+
+    #
+    ## @brief Invoked for each file kept from an interrupted release.
+    #
+    #  @param relativePath [ str  | None | in  ] - Relative path of the file.
+    #  @param entry        [ dict | None | in  ] - Journal entry of the file.
+    #  @param stagingPath  [ str  | None | in  ] - Path of the staging directory.
+    #
+    #  @exception IOError - If the file can not be added to the archive.
+    #
+    #  @return None - None.
+    def _fileResumed(self, relativePath, entry, stagingPath):
+
+        self._manifest.setFile(relativePath, entry['size'], entry['mtime'], entry['hash'])
+
+        if self._archiveWriter:
+            self._archiveWriter.addFile(relativePath, mFileSystem.directoryLib.Directory.join(stagingPath, relativePath))
+
+        if self._fileLog:
+            self._fileLog.write(mFileSystem.directoryLib.Directory.join(self._data['newVersionPath'], relativePath))
+
+    #
+    ## @brief Release the package.
     #
     #  @exception N/A
     #
     #  @return bool - Result.
-    def _runForTerminal(self):
+    def _release(self):
 
         self._package = self._data['package']
 
@@ -84,26 +276,226 @@ class PackageRelease(mProcess.processAbs.Process):
             return self._setFailure('No files found in the package: {}'.format(self._package.name()))
 
 
-        _file = mFileSystem.fileLib.File()
+        newVersionPath      = self._data['newVersionPath']
+        packageVersionsPath = os.path.dirname(os.path.normpath(newVersionPath))
+
+        # Files are copied into a hidden staging directory, which is renamed to the
+        # version directory at the end, so consumers never see a partial release
+        stagingPath = mMecoRelease.versionLib.getStagingPath(newVersionPath)
+
+        resumedEntries = self._claimInterruptedRelease(stagingPath) if self._data['resume'] else None
+
+        for removedStagingPath in mMecoRelease.versionLib.removeStaleStagingPaths(packageVersionsPath):
+            self._setInfo('Removed staging directory of an interrupted release: {}'.format(removedStagingPath))
+
+        if resumedEntries is None:
+            try:
+                if not os.path.isdir(packageVersionsPath):
+                    os.makedirs(packageVersionsPath)
+                os.mkdir(stagingPath)
+            except OSError as error:
+                return self._setFailure('Staging directory could not be created: {}'.format(error))
 
+        published     = False
+        self._journal = None
 
-        for rf in releaseFilesWithRelativePath:
+        try:
+            _tracer = self._data['tracer']
 
-            if not _file.setFile(mFileSystem.directoryLib.Directory.join(self._package.path(),
-                                                                         rf)):
-                return self._setFailure('File doesn\'t exist: {}'.format(rf))
+            copyPaths = releaseFilesWithRelativePath
+            if resumedEntries is not None:
+                try:
+                    with mMecoRelease.traceLib.span(_tracer, 'Verify interrupted release', 'process', {'journaledFileCount':len(resumedEntries)}):
+                        resumedEntries = self._verifyInterruptedRelease(stagingPath, resumedEntries)
+                except OSError as error:
+                    return self._setFailure('Interrupted release could not be resumed: {}'.format(error))
 
-            destinationFile = mFileSystem.directoryLib.Directory.join(self._data['newVersionPath'], rf)
+                copyPaths = [relativePath for relativePath in releaseFilesWithRelativePath if not relativePath in resumedEntries]
+                self._setInfo('{} of {} files have been copied by the interrupted release'.format(len(resumedEntries),
+                                                                                                  len(releaseFilesWithRelativePath)))
+
+            _releasePlan = self._data['releasePlan']
+
+            linkRoot     = None
+            linkPaths    = None
+
+            if self._data['dedup'] and self._data['previousVersionPath']:
+                linkRoot = self._data['previousVersionPath']
+                if _releasePlan.manifest():
+                    # Plan already knows which files are unchanged, skip comparing them again
+                    linkPaths = set(_releasePlan.unchangedFiles())
+
+            _fileCopier = mMecoRelease.copyLib.FileCopier(self._package.path(),
+                                                          stagingPath,
+                                                          jobs=self._data['jobs'],
+                                                          linkRoot=linkRoot,
+                                                          linkPaths=linkPaths,
+                                                          hashFiles=True,
+                                                          sourceStats=self._data['releaseFileList'].fileStats(),
+                                                          hashedPaths=set(_releasePlan.unchangedFiles()))
+
+            self._linkedFileCount  = 0
+            self._copyMethodCounts = {}
+            self._archiveWriter    = None
+
+            if self._data['archive']:
+                try:
+                    self._archiveWriter = mMecoRelease.archiveLib.ArchiveWriter(mMecoRelease.archiveLib.getArchiveFile(stagingPath))
+                except (IOError, OSError) as error:
+                    return self._setFailure('Archive could not be created: {}'.format(error))
+
+            self._manifest         = mMecoRelease.manifestLib.Manifest(self._package.name(), self._package.version())
+            self._progress         = None
+            self._fileLog          = None
+
+            if self._data['fileLogPath']:
+                try:
+                    self._fileLog = mMecoRelease.progressLib.FileLog(self._data['fileLogPath'])
+                except (IOError, OSError) as error:
+                    return self._setFailure('File log could not be opened: {}'.format(error))
+
+            if self._data['progress']:
+                sourceStats    = self._data['releaseFileList'].fileStats()
+                self._progress = mMecoRelease.progressLib.CopyProgress(len(copyPaths),
+                                                                       sum([sourceStats[relativePath][0] for relativePath in copyPaths
+                                                                            if relativePath in sourceStats]))
 
             try:
+                self._journal = mMecoRelease.journalLib.CopyJournal(mMecoRelease.journalLib.getJournalFile(stagingPath),
+                                                                    self._package.name(),
+                                                                    self._package.version(),
+                                                                    resumedEntries)
+
+                for relativePath in sorted(resumedEntries.keys() if resumedEntries else []):
+                    self._fileResumed(relativePath, resumedEntries[relativePath], stagingPath)
 
-                _file.copy(destinationFile, True)
-                self._setInfo(destinationFile)
+            except (IOError, OSError) as error:
+                return self._setFailure('Copy journal could not be written: {}'.format(error))
 
-                os.chmod(destinationFile, os.stat(destinationFile).st_mode & 0o0777 ^ (stat.S_IWRITE | stat.S_IWGRP | stat.S_IWOTH))
+            resumedSize = self._manifest.size()
 
-            except Exception as error:
+            # Arguments are read when the span ends, copied size is added once it is known
+            copyArgs = {'fileCount':len(copyPaths), 'jobs':_fileCopier.jobs()}
+
+            try:
+                with mMecoRelease.traceLib.span(_tracer, 'Copy files', 'process', copyArgs):
+                    _fileCopier.copy(copyPaths,
+                                     callback=self._fileCopied)
+                    copyArgs['copiedSize'] = self._manifest.size() - resumedSize
+                    copyArgs['methods']    = dict(self._copyMethodCounts)
+            except mMecoRelease.copyLib.CopyError as error:
                 return self._setFailure(str(error))
+            finally:
+                if self._progress:
+                    copySummary = self._progress.finish()
+
+            if self._progress:
+                self._setInfo(copySummary)
+
+            try:
+                with mMecoRelease.traceLib.span(_tracer, 'Write manifest', 'process'):
+                    self._manifest.write(mMecoRelease.manifestLib.getManifestFile(stagingPath))
+            except (IOError, OSError) as error:
+                return self._setFailure('Manifest could not be written: {}'.format(error))
+
+            if self._archiveWriter:
+                try:
+                    with mMecoRelease.traceLib.span(_tracer, 'Write archive index', 'process'):
+                        self._archiveWriter.addFile(mMecoRelease.manifestLib.MANIFEST_FILE_NAME,
+                                                    mMecoRelease.manifestLib.getManifestFile(stagingPath))
+                        self._archiveWriter.close()
+                except (IOError, OSError) as error:
+                    return self._setFailure('Archive could not be written: {}'.format(error))
+
+                self._archiveWriter = None
+
+            # Journal is only needed until the release is complete
+            try:
+                self._journal.close()
+                os.remove(self._journal.path())
+            except OSError as error:
+                return self._setFailure('Copy journal could not be removed: {}'.format(error))
+
+            try:
+                with mMecoRelease.traceLib.span(_tracer, 'Publish', 'process'):
+                    mMecoRelease.versionLib.publish(stagingPath, newVersionPath)
+            except OSError as error:
+                return self._setFailure('Release could not be published: {}'.format(error))
+
+            published               = True
+            self._data['published'] = True
+
+        finally:
+            if self._archiveWriter:
+                self._archiveWriter.abort()
+                self._archiveWriter = None
+
+            if self._fileLog:
+                try:
+                    self._fileLog.close()
+                except OSError as error:
+                    self._setInfo('File log could not be written: {}'.format(error))
+
+                self._fileLog = None
+
+            if self._journal:
+                self._journal.close()
+
+            if not published:
+                # Files copied so far are kept for mmecorelease-release --resume, otherwise
+                # the staging directory is removed by the next release of the package
+                journaledFileCount = self._journal.entryCount() if self._journal else len(resumedEntries or {})
+
+                if journaledFileCount and os.path.isfile(mMecoRelease.journalLib.getJournalFile(stagingPath)):
+                    self._setInfo('{} copied files have been kept to be resumed with --resume option: {}'.format(journaledFileCount,
+                                                                                                                 stagingPath))
+                else:
+                    try:
+                        mMecoRelease.versionLib.removeTree(stagingPath)
+                    except OSError:
+                        pass
+
+        if self._copyMethodCounts:
+            self._setInfo('Copy methods: {}'.format(', '.join(['{} {}'.format(method, count)
+                                                              for method, count in sorted(self._copyMethodCounts.items())])))
+
+        if self._data['archive']:
+            self._setInfo('Release files have been archived to: {}'.format(mMecoRelease.archiveLib.getArchiveFile(newVersionPath)))
+
+        if _fileCopier.linkRoot():
+            self._setInfo('{} of {} files have been hard linked from: {}'.format(self._linkedFileCount,
+                                                                                len(releaseFilesWithRelativePath),
+                                                                                _fileCopier.linkRoot()))
+
+        # Release is published already, catalog can be rebuilt from disk if it fails to be updated
+        if mMecoRelease.catalogLib.isAvailable():
+            _catalog = mMecoRelease.catalogLib.ReleaseCatalog(self._data['packageReleasePath'])
+            try:
+                with mMecoRelease.traceLib.span(self._data['tracer'], 'Update catalog', 'process'):
+                    catalogExisted = _catalog.addRelease(self._package.name(),
+                                                         self._package.version(),
+                                                         os.environ.get(mMecoSettings.envVariablesLib.MECO_DEVELOPER_NAME),
+                                                         len(self._manifest.files()),
+                                                         self._manifest.size())
+                if not catalogExisted:
+                    self._setInfo('Release catalog has been created, run mmecorelease-rebuild-catalog to index previous releases: {}'.format(_catalog.path()))
+            except (mMecoRelease.catalogLib.sqlite3.Error, OSError) as error:
+                self._setInfo('Release catalog could not be updated, run mmecorelease-rebuild-catalog: {}'.format(error))
 
 
         return self._setSuccess()
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # REIMPLEMENTED PROTECTED METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Run the process for terminal.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def _runForTerminal(self):
+
+        with mMecoRelease.traceLib.span(self._data['tracer'], self._name, 'process'):
+            return self._release()
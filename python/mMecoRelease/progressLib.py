@@ -0,0 +1,308 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/progressLib.py @brief [ FILE   ] - Copy progress module.
+## @package mMecoRelease.progressLib    @brief [ MODULE ] - Copy progress module.
+#
+#  Progress is rendered at a limited rate instead of displaying a line for each copied file, the
+#  file list can be written to a log file instead.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORTS
+# ----------------------------------------------------------------------------------------------------
+import os
+import sys
+import time
+
+import mMecoRelease.manifestLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ float ] - Minimum seconds between two renders on a terminal, where the line is redrawn in place.
+TERMINAL_REFRESH_INTERVAL = 0.25
+
+## [ float ] - Minimum seconds between two renders on other streams, such as CI logs, where each render is a new line.
+LOG_REFRESH_INTERVAL      = 10.0
+
+## [ int ] - Size in bytes the file log buffers before writing.
+FILE_LOG_BUFFER_SIZE      = 256 * 1024
+
+#
+## @brief Get human readable representation of given duration.
+#
+#  @param seconds [ float | None | in  ] - Duration in seconds.
+#
+#  @exception N/A
+#
+#  @return str - Value, such as 1:05 or 2:01:05.
+def formatDuration(seconds):
+
+    minutes, seconds = divmod(int(seconds + 0.5), 60)
+    hours, minutes   = divmod(minutes, 60)
+
+    if hours:
+        return '{}:{:02d}:{:02d}'.format(hours, minutes, seconds)
+
+    return '{}:{:02d}'.format(minutes, seconds)
+
+#
+## @brief [ CLASS ] - Class that appends lines to a log file in large writes.
+#
+#  Each flush is a single append of whole lines, so processes releasing packages concurrently
+#  can share the same log file without splitting each other's lines.
+class FileLog(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param path [ str | None | in  ] - Path of the log file, it's created if it doesn't exist.
+    #
+    #  @exception IOError - If the file can not be opened.
+    #
+    #  @return None - None.
+    def __init__(self, path):
+
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        ## [ int ] - File descriptor.
+        self._fd           = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+        ## [ list of bytes ] - Lines waiting to be written.
+        self._buffer       = []
+
+        ## [ int ] - Size of the buffered lines in bytes.
+        self._bufferedSize = 0
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Add a line.
+    #
+    #  @param line [ str | None | in  ] - Line without line ending.
+    #
+    #  @exception OSError - If buffered lines can not be written.
+    #
+    #  @return None - None.
+    def write(self, line):
+
+        line = line + '\n'
+        if not isinstance(line, bytes):
+            line = line.encode('utf-8')
+
+        self._buffer.append(line)
+        self._bufferedSize += len(line)
+
+        if self._bufferedSize >= FILE_LOG_BUFFER_SIZE:
+            self.flush()
+
+    #
+    ## @brief Write buffered lines.
+    #
+    #  @exception OSError - If lines can not be written.
+    #
+    #  @return None - None.
+    def flush(self):
+
+        if not self._buffer:
+            return
+
+        content            = b''.join(self._buffer)
+        self._buffer       = []
+        self._bufferedSize = 0
+
+        while content:
+            content = content[os.write(self._fd, content):]
+
+    #
+    ## @brief Write buffered lines and close the file.
+    #
+    #  @exception OSError - If lines can not be written.
+    #
+    #  @return None - None.
+    def close(self):
+
+        if self._fd is None:
+            return
+
+        try:
+            self.flush()
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+#
+## @brief [ CLASS ] - Class that renders files done, bytes done, throughput and ETA of a copy.
+class CopyProgress(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param fileCount [ int  | None | in  ] - Number of files to copy.
+    #  @param size      [ int  | None | in  ] - Size of the files to copy in bytes.
+    #  @param stream    [ file | None | in  ] - Stream progress is rendered to, sys.stdout if None.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self, fileCount, size, stream=None):
+
+        ## [ int ] - Number of files to copy.
+        self._fileCount     = fileCount
+
+        ## [ int ] - Size of the files to copy in bytes.
+        self._size          = size
+
+        ## [ file ] - Stream progress is rendered to.
+        self._stream        = stream if stream else sys.stdout
+
+        ## [ bool ] - Whether the stream is a terminal, where the line is redrawn in place.
+        self._isTerminal    = hasattr(self._stream, 'isatty') and self._stream.isatty()
+
+        ## [ float ] - Minimum seconds between two renders.
+        self._interval      = TERMINAL_REFRESH_INTERVAL if self._isTerminal else LOG_REFRESH_INTERVAL
+
+        ## [ int ] - Number of files done.
+        self._doneFileCount = 0
+
+        ## [ int ] - Size of the files done in bytes.
+        self._doneSize      = 0
+
+        ## [ float ] - Start time.
+        self._startTime     = time.time()
+
+        ## [ float ] - Time of the last render.
+        self._renderTime    = self._startTime
+
+        ## [ int ] - Length of the last line rendered on a terminal.
+        self._lineLength    = 0
+
+    #
+    ## @brief Render progress.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def _render(self):
+
+        line = 'Copying files {}/{}, {}/{}, {}/s, ETA {}'.format(self._doneFileCount,
+                                                                  self._fileCount,
+                                                                  mMecoRelease.manifestLib.formatSize(self._doneSize),
+                                                                  mMecoRelease.manifestLib.formatSize(self._size),
+                                                                  mMecoRelease.manifestLib.formatSize(int(self.throughput())),
+                                                                  formatDuration(self.eta()) if self.eta() is not None else '-')
+
+        try:
+            if self._isTerminal:
+                self._stream.write('\r{}{}'.format(line, ' ' * max(0, self._lineLength - len(line))))
+                self._lineLength = len(line)
+            else:
+                self._stream.write('{}\n'.format(line))
+
+            self._stream.flush()
+        except (IOError, ValueError):
+            # Progress is informative, a closed or broken stream must not fail the release
+            pass
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Get throughput.
+    #
+    #  @exception N/A
+    #
+    #  @return float - Bytes per second.
+    def throughput(self):
+
+        elapsed = time.time() - self._startTime
+
+        return self._doneSize / elapsed if elapsed > 0 else 0.0
+
+    #
+    ## @brief Get estimated time left.
+    #
+    #  @exception N/A
+    #
+    #  @return float - Seconds.
+    #  @return None  - If nothing has been copied yet.
+    def eta(self):
+
+        throughput = self.throughput()
+        if not throughput:
+            return None
+
+        return max(0, self._size - self._doneSize) / throughput
+
+    #
+    ## @brief Add a copied file and render progress if enough time has passed since the last render.
+    #
+    #  @param size [ int | None | in  ] - Size of the file in bytes.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def update(self, size):
+
+        self._doneFileCount += 1
+        self._doneSize      += size
+
+        currentTime = time.time()
+        if currentTime - self._renderTime < self._interval:
+            return
+
+        self._renderTime = currentTime
+        self._render()
+
+    #
+    ## @brief Clear the progress line.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Summary of the copy.
+    def finish(self):
+
+        if self._isTerminal and self._lineLength:
+            try:
+                self._stream.write('\r{}\r'.format(' ' * self._lineLength))
+                self._stream.flush()
+            except (IOError, ValueError):
+                pass
+
+            self._lineLength = 0
+
+        return '{} files, {} have been copied in {:.1f} s, {}/s'.format(self._doneFileCount,
+                                                                        mMecoRelease.manifestLib.formatSize(self._doneSize),
+                                                                        time.time() - self._startTime,
+                                                                        mMecoRelease.manifestLib.formatSize(int(self.throughput())))
@@ -26,7 +26,15 @@
 # IMPORT
 # ----------------------------------------------------------------------------------------------------
 import os
-import argparse
+import sys
+import time
+import traceback
+import multiprocessing
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
 
 import mCore.displayLib
 import mCore.pythonVersionLib
@@ -35,7 +43,14 @@ import mFileSystem.directoryLib
 
 import mMecoPackage.packageLib
 
+import mMecoRelease.catalogLib
+import mMecoRelease.cliLib
+import mMecoRelease.dependencyGraphLib
+import mMecoRelease.fingerprintLib
+import mMecoRelease.metricsLib
+import mMecoRelease.outboxLib
 import mMecoRelease.releaseCnt
+import mMecoRelease.traceLib
 
 import mProcess.dataLib
 
@@ -47,16 +62,450 @@ import mMecoSettings.envVariablesLib
 # CODE
 # ----------------------------------------------------------------------------------------------------
 #
-## @brief Check a package.
+## @brief [ CLASS ] - Class that holds the outcome of running a release container of a package.
+class _PackageResult(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param packagePath [ str | None | in  ] - Root of the package.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self, packagePath):
+
+        ## [ str ] - Root of the package.
+        self.packagePath        = packagePath
+
+        ## [ bool ] - Whether the container has succeeded.
+        self.result             = False
+
+        ## [ mMecoRelease.releaseCnt.ReleaseContext ] - Context to be reused by the release pass.
+        self.context            = None
+
+        ## [ list of tuple ] - Names of failed dependencies and whether they are ignorable.
+        self.failedDependencies = []
+
+        ## [ str ] - Error that prevented the container from running.
+        self.error              = None
+
+        ## [ float ] - Elapsed time in seconds.
+        self.elapsed            = 0.0
+
+        ## [ str ] - Captured output, empty unless run in a worker process.
+        self.output             = ''
+
+        ## [ list of dict ] - Trace events, empty unless traced.
+        self.traceEvents        = []
+
+        ## [ bool ] - Whether the package has been released.
+        self.published          = False
+
+#
+## @brief Run release container of a package.
+#
+#  @param packagePath       [ str                                    | None  | in  ] - Root of the package.
+#  @param runLevel          [ mProcess.dataLib.RunLevel              | None  | in  ] - Run level.
+#  @param raiseExceptions   [ bool                                   | False | in  ] - Whether to raise exceptions.
+#  @param context           [ mMecoRelease.releaseCnt.ReleaseContext | None  | in  ] - Context resolved by a previous pass.
+#  @param traceLevel        [ int                                    | 0     | in  ] - Trace level, see mMecoRelease.traceLib.
+#  @param archive           [ bool                                   | False | in  ] - Whether to write release files into an archive as well.
+#  @param progress          [ bool                                   | False | in  ] - Whether to render copy progress instead of displaying each copied file.
+#  @param fileLogPath       [ str                                    | None  | in  ] - Log file copied files are appended to.
+#  @param notificationBatch [ str                                    | None  | in  ] - Outbox batch notification is queued in.
+#
+#  @exception N/A
+#
+#  @return mMecoRelease.releaseCmd._PackageResult - Result.
+def _runRelease(packagePath, runLevel, raiseExceptions=False, context=None, traceLevel=mMecoRelease.traceLib.LEVEL_NONE, archive=False, progress=False, fileLogPath=None, notificationBatch=None):
+
+    result    = _PackageResult(packagePath)
+    startTime = time.time()
+
+    # Tracer is created here rather than passed in, so events recorded by worker processes are returned with the result
+    _tracer   = mMecoRelease.traceLib.Tracer(traceLevel) if traceLevel else None
+
+    _releaseData    = mProcess.dataLib.Data(runLevel=runLevel,
+                                            raiseExceptions=raiseExceptions)
+    _packageRelease = mMecoRelease.releaseCnt.Release(data=_releaseData,
+                                                      packageRoot=packagePath,
+                                                      context=context,
+                                                      tracer=_tracer,
+                                                      archive=archive,
+                                                      progress=progress,
+                                                      fileLogPath=fileLogPath,
+                                                      notificationBatch=notificationBatch)
+
+    result.result             = bool(_packageRelease.run())
+    result.context            = _packageRelease.context()
+    result.failedDependencies = list(_releaseData['failedDependencies'])
+    result.error              = _releaseData['containerError']
+    result.published          = _releaseData['published']
+    result.elapsed            = time.time() - startTime
+    result.traceEvents        = _tracer.events() if _tracer else []
+
+    return result
+
+#
+## @brief Run release container of a package in a worker process and capture its output.
+#
+#  @param arguments [ tuple | None | in  ] - Arguments of _runRelease function.
+#
+#  @exception N/A
+#
+#  @return mMecoRelease.releaseCmd._PackageResult - Result.
+def _runReleaseCaptured(arguments):
+
+    output = StringIO()
+    stdout = sys.stdout
+    stderr = sys.stderr
+
+    sys.stdout = output
+    sys.stderr = output
+
+    try:
+        result = _runRelease(*arguments)
+    except Exception as error:
+        traceback.print_exc()
+        result       = _PackageResult(arguments[0])
+        result.error = str(error)
+    finally:
+        sys.stdout = stdout
+        sys.stderr = stderr
+
+    result.output = output.getvalue()
+
+    return result
+
+#
+## @brief Run release containers of packages and yield their results.
+#
+#  Containers are run by a pool of worker processes if more than one job is requested,
+#  output of each package is captured in its result so outputs don't interleave.
+#
+#  @param argumentsList [ list of tuple | None | in  ] - Arguments of _runRelease function for each package.
+#  @param jobs          [ int           | 1    | in  ] - Number of worker processes.
+#  @param ordered       [ bool          | True | in  ] - Whether to yield results in given order rather than as they complete.
+#
+#  @exception N/A
+#
+#  @return generator - mMecoRelease.releaseCmd._PackageResult instances.
+def _iterReleaseResults(argumentsList, jobs=1, ordered=True):
+
+    if jobs < 2 or len(argumentsList) < 2:
+        for arguments in argumentsList:
+            yield _runRelease(*arguments)
+        return
+
+    pool = multiprocessing.Pool(min(jobs, len(argumentsList)))
+
+    try:
+        if ordered:
+            results = pool.imap(_runReleaseCaptured, argumentsList)
+        else:
+            results = pool.imap_unordered(_runReleaseCaptured, argumentsList)
+
+        for result in results:
+            yield result
+
+        pool.close()
+
+    finally:
+        pool.terminate()
+        pool.join()
+
+#
+## @brief Get release paths of the environment.
+#
+#  @exception N/A
+#
+#  @return list of str - Existing paths, without duplicates.
+def _getReleasePaths():
+
+    paths = []
+
+    for key in [mMecoSettings.envVariablesLib.MECO_PROJECT_INTERNAL_PACKAGES_PATH,
+                mMecoSettings.envVariablesLib.MECO_PROJECT_EXTERNAL_PACKAGES_PATH,
+                mMecoSettings.envVariablesLib.MECO_MASTER_PROJECT_INTERNAL_PACKAGES_PATH,
+                mMecoSettings.envVariablesLib.MECO_MASTER_PROJECT_EXTERNAL_PACKAGES_PATH]:
+
+        path = os.environ.get(key)
+        if path and os.path.isdir(path) and not os.path.normpath(path) in [os.path.normpath(p) for p in paths]:
+            paths.append(path)
+
+    return paths
+
+#
+## @brief Get names of the packages released to the release paths of the environment.
+#
+#  Release catalog of a path is used if it exists, the path is listed otherwise.
+#
+#  @exception N/A
+#
+#  @return set of str - Names.
+def _getReleasedPackageNames():
+
+    names = set()
+
+    for path in _getReleasePaths():
+
+        _catalog = mMecoRelease.catalogLib.ReleaseCatalog(path)
+        if _catalog.exists():
+            try:
+                names.update(_catalog.getPackageNames())
+                continue
+            except mMecoRelease.catalogLib.sqlite3.Error:
+                pass
+
+        names.update([name for name in os.listdir(path) if not name.startswith('.') and os.path.isdir(os.path.join(path, name))])
+
+    return names
+
+#
+## @brief Get packages that have changed since they have been successfully checked or released.
+#
+#  @param packagePathList [ list of str | None | in  ] - Roots of the packages.
+#  @param kinds           [ list of str | None | in  ] - Fingerprint kinds to compare with, see mMecoRelease.fingerprintLib.
+#
+#  @exception N/A
+#
+#  @return list of str - Roots of the changed packages, in given order.
+def _getChangedPackagePaths(packagePathList, kinds):
+
+    _fingerprintCache = mMecoRelease.fingerprintLib.FingerprintCache()
+    _package          = mMecoPackage.packageLib.Package()
+    changedPathList   = []
+
+    for packagePath in packagePathList:
+
+        if not _package.setPackage(packagePath):
+            continue
+
+        if not _fingerprintCache.matches(kinds, packagePath, mMecoRelease.fingerprintLib.getPackageFingerprint(_package)):
+            changedPathList.append(packagePath)
+
+    return changedPathList
+
+#
+## @brief Record fingerprints of the packages that have succeeded.
+#
+#  @param kind    [ str                                             | None | in  ] - Fingerprint kind, see mMecoRelease.fingerprintLib.
+#  @param results [ list of mMecoRelease.releaseCmd._PackageResult | None | in  ] - Results.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def _recordFingerprints(kind, results):
+
+    _fingerprintCache = mMecoRelease.fingerprintLib.FingerprintCache()
+
+    for result in results:
+        if result.result and result.context:
+            _fingerprintCache.set(kind, result.packagePath, result.context.fingerprint())
+
+    if not _fingerprintCache.save():
+        mCore.displayLib.Display.displayWarning('Fingerprint cache could not be saved, --changed-only will not skip these packages.')
+
+#
+## @brief Get trace level requested by parsed arguments.
+#
+#  @param args [ argparse.Namespace | None | in  ] - Parsed arguments.
+#
+#  @exception N/A
+#
+#  @return int - Trace level, see mMecoRelease.traceLib.
+def _getTraceLevel(args):
+
+    if not args.trace:
+        return mMecoRelease.traceLib.LEVEL_NONE
+
+    return mMecoRelease.traceLib.LEVEL_FILES if args.trace_files else mMecoRelease.traceLib.LEVEL_STAGES
+
+#
+## @brief Write trace events of the packages to a file.
+#
+#  @param path    [ str                                             | None | in  ] - Path of the trace file, nothing is written if None.
+#  @param results [ list of mMecoRelease.releaseCmd._PackageResult | None | in  ] - Results.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def _writeTrace(path, results):
+
+    if not path:
+        return
+
+    events = []
+    for result in results:
+        events.extend(result.traceEvents)
+
+    try:
+        mMecoRelease.traceLib.writeTrace(path, events)
+    except (IOError, OSError) as error:
+        mCore.displayLib.Display.displayFailure('Trace could not be written: {}'.format(error))
+        return
+
+    mCore.displayLib.Display.displaySuccess('Trace has been written to: {}'.format(path))
+
+#
+## @brief Merge metrics of the packages into a metrics file.
+#
+#  @param path        [ str                                             | None | in  ] - Path of the metrics file, nothing is written if None.
+#  @param packageRuns [ list of tuple                                   | None | in  ] - Name of each package, whether it is external and its result.
 #
 #  @exception N/A
 #
 #  @return None - None.
-def check():
+def _saveMetrics(path, packageRuns):
+
+    if not path:
+        return
+
+    mMecoRelease.metricsLib.savePackageRuns(path,
+                                            os.environ.get(mMecoSettings.envVariablesLib.MECO_PROJECT_NAME),
+                                            [(name, isExternal, result.published, result.result, result.failedDependencies, result.error, result.traceEvents)
+                                             for name, isExternal, result in packageRuns])
+
+#
+## @brief Display a progress line, overwriting the previous one.
+#
+#  @param message [ str | None | in  ] - Message.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def _displayProgress(message):
+
+    if not sys.stdout.isatty():
+        return
+
+    sys.stdout.write('\r{}\033[K'.format(message))
+    sys.stdout.flush()
+
+#
+## @brief Display summary table of checked packages.
+#
+#  @param results [ list of mMecoRelease.releaseCmd._PackageResult | None | in  ] - Results in display order.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def _displayCheckSummary(results):
+
+    rows = []
 
-    if not os.environ.get(mMecoSettings.envVariablesLib.MECO_DEVELOPMENT_PACKAGES_PATH):
-        mCore.displayLib.Display.displayFailure('You must initialize development environment to check a development package for release.')
+    for result in results:
+
+        failures = ['{}{}'.format(' '.join(name.split()), ' (ignored)' if isIgnorable else '') for name, isIgnorable in result.failedDependencies]
+        if result.error:
+            failures.insert(0, result.error.strip().splitlines()[-1])
+
+        rows.append((os.path.basename(os.path.normpath(result.packagePath)),
+                     'PASS' if result.result else 'FAIL',
+                     '{:.2f}s'.format(result.elapsed),
+                     ', '.join(failures)))
+
+    header = ('Package', 'Result', 'Time', 'Failed Dependencies')
+    widths = [max([len(row[i]) for row in rows + [header]]) for i in range(3)]
+    line   = '{{:<{}}}  {{:<{}}}  {{:>{}}}  {{}}'.format(*widths)
+
+    sys.stdout.write('{}\n'.format(line.format(*header)))
+    sys.stdout.write('{}\n'.format(line.format(*['-' * width for width in widths] + ['-' * len(header[3])])))
+
+    for row in rows:
+        sys.stdout.write('{}\n'.format(line.format(*row).rstrip()))
+
+    sys.stdout.flush()
+
+#
+## @brief Display status line of a package checked in watch mode.
+#
+#  @param result  [ mMecoRelease.releaseCmd._PackageResult | None | in  ] - Result.
+#  @param watcher [ mMecoRelease.watchLib.PackageWatcher   | None | in  ] - Watcher of the package.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def _displayWatchStatus(result, watcher):
+
+    failures = [' '.join(name.split()) for name, isIgnorable in result.failedDependencies if not isIgnorable]
+    if result.error:
+        failures.insert(0, result.error.strip().splitlines()[-1])
+
+    status = '[{}] {} in {:.2f}s{}'.format(time.strftime('%H:%M:%S'),
+                                           'PASS' if result.result else 'FAIL',
+                                           result.elapsed,
+                                           ': {}'.format(', '.join(failures)) if failures else '')
+
+    if result.result:
+        mCore.displayLib.Display.displaySuccess(status)
+    else:
+        mCore.displayLib.Display.displayFailure(status)
+
+    sys.stdout.write('Watching {} for changes{}, press Ctrl+C to stop.\n'.format(result.packagePath,
+                                                                               '' if watcher.usesInotify() else ' by polling'))
+    sys.stdout.flush()
+
+#
+## @brief Check a package whenever its release files change.
+#
+#  Context of the previous check is reused, so the package is scanned again only if its release files
+#  have been added or removed. Pre dependencies are replayed from mMecoRelease.resultCacheLib while
+#  their cache keys haven't changed, so a change of release files only runs the ones that depend on
+#  release files, such as the release plan, or declare no cache keys.
+#
+#  @param packagePath [ str                | None | in  ] - Root of the package.
+#  @param args        [ argparse.Namespace | None | in  ] - Parsed arguments.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def _watch(packagePath, args):
+
+    import mMecoRelease.watchLib
+
+    _watcher = mMecoRelease.watchLib.PackageWatcher(packagePath)
+    context  = None
+
+    try:
+        while True:
+
+            if sys.stdout.isatty():
+                sys.stdout.write('\033[2J\033[H')
+
+            result  = _runRelease(packagePath, mProcess.dataLib.RunLevel.kPreDependenciesOnly, args.raise_exceptions, context=context, traceLevel=_getTraceLevel(args))
+            context = result.context
+
+            _recordFingerprints(mMecoRelease.fingerprintLib.KIND_CHECK, [result])
+            _writeTrace(args.trace, [result])
+            _displayWatchStatus(result, _watcher)
+
+            # Changes outside the directories release files are scanned from, such as build outputs, are skipped
+            changedPaths = _watcher.wait(args.debounce)
+            while context and not context.isAffectedBy(changedPaths):
+                changedPaths = _watcher.wait(args.debounce)
+
+    except KeyboardInterrupt:
         mCore.displayLib.Display.displayBlankLine()
+
+    finally:
+        _watcher.close()
+
+#
+## @brief Check a package.
+#
+#  @param args [ argparse.Namespace | None | in  ] - Parsed arguments, command line is parsed if None.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def check(args=None):
+
+    if not mMecoRelease.cliLib.getDevelopmentPackagesPath('check a development package for release', True):
         return
 
     currentPath = os.getcwd()
@@ -67,35 +516,29 @@ def check():
         mCore.displayLib.Display.displayBlankLine()
         return
 
-    _parser = argparse.ArgumentParser(description='Check a package to determine whether it contains errors before releasing it.')
+    _args = args if args else mMecoRelease.cliLib.getCheckParser().parse_args()
 
-    _parser.add_argument('-re',
-                         '--raise-exceptions',
-                         help='Whether to raise exceptions. Default value is False.',
-                         default=False,
-                         required=False,
-                         action='store_true')
-
-    _args = _parser.parse_args()
+    if _args.watch:
+        _watch(currentPath, _args)
+        return
 
-    _releaseData    = mProcess.dataLib.Data(runLevel=mProcess.dataLib.RunLevel.kPreDependenciesOnly,
-                                            raiseExceptions=_args.raise_exceptions)
-    _packageRelease = mMecoRelease.releaseCnt.Release(data=_releaseData, packageRoot=currentPath)
+    result = _runRelease(currentPath, mProcess.dataLib.RunLevel.kPreDependenciesOnly, _args.raise_exceptions, traceLevel=_getTraceLevel(_args))
 
-    _packageRelease.run()
+    _recordFingerprints(mMecoRelease.fingerprintLib.KIND_CHECK, [result])
+    _writeTrace(_args.trace, [result])
 
 #
 ## @brief Check all packages in development package environment.
 #
+#  @param args [ argparse.Namespace | None | in  ] - Parsed arguments, command line is parsed if None.
+#
 #  @exception N/A
 #
 #  @return None - None.
-def checkAll():
+def checkAll(args=None):
 
-    developmentPackagePath = os.environ.get(mMecoSettings.envVariablesLib.MECO_DEVELOPMENT_PACKAGES_PATH)
+    developmentPackagePath = mMecoRelease.cliLib.getDevelopmentPackagesPath('check all development packages for release', True)
     if not developmentPackagePath:
-        mCore.displayLib.Display.displayFailure('You must initialize development environment to check all development packages for release.')
-        mCore.displayLib.Display.displayBlankLine()
         return
 
     if not os.path.isdir(developmentPackagePath):
@@ -110,61 +553,129 @@ def checkAll():
         mCore.displayLib.Display.displayBlankLine()
         return
 
-    _parser = argparse.ArgumentParser(description='Check all packages to determine whether they contain errors before releasing them.')
+    _args = args if args else mMecoRelease.cliLib.getCheckAllParser().parse_args()
 
-    _parser.add_argument('-re',
-                         '--raise-exceptions',
-                         help='Whether to raise exceptions. Default value is False.',
-                         default=False,
-                         required=False,
-                         action='store_true')
+    _package        = mMecoPackage.packageLib.Package()
+    checkPathList   = [packagePath for packagePath in packagePathList if _package.setPackage(packagePath)]
 
-    _args = _parser.parse_args()
+    unchangedCount  = 0
+    if _args.changed_only:
+        changedPathList = _getChangedPackagePaths(checkPathList, [mMecoRelease.fingerprintLib.KIND_CHECK,
+                                                                  mMecoRelease.fingerprintLib.KIND_RELEASE])
+        unchangedCount  = len(checkPathList) - len(changedPathList)
+        checkPathList   = changedPathList
 
-    _package     = mMecoPackage.packageLib.Package()
-    packageCount = 0
+        if unchangedCount:
+            sys.stdout.write('{} unchanged packages are skipped.\n'.format(unchangedCount))
 
-    for packagePath in packagePathList:
+    if _args.jobs < 2:
 
-        if not _package.setPackage(packagePath):
-            continue
+        results = []
+        for packagePath in checkPathList:
+            results.append(_runRelease(packagePath, mProcess.dataLib.RunLevel.kPreDependenciesOnly, _args.raise_exceptions, traceLevel=_getTraceLevel(_args)))
+
+        _recordFingerprints(mMecoRelease.fingerprintLib.KIND_CHECK, results)
+        _writeTrace(_args.trace, results)
+
+        mCore.displayLib.Display.displaySuccess('{} packages have been checked'.format(len(checkPathList)))
+        mCore.displayLib.Display.displayBlankLine()
+        return
+
+    startTime    = time.time()
+    results      = {}
+    failureCount = 0
+
+    argumentsList = [(packagePath, mProcess.dataLib.RunLevel.kPreDependenciesOnly, _args.raise_exceptions, None, _getTraceLevel(_args))
+                     for packagePath in checkPathList]
+
+    for result in _iterReleaseResults(argumentsList, _args.jobs, ordered=False):
 
-        _releaseData    = mProcess.dataLib.Data(runLevel=mProcess.dataLib.RunLevel.kPreDependenciesOnly,
-                                                raiseExceptions=_args.raise_exceptions)
-        _packageRelease = mMecoRelease.releaseCnt.Release(data=_releaseData, packageRoot=packagePath)
-        _packageRelease.run()
+        results[result.packagePath] = result
+        failureCount               += 0 if result.result else 1
 
-        packageCount += 1
+        _displayProgress('[{}/{}] {} failed, {:.1f}s elapsed, last checked: {}'.format(len(results),
+                                                                                       len(checkPathList),
+                                                                                       failureCount,
+                                                                                       time.time() - startTime,
+                                                                                       os.path.basename(os.path.normpath(result.packagePath))))
+
+    _displayProgress('')
+
+    results = [results[packagePath] for packagePath in checkPathList]
+
+    _recordFingerprints(mMecoRelease.fingerprintLib.KIND_CHECK, results)
+    _writeTrace(_args.trace, results)
+
+    # Output of failed packages is displayed so the reason of each failure can be seen
+    for result in results:
+        if not result.result:
+            sys.stdout.write(result.output)
+
+    mCore.displayLib.Display.displayBlankLine()
+    _displayCheckSummary(results)
+    mCore.displayLib.Display.displayBlankLine()
+
+    if failureCount:
+        mCore.displayLib.Display.displayFailure('{} of {} packages have failed, checked in {:.1f}s'.format(failureCount,
+                                                                                                         len(checkPathList),
+                                                                                                         time.time() - startTime))
+    else:
+        mCore.displayLib.Display.displaySuccess('{} packages have been checked in {:.1f}s'.format(len(checkPathList),
+                                                                                                 time.time() - startTime))
 
-    mCore.displayLib.Display.displaySuccess('{} packages have been checked'.format(packageCount))
     mCore.displayLib.Display.displayBlankLine()
 
 #
 ## @brief Release a package.
 #
+#  @param args [ argparse.Namespace | None | in  ] - Parsed arguments, command line is parsed if None.
+#
 #  @exception N/A
 #
 #  @return None - None.
-def release():
+def release(args=None):
 
-    if not os.environ.get(mMecoSettings.envVariablesLib.MECO_DEVELOPMENT_PACKAGES_PATH):
-        mCore.displayLib.Display.displayFailure('You must initialize development environment to release a development package.')
+    if not mMecoRelease.cliLib.getDevelopmentPackagesPath('release a development package'):
         return
 
-    mMecoRelease.releaseCnt.Release.runInCommandLine()
+    _args = args if args else mMecoRelease.cliLib.getReleaseParser().parse_args()
+
+    traceLevel      = _getTraceLevel(_args)
+    _tracer         = mMecoRelease.traceLib.Tracer(traceLevel) if traceLevel else None
+
+    _releaseData    = mProcess.dataLib.Data(raiseExceptions=_args.raise_exceptions)
+    _packageRelease = mMecoRelease.releaseCnt.Release(data=_releaseData,
+                                                      packageRoot=os.getcwd(),
+                                                      jobs=_args.jobs,
+                                                      dedup=_args.dedup,
+                                                      archive=_args.archive,
+                                                      progress=_args.progress,
+                                                      fileLogPath=_args.file_log,
+                                                      resume=_args.resume,
+                                                      tracer=_tracer,
+                                                      metricsPath=_args.metrics or mMecoRelease.metricsLib.getDefaultMetricsPath())
+
+    result             = _PackageResult(os.getcwd())
+    result.result      = bool(_packageRelease.run())
+    result.context     = _packageRelease.context()
+    result.traceEvents = _tracer.events() if _tracer else []
+
+    _recordFingerprints(mMecoRelease.fingerprintLib.KIND_RELEASE, [result])
+    _writeTrace(_args.trace, [result])
 
 
 #
 ## @brief Release all packages in development package environment.
 #
+#  @param args [ argparse.Namespace | None | in  ] - Parsed arguments, command line is parsed if None.
+#
 #  @exception N/A
 #
 #  @return None - None.
-def releaseAll():
+def releaseAll(args=None):
 
-    developmentPackagePath = os.environ.get(mMecoSettings.envVariablesLib.MECO_DEVELOPMENT_PACKAGES_PATH)
+    developmentPackagePath = mMecoRelease.cliLib.getDevelopmentPackagesPath('release all development packages')
     if not developmentPackagePath:
-        mCore.displayLib.Display.displayFailure('You must initialize development environment to release all development packages.')
         return
 
     if not os.path.isdir(developmentPackagePath):
@@ -183,10 +694,69 @@ def releaseAll():
     internalPackagesPath = os.environ.get(mMecoSettings.envVariablesLib.MECO_PROJECT_INTERNAL_PACKAGES_PATH, None)
     externalPackagesPath = os.environ.get(mMecoSettings.envVariablesLib.MECO_PROJECT_EXTERNAL_PACKAGES_PATH, None)
 
+    _args = args if args else mMecoRelease.cliLib.getReleaseAllParser().parse_args()
+
+    unchangedCount = 0
+    if _args.changed_only:
+        changedPathList = _getChangedPackagePaths(packagePathList, [mMecoRelease.fingerprintLib.KIND_RELEASE])
+        unchangedCount  = len([packagePath for packagePath in packagePathList
+                               if mMecoPackage.packageLib.Package.isRootOfAPackage(packagePath)]) - len(changedPathList)
+        packagePathList = changedPathList
+
+        if not packagePathList:
+            mCore.displayLib.Display.displaySuccess('No package has changed since it has been released, {} packages are skipped.'.format(unchangedCount))
+            return
+
+    _package           = mMecoPackage.packageLib.Package()
+    releasePackageList = []
+
+    for packagePath in packagePathList:
+
+        if not _package.setPackage(packagePath):
+            continue
+
+        releasePackageList.append((packagePath, _package.name(), _package.isExternal()))
+
+    # Packages are released in waves of packages that don't depend on each other, problems
+    # in the dependency graph are reported before anything is released
+    dependencies      = {}
+    dependencyErrors  = []
+
+    for packagePath, name, isExternal in releasePackageList:
+        try:
+            dependencies[name] = mMecoRelease.dependencyGraphLib.getDependentPackages(packagePath, name)
+        except ValueError as error:
+            dependencies[name] = []
+            dependencyErrors.append(str(error))
+
+    _dependencyGraph = mMecoRelease.dependencyGraphLib.DependencyGraph(dependencies)
+
+    unknownDependencies = _dependencyGraph.getUnknownDependencies(_getReleasedPackageNames())
+    dependencyCycles    = _dependencyGraph.getCycles()
+
+    for error in dependencyErrors:
+        mCore.displayLib.Display.displayFailure('Dependent packages can not be read: {}'.format(error))
+
+    for name in sorted(unknownDependencies.keys()):
+        mCore.displayLib.Display.displayFailure('Package {} depends on unknown packages: {}'.format(name, ', '.join(unknownDependencies[name])))
+
+    for cycle in dependencyCycles:
+        mCore.displayLib.Display.displayFailure('Dependency cycle: {}'.format(' -> '.join(cycle)))
+
+    if dependencyErrors or unknownDependencies or dependencyCycles:
+        mCore.displayLib.Display.displayFailure('Release all has been aborted due to dependency errors.\n', startNewLine=True)
+        return
+
+    releaseWaves = _dependencyGraph.getWaves()
+
     question = 'Do you want to release all packages in your development environment?\n\n'
     question = '{}Development Packages Path      : {}\n\n'.format(question, developmentPackagePath)
     question = '{}Project Internal Packages Path : {}\n\n'.format(question, internalPackagesPath)
     question = '{}Project External Packages Path : {}\n\n'.format(question, externalPackagesPath)
+    if _args.changed_only:
+        question = '{}Packages To Release            : {} ({} unchanged packages are skipped)\n\n'.format(question,
+                                                                                                             len(releasePackageList),
+                                                                                                             unchangedCount)
     question = '{}Answer (YES, NO): \n'.format(question)
     mCore.displayLib.Display.displayWarning(question)
 
@@ -200,7 +770,6 @@ def releaseAll():
         mCore.displayLib.Display.displayFailure('Release all has been aborted.\n', startNewLine=True)
         return
 
-    _package                  = mMecoPackage.packageLib.Package()
     preDependencyResult       = True
 
     internalPackageCount                = 0
@@ -209,26 +778,51 @@ def releaseAll():
     externalPackageCount                = 0
     externalPreDependencyFailureCount   = 0
 
-    for packagePath in packagePathList:
+    # Metrics are derived from trace events, so packages are traced if metrics are written
+    metricsPath          = _args.metrics or mMecoRelease.metricsLib.getDefaultMetricsPath()
+    traceLevel           = _getTraceLevel(_args) or (mMecoRelease.traceLib.LEVEL_STAGES if metricsPath else mMecoRelease.traceLib.LEVEL_NONE)
+    packageRuns          = []
+    preDependencyResults = _iterReleaseResults([(packagePath, mProcess.dataLib.RunLevel.kPreDependenciesOnly, False, None, traceLevel)
+                                                for packagePath, name, isExternal in releasePackageList],
+                                               _args.jobs)
 
-        if not _package.setPackage(packagePath):
-            continue
+    # Contexts resolved by the pre-dependency pass are reused by the release pass
+    releaseContexts     = {}
+    checkResults        = []
 
-        _releaseData    = mProcess.dataLib.Data(runLevel=mProcess.dataLib.RunLevel.kPreDependenciesOnly)
-        _packageRelease = mMecoRelease.releaseCnt.Release(data=_releaseData, packageRoot=packagePath)
+    # zip stops before exhausting the generator, it is closed so the worker pool is shut down before the release pass
+    try:
+        for (packagePath, name, isExternal), preDependencyResultItem in zip(releasePackageList, preDependencyResults):
 
-        if not _packageRelease.run():
-            preDependencyResult = False
+            if preDependencyResultItem.output:
+                sys.stdout.write(preDependencyResultItem.output)
+                sys.stdout.flush()
 
-        if _package.isExternal():
-            externalPackageCount                += 1
-            externalPreDependencyFailureCount   += 1
-        else:
-            internalPackageCount                += 1
-            internalPreDependencyFailureCount   += 1
+            result                       = preDependencyResultItem.result
+            releaseContexts[packagePath] = preDependencyResultItem.context
+            checkResults.append(preDependencyResultItem)
+            packageRuns.append((name, isExternal, preDependencyResultItem))
+
+            if not result:
+                preDependencyResult = False
+
+            if isExternal:
+                externalPackageCount                += 1
+                externalPreDependencyFailureCount   += 0 if result else 1
+            else:
+                internalPackageCount                += 1
+                internalPreDependencyFailureCount   += 0 if result else 1
+
+    finally:
+        preDependencyResults.close()
+
+    _recordFingerprints(mMecoRelease.fingerprintLib.KIND_CHECK, checkResults)
 
     if not preDependencyResult:
 
+        _writeTrace(_args.trace, checkResults)
+        _saveMetrics(metricsPath, packageRuns)
+
         mCore.displayLib.Display.displayBlankLine()
         
         if internalPackageCount:
@@ -245,27 +839,129 @@ def releaseAll():
     internalPackageCount = 0
     externalPackageCount = 0
 
-    _packageRelease = None
+    releasePackages      = dict([(name, (packagePath, isExternal)) for packagePath, name, isExternal in releasePackageList])
+    failedPackageNames   = set()
+    skippedPackageNames  = set()
+    releaseResults       = []
+
+    # Notifications are held in a batch and sent as one digest once all packages are released
+    try:
+        notificationBatch = mMecoRelease.outboxLib.openBatch()
+    except (IOError, OSError) as error:
+        mCore.displayLib.Display.displayWarning('Notification batch could not be opened, packages are notified separately: {}'.format(error))
+        notificationBatch = None
+
+    # Batch is closed even if release all is interrupted, so packages released so far are notified right away
+    try:
+        for waveIndex, wave in enumerate(releaseWaves):
+
+            # Packages that depend on a failed package are not released
+            waveNames = []
+            for name in wave:
+                if name in skippedPackageNames:
+                    mCore.displayLib.Display.displayWarning('{} is skipped since a package it depends on has failed to release.'.format(name))
+                else:
+                    waveNames.append(name)
+
+            if not waveNames:
+                continue
+
+            if len(releaseWaves) > 1:
+                sys.stdout.write('Release wave {} of {}: {}\n'.format(waveIndex + 1, len(releaseWaves), ', '.join(waveNames)))
+
+            argumentsList = [(releasePackages[name][0],
+                              mProcess.dataLib.RunLevel.kProcessAndPostDependenciesOnly,
+                              False,
+                              releaseContexts[releasePackages[name][0]],
+                              traceLevel,
+                              _args.archive,
+                              _args.progress,
+                              _args.file_log,
+                              notificationBatch) for name in waveNames]
+
+            for name, releaseResult in zip(waveNames, _iterReleaseResults(argumentsList, _args.jobs)):
+
+                if releaseResult.output:
+                    sys.stdout.write(releaseResult.output)
+                    sys.stdout.flush()
+
+                releaseResults.append(releaseResult)
+                packageRuns.append((name, releasePackages[name][1], releaseResult))
+
+                if not releaseResult.result:
+                    failedPackageNames.add(name)
+                    skippedPackageNames.update(_dependencyGraph.getDependents(name))
+                    continue
+
+                if releasePackages[name][1]:
+                    externalPackageCount += 1
+                else:
+                    internalPackageCount += 1
+
+    finally:
+        if notificationBatch:
+            mMecoRelease.outboxLib.closeBatch(notificationBatch)
+            mMecoRelease.outboxLib.startWorker()
+
+    _recordFingerprints(mMecoRelease.fingerprintLib.KIND_RELEASE, releaseResults)
+    _writeTrace(_args.trace, checkResults + releaseResults)
+    _saveMetrics(metricsPath, packageRuns)
 
-    for packagePath in packagePathList:
+    if internalPackageCount:
+        mCore.displayLib.Display.displaySuccess('{} internal packages have been released to: {}'.format(internalPackageCount,
+                                                                                                        internalPackagesPath))
 
-        if not _package.setPackage(packagePath):
+    if externalPackageCount:
+        mCore.displayLib.Display.displaySuccess('{} external packages have been released to: {}'.format(externalPackageCount,
+                                                                                                        externalPackagesPath))
+
+    if failedPackageNames:
+        mCore.displayLib.Display.displayFailure('{} packages have failed to release: {}'.format(len(failedPackageNames),
+                                                                                               ', '.join(sorted(failedPackageNames))))
+
+    if skippedPackageNames:
+        mCore.displayLib.Display.displayFailure('{} packages have been skipped: {}'.format(len(skippedPackageNames),
+                                                                                          ', '.join(sorted(skippedPackageNames))))
+
+    if unchangedCount:
+        mCore.displayLib.Display.displaySuccess('{} unchanged packages have been skipped.'.format(unchangedCount))
+
+#
+## @brief Rebuild release catalogs from released directories.
+#
+#  @param args [ argparse.Namespace | None | in  ] - Parsed arguments, command line is parsed if None.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def rebuildCatalog(args=None):
+
+    _args = args if args else mMecoRelease.cliLib.getRebuildCatalogParser().parse_args()
+
+    if not mMecoRelease.catalogLib.isAvailable():
+        mCore.displayLib.Display.displayFailure('Release catalogs require sqlite3 module, which is not available.')
+        return
+
+    releasePaths = [_args.path] if _args.path else _getReleasePaths()
+    if not releasePaths:
+        mCore.displayLib.Display.displayFailure('No release path found, initialize a project environment or use --path option.')
+        return
+
+    for releasePath in releasePaths:
+
+        if not os.path.isdir(releasePath):
+            mCore.displayLib.Display.displayFailure('Release path does not exist: {}'.format(releasePath))
             continue
 
-        _releaseData    = mProcess.dataLib.Data(runLevel=mProcess.dataLib.RunLevel.kProcessAndPostDependenciesOnly)
-        _packageRelease = mMecoRelease.releaseCnt.Release(data=_releaseData, packageRoot=packagePath)
+        _catalog  = mMecoRelease.catalogLib.ReleaseCatalog(releasePath)
+        startTime = time.time()
 
-        _packageRelease.run()
+        try:
+            releaseCount = _catalog.rebuild()
+        except (mMecoRelease.catalogLib.sqlite3.Error, OSError) as error:
+            mCore.displayLib.Display.displayFailure('Catalog could not be rebuilt: {}: {}'.format(_catalog.path(), error))
+            continue
 
-        if _package.isExternal():
-            externalPackageCount += 1
-        else:
-            internalPackageCount += 1
-    
-    if internalPackageCount:
-        mCore.displayLib.Display.displaySuccess('{} internal packages have been released to: {}'.format(internalPackageCount,
-                                                                                                        internalPackagesPath))    
-    
-    if externalPackageCount:
-        mCore.displayLib.Display.displaySuccess('{} external packages have been released to: {}'.format(externalPackageCount,
-                                                                                                        externalPackagesPath))
\ No newline at end of file
+        mCore.displayLib.Display.displaySuccess('{} releases have been indexed in {:.1f}s: {}'.format(releaseCount,
+                                                                                                     time.time() - startTime,
+                                                                                                     _catalog.path()))
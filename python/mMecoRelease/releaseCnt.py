@@ -37,6 +37,15 @@ import mProcess.exceptionLib
 
 import mMecoPackage.packageLib
 
+import mMecoRelease.catalogLib
+import mMecoRelease.copyLib
+import mMecoRelease.fingerprintLib
+import mMecoRelease.manifestLib
+import mMecoRelease.metricsLib
+import mMecoRelease.resultCacheLib
+import mMecoRelease.scanLib
+import mMecoRelease.traceLib
+
 import mMecoSettings.envVariablesLib
 import mMecoSettings.settingsLib
 
@@ -45,6 +54,153 @@ import mMecoSettings.settingsLib
 # ----------------------------------------------------------------------------------------------------
 # CODE
 # ----------------------------------------------------------------------------------------------------
+## [ tuple of str ] - Keys of the data resolved by Release.shouldInitialize method, which are kept by ReleaseContext.
+CONTEXT_DATA_KEYS = ('platform',
+                     'projectName',
+                     'masterProjectName',
+                     'packageReleasePath',
+                     'newVersionPath',
+                     'previousVersionPath',
+                     'releaseFilesWithAbsolutePath',
+                     'releaseFilesWithRelativePath',
+                     'releaseFileList',
+                     'releasePlan')
+
+#
+## @brief [ CLASS ] - Class that holds resolved release data of a package so it can be reused by another container.
+#
+#  Instances hold plain data only, so they can be passed between processes.
+class ReleaseContext(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param packageRoot [ str                   | None | in  ] - Root of the package.
+    #  @param data        [ mProcess.dataLib.Data | None | in  ] - Data resolved by Release.shouldInitialize method.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self, packageRoot, data):
+
+        ## [ str ] - Root of the package.
+        self._packageRoot    = packageRoot
+
+        ## [ str ] - Version of the package.
+        self._packageVersion = data['package'].version()
+
+        ## [ dict ] - Resolved data, keys are the ones in CONTEXT_DATA_KEYS.
+        self._data           = dict([(key, data[key]) for key in CONTEXT_DATA_KEYS])
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Whether resolved data is still valid for given package.
+    #
+    #  This is a cheap check, directories are checked for added or removed files and
+    #  release files are checked for size and modification time changes, nothing is read.
+    #
+    #  @param package [ mMecoPackage.packageLib.Package | None | in  ] - Package.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def isValid(self, package):
+
+        if self._data['projectName'] != os.environ.get(mMecoSettings.envVariablesLib.MECO_PROJECT_NAME, None):
+            return False
+
+        if self._data['masterProjectName'] != os.environ.get(mMecoSettings.envVariablesLib.MECO_MASTER_PROJECT_NAME, None):
+            return False
+
+        if not os.path.isdir(self._data['packageReleasePath']):
+            return False
+
+        newVersionPath = mFileSystem.directoryLib.Directory.join(self._data['packageReleasePath'],
+                                                                 package.getPackageReleaseRelativePath())
+        if newVersionPath != self._data['newVersionPath']:
+            return False
+
+        if mMecoRelease.catalogLib.getPreviousVersionPath(self._data['packageReleasePath'], newVersionPath) != self._data['previousVersionPath']:
+            return False
+
+        if not self._data['releaseFileList'].isValid(package.version()):
+            return False
+
+        _releasePlan = self._data['releasePlan']
+
+        for relativePath in self._data['releaseFilesWithRelativePath']:
+
+            entry = _releasePlan.getEntry(relativePath)
+            if not entry:
+                return False
+
+            try:
+                fileStat = os.stat(os.path.join(self._packageRoot, relativePath))
+            except OSError:
+                return False
+
+            if fileStat.st_size != entry['size'] or fileStat.st_mtime != entry['mtime']:
+                return False
+
+        return True
+
+    #
+    ## @brief Get fingerprint of the package from the resolved release files.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Fingerprint, see mMecoRelease.fingerprintLib.computeFingerprint.
+    def fingerprint(self):
+
+        return mMecoRelease.fingerprintLib.getReleasePlanFingerprint(self._packageRoot,
+                                                                     self._packageVersion,
+                                                                     self._data['releaseFilesWithRelativePath'],
+                                                                     self._data['releasePlan'])
+
+    #
+    ## @brief Whether changes of given paths may invalidate resolved data.
+    #
+    #  Release files are affected by changes of themselves and of the files and directories in the directories
+    #  they are scanned from, as those may become release files. Changes elsewhere, such as build outputs,
+    #  are skipped. A release file added to a directory without release files is still found by isValid
+    #  method once resolved data is checked again, as all directories below the package root are watched.
+    #
+    #  @param relativePaths [ list of str | None | in  ] - Relative paths of the changed files and directories, empty string stands for the whole package.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def isAffectedBy(self, relativePaths):
+
+        # Release files are in these directories as well
+        directories = self._data['releaseFileList'].scannedDirectories()
+
+        for relativePath in relativePaths:
+            if not relativePath or os.path.dirname(relativePath) in directories:
+                return True
+
+        return False
+
+    #
+    ## @brief Set resolved data to given data.
+    #
+    #  @param data [ mProcess.dataLib.Data | None | in  ] - Data.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def apply(self, data):
+
+        for key in CONTEXT_DATA_KEYS:
+            data[key] = self._data[key]
+
+
 #
 ## @brief [ CLASS ] - Class to release packages.
 class Release(mProcess.containerAbs.Container):
@@ -55,15 +211,25 @@ class Release(mProcess.containerAbs.Container):
     #
     ## @brief Constructor.
     #
-    #  @param parent      [ QObject               | None      | in  ] - Parent.
-    #  @param data        [ mProcess.dataLib.Data | None      | in  ] - Data.
-    #  @param packageRoot [ str                   | os.getcwd | in  ] - Root of a package to be released.
-    #  @param kwargs      [ dict                  | None      | in  ] - Keyword arguments.
+    #  @param parent            [ QObject                                | None      | in  ] - Parent.
+    #  @param data              [ mProcess.dataLib.Data                  | None      | in  ] - Data.
+    #  @param packageRoot       [ str                                    | os.getcwd | in  ] - Root of a package to be released.
+    #  @param jobs              [ int                                    | 1         | in  ] - Number of workers used to copy release files.
+    #  @param dedup             [ bool                                   | False     | in  ] - Whether to hard link files that are unchanged since the previous release.
+    #  @param context           [ mMecoRelease.releaseCnt.ReleaseContext | None      | in  ] - Context resolved by another container for the same package.
+    #  @param tracer            [ mMecoRelease.traceLib.Tracer           | None      | in  ] - Tracer that records timings of the stages, nothing is traced if None.
+    #  @param metricsPath       [ str                                    | None      | in  ] - Metrics file metrics of the run are merged into at the end of the run, see mMecoRelease.metricsLib.
+    #  @param archive           [ bool                                   | False     | in  ] - Whether to write release files into an archive as well, see mMecoRelease.archiveLib.
+    #  @param progress          [ bool                                   | False     | in  ] - Whether to render copy progress instead of displaying each copied file.
+    #  @param fileLogPath       [ str                                    | None      | in  ] - Log file copied files are appended to.
+    #  @param notificationBatch [ str                                    | None      | in  ] - Outbox batch notification is queued in, see mMecoRelease.outboxLib.
+    #  @param resume            [ bool                                   | False     | in  ] - Whether to resume an interrupted release of the version, see mMecoRelease.journalLib.
+    #  @param kwargs            [ dict                                   | None      | in  ] - Keyword arguments.
     #
     #  @exception N/A
     #
     #  @return None - None.
-    def __init__(self, parent=None, data=None, packageRoot=os.getcwd(), **kwargs):
+    def __init__(self, parent=None, data=None, packageRoot=os.getcwd(), jobs=mMecoRelease.copyLib.DEFAULT_JOB_COUNT, dedup=False, context=None, tracer=None, metricsPath=None, archive=False, progress=False, fileLogPath=None, notificationBatch=None, resume=False, **kwargs):
 
         ## [ str ] - Display name.
         self._name                     = 'Package Release'
@@ -82,6 +248,36 @@ class Release(mProcess.containerAbs.Container):
         ## [ str ] - Package root.
         self._packageRoot              = packageRoot
 
+        ## [ int ] - Number of workers used to copy release files.
+        self._jobs                     = jobs
+
+        ## [ bool ] - Whether to hard link files that are unchanged since the previous release.
+        self._dedup                    = dedup
+
+        ## [ bool ] - Whether to write release files into an archive as well.
+        self._archive                  = archive
+
+        ## [ bool ] - Whether to render copy progress instead of displaying each copied file.
+        self._progress                 = progress
+
+        ## [ str ] - Log file copied files are appended to.
+        self._fileLogPath              = fileLogPath
+
+        ## [ str ] - Outbox batch notification is queued in.
+        self._notificationBatch        = notificationBatch
+
+        ## [ bool ] - Whether to resume an interrupted release of the version.
+        self._resume                   = resume
+
+        ## [ mMecoRelease.releaseCnt.ReleaseContext ] - Resolved release context.
+        self._context                  = context
+
+        ## [ str ] - Metrics file metrics of the run are merged into.
+        self._metricsPath              = metricsPath
+
+        ## [ mMecoRelease.traceLib.Tracer ] - Tracer that records timings of the stages, metrics are derived from them.
+        self._tracer                   = tracer if tracer or not metricsPath else mMecoRelease.traceLib.Tracer()
+
         #
 
         mProcess.containerAbs.Container.__dict__['__init__'](self, parent, data, **kwargs)
@@ -100,6 +296,24 @@ class Release(mProcess.containerAbs.Container):
         _package = mMecoPackage.packageLib.Package(self._packageRoot)
 
         self._data['package'] = _package
+        self._data['jobs']    = self._jobs
+        self._data['dedup']   = self._dedup
+        self._data['archive'] = self._archive
+        self._data['resume']  = self._resume
+        self._data['tracer']  = self._tracer
+
+        self._data['progress']    = self._progress
+        self._data['fileLogPath'] = self._fileLogPath
+
+        self._data['notificationBatch'] = self._notificationBatch
+
+        # Results of dependencies that declare cache keys, see mMecoRelease.processes.releaseDependencyAbs
+        self._data['resultCache'] = mMecoRelease.resultCacheLib.ResultCache() if mMecoRelease.resultCacheLib.isEnabled() else None
+
+        # Names of failed dependencies and whether they are ignorable, see mMecoRelease.processes.releaseDependencyAbs
+        self._data['failedDependencies'] = []
+        self._data['containerError']     = None
+        self._data['published']          = False
 
     #
     ## @brief Whether this container should be initialized.
@@ -113,6 +327,21 @@ class Release(mProcess.containerAbs.Container):
     #  @return bool - Result.
     def shouldInitialize(self):
 
+        try:
+            with mMecoRelease.traceLib.span(self._tracer, 'Initialize', 'container'):
+                return self._initialize()
+        except mProcess.exceptionLib.ContainerError as error:
+            self._data['containerError'] = str(error)
+            raise
+
+    #
+    ## @brief Resolve release data of the package.
+    #
+    #  @exception mProcess.exceptionLib.ContainerError - If the package can not be released.
+    #
+    #  @return bool - Result.
+    def _initialize(self):
+
         developerName = os.environ.get(mMecoSettings.envVariablesLib.MECO_DEVELOPER_NAME)
         if not developerName:
             raise mProcess.exceptionLib.ContainerError('No development environment has been set.')
@@ -128,6 +357,12 @@ class Release(mProcess.containerAbs.Container):
         if not mMecoSettings.envVariablesLib.MECO_PROJECT_NAME in os.environ:
             raise mProcess.exceptionLib.ContainerError('No project environment has been set.')
 
+        if self._context and self._context.isValid(self._data['package']):
+            self._context.apply(self._data)
+            return mProcess.containerAbs.Container.__dict__['shouldInitialize'](self)
+
+        self._context = None
+
         if not self._packageRoot:
             raise mProcess.exceptionLib.ContainerError('No package root set.')
 
@@ -167,9 +402,78 @@ class Release(mProcess.containerAbs.Container):
         self._data['newVersionPath']        = mFileSystem.directoryLib.Directory.join(packageReleasePath,
                                                                                       self._data['package'].getPackageReleaseRelativePath()
                                                                                       )
+        self._data['previousVersionPath']   = mMecoRelease.catalogLib.getPreviousVersionPath(packageReleasePath, self._data['newVersionPath'])
+
+        # Release files are listed once, absolute paths and stat results are derived from the same list
+        self._data['releaseFileList']              = mMecoRelease.scanLib.getReleaseFileList(self._data['package'])
+        self._data['releaseFilesWithAbsolutePath'] = self._data['releaseFileList'].absolutePaths()
+        self._data['releaseFilesWithRelativePath'] = self._data['releaseFileList'].relativePaths()
 
-        self._data['releaseFilesWithAbsolutePath'] = self._data['package'].getReleaseFiles(relative=False)
-        self._data['releaseFilesWithRelativePath'] = self._data['package'].getReleaseFiles(relative=True)
+        previousManifest = None
+        if self._data['previousVersionPath']:
+            previousManifest = mMecoRelease.manifestLib.Manifest.read(mMecoRelease.manifestLib.getManifestFile(self._data['previousVersionPath']))
+
+        self._data['releasePlan']                  = mMecoRelease.manifestLib.ReleasePlan(self._data['package'].path(),
+                                                                                          self._data['releaseFilesWithRelativePath'],
+                                                                                          previousManifest,
+                                                                                          self._data['releaseFileList'].fileStats())
+
+        self._context = ReleaseContext(self._packageRoot, self._data)
 
         return mProcess.containerAbs.Container.__dict__['shouldInitialize'](self)
 
+    #
+    ## @brief Merge metrics of the run into the metrics file.
+    #
+    #  @param result [ bool | None | in  ] - Result of the run.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def _saveMetrics(self, result):
+
+        _package = self._data['package']
+
+        mMecoRelease.metricsLib.savePackageRuns(self._metricsPath,
+                                                os.environ.get(mMecoSettings.envVariablesLib.MECO_PROJECT_NAME),
+                                                [(_package.name(),
+                                                  _package.isExternal(),
+                                                  self._data['published'],
+                                                  result,
+                                                  self._data['failedDependencies'],
+                                                  self._data['containerError'],
+                                                  self._tracer.events())])
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Run the container.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def run(self):
+
+        with mMecoRelease.traceLib.span(self._tracer, '{}: {}'.format(self._name, self._data['package'].name()), 'container', {'packageRoot':self._packageRoot}):
+            result = mProcess.containerAbs.Container.run(self)
+
+        if self._metricsPath:
+            self._saveMetrics(result)
+
+        return result
+
+    #
+    ## @brief Get release context resolved by this container.
+    #
+    #  Context can be given to another container of the same package to skip resolving it again.
+    #
+    #  @exception N/A
+    #
+    #  @return mMecoRelease.releaseCnt.ReleaseContext - Context.
+    #  @return None                                   - If the container hasn't been initialized.
+    def context(self):
+
+        return self._context
+
@@ -0,0 +1,327 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/resultCacheLib.py @brief [ FILE   ] - Dependency result cache module.
+## @package mMecoRelease.resultCacheLib    @brief [ MODULE ] - Dependency result cache module.
+#
+#  Dependencies declare what their result depends on, see KEY_* constants, and results are kept
+#  as JSON files in local cache keyed by those values. Least recently used results are evicted once
+#  the cache grows beyond MAX_ENTRY_COUNT entries or MAX_SIZE bytes, which is checked on one of
+#  EVICTION_INTERVAL stores on average since it lists the whole cache.
+#
+#  Lookup costs a few file operations, and a fingerprint of the release plan if KEY_PACKAGE is used,
+#  so dependencies should declare the cheapest keys their result depends on.
+#
+#  Cache can be disabled by setting MECO_RELEASE_NO_RESULT_CACHE environment variable.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORTS
+# ----------------------------------------------------------------------------------------------------
+import os
+import sys
+import errno
+import random
+import hashlib
+
+from datetime import date
+
+import mMecoRelease.cacheLib
+import mMecoRelease.catalogLib
+import mMecoRelease.fingerprintLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ str ] - Environment variable that disables the result cache if set.
+RESULT_CACHE_DISABLED_ENV  = 'MECO_RELEASE_NO_RESULT_CACHE'
+
+## [ str ] - Name of the result cache directory in local cache.
+RESULT_DIRECTORY_NAME      = 'results'
+
+## [ int ] - Maximum number of results kept.
+MAX_ENTRY_COUNT            = 4096
+
+## [ int ] - Maximum total size of the results kept in bytes.
+MAX_SIZE                   = 4 * 1024 * 1024
+
+## [ int ] - Average number of stores per eviction, cache may exceed its limits by about this many results.
+EVICTION_INTERVAL          = 64
+
+## [ str ] - Result depends on the release files and version of the package.
+KEY_PACKAGE                = 'package'
+
+## [ str ] - Result depends on the path, name and version of the package but not on its release files.
+KEY_PACKAGE_VERSION        = 'packageVersion'
+
+## [ str ] - Result depends on MECO_* environment variables.
+KEY_ENVIRONMENT            = 'environment'
+
+## [ str ] - Result depends on the current date.
+KEY_DATE                   = 'date'
+
+## [ str ] - Result depends on the released versions of the package and the release catalog.
+KEY_RELEASE_PATH           = 'releasePath'
+
+## [ str ] - Prefix of the environment variables KEY_ENVIRONMENT depends on.
+ENVIRONMENT_PREFIX         = 'MECO_'
+
+#
+## @brief Whether result cache is enabled.
+#
+#  @exception N/A
+#
+#  @return bool - Result.
+def isEnabled():
+
+    return not os.environ.get(RESULT_CACHE_DISABLED_ENV)
+
+#
+## @brief Get state of a path as a string, changes whenever the path is modified.
+#
+#  @param path [ str | None | in  ] - Path.
+#
+#  @exception N/A
+#
+#  @return str - State.
+def _getPathState(path):
+
+    try:
+        pathStat = os.stat(path)
+    except OSError:
+        return '{}:-'.format(path)
+
+    return '{}:{!r}:{}'.format(path, pathStat.st_mtime, pathStat.st_size)
+
+#
+## @brief [ CLASS ] - Class to store and look up dependency results.
+class ResultCache(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  Values of the keys are computed once per instance, so an instance should live as long as a container run.
+    #
+    #  @param directory [ str | None | in  ] - Directory of the results, default one in local cache is used if None.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self, directory=None):
+
+        ## [ str ] - Directory of the results.
+        self._directory = directory
+
+        ## [ dict ] - Computed key values, keys are KEY_* constants.
+        self._values    = {}
+
+    #
+    ## @brief Get directory of the results, create it if it doesn't exist.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Path.
+    def _getDirectory(self):
+
+        if not self._directory:
+            self._directory = os.path.join(mMecoRelease.cacheLib.getCacheDirectory(), RESULT_DIRECTORY_NAME)
+
+        try:
+            os.makedirs(self._directory)
+        except OSError as error:
+            if error.errno != errno.EEXIST:
+                raise
+
+        return self._directory
+
+    #
+    ## @brief Compute value of a key.
+    #
+    #  @param key  [ str                   | None | in  ] - One of KEY_* constants.
+    #  @param data [ mProcess.dataLib.Data | None | in  ] - Data of the container.
+    #
+    #  @exception ValueError - If the key is unknown.
+    #
+    #  @return str - Value.
+    def _computeValue(self, key, data):
+
+        if key == KEY_PACKAGE:
+            return mMecoRelease.fingerprintLib.getReleasePlanFingerprint(data['package'].path(),
+                                                                         data['package'].version(),
+                                                                         data['releaseFilesWithRelativePath'],
+                                                                         data['releasePlan'])
+
+        if key == KEY_PACKAGE_VERSION:
+            return '|'.join([data['package'].path(), data['package'].name(), data['package'].version()])
+
+        if key == KEY_ENVIRONMENT:
+            return repr(sorted([(name, value) for name, value in os.environ.items() if name.startswith(ENVIRONMENT_PREFIX)]))
+
+        if key == KEY_DATE:
+            return date.today().isoformat()
+
+        if key == KEY_RELEASE_PATH:
+            # Versions directory is modified whenever a version is added or removed
+            newVersionPath = os.path.normpath(data['newVersionPath'])
+            return '|'.join([_getPathState(os.path.dirname(newVersionPath)),
+                             _getPathState(newVersionPath),
+                             _getPathState(os.path.join(data['packageReleasePath'], mMecoRelease.catalogLib.CATALOG_FILE_NAME))])
+
+        raise ValueError('Unknown result cache key: {}'.format(key))
+
+    #
+    ## @brief Get path of the file of a result.
+    #
+    #  @param cacheKey [ str | None | in  ] - Cache key.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Path.
+    def _getResultFile(self, cacheKey):
+
+        return os.path.join(self._getDirectory(), '{}.json'.format(cacheKey))
+
+    #
+    ## @brief Remove least recently used results until the cache fits in its limits.
+    #
+    #  @exception N/A
+    #
+    #  @return int - Number of removed results.
+    def _evict(self):
+
+        directory = self._getDirectory()
+        entries   = []
+        totalSize = 0
+
+        for name in os.listdir(directory):
+
+            if not name.endswith('.json'):
+                continue
+
+            path = os.path.join(directory, name)
+
+            try:
+                resultStat = os.stat(path)
+            except OSError:
+                continue
+
+            entries.append((resultStat.st_mtime, resultStat.st_size, path))
+            totalSize += resultStat.st_size
+
+        entries.sort()
+
+        removedCount = 0
+
+        while entries and (len(entries) > MAX_ENTRY_COUNT or totalSize > MAX_SIZE):
+
+            mtime, size, path = entries.pop(0)
+            totalSize -= size
+
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+
+            removedCount += 1
+
+        return removedCount
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Get cache key of a result.
+    #
+    #  Source file of the dependency is part of the key, so changing the dependency invalidates its results.
+    #
+    #  @param dependency [ object                | None | in  ] - Dependency instance.
+    #  @param keys       [ list of str           | None | in  ] - KEY_* constants the result depends on.
+    #  @param data       [ mProcess.dataLib.Data | None | in  ] - Data of the container.
+    #
+    #  @exception ValueError - If a key is unknown.
+    #
+    #  @return str - Hex digest.
+    def getCacheKey(self, dependency, keys, data):
+
+        dependencyClass = dependency.__class__
+        sourceFile      = getattr(sys.modules.get(dependencyClass.__module__), '__file__', '')
+
+        parts = ['{}.{}'.format(dependencyClass.__module__, dependencyClass.__name__),
+                 _getPathState(sourceFile)]
+
+        for key in sorted(keys):
+
+            if not key in self._values:
+                self._values[key] = self._computeValue(key, data)
+
+            parts.append('{}={}'.format(key, self._values[key]))
+
+        return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+
+    #
+    ## @brief Get a result.
+    #
+    #  @param cacheKey [ str | None | in  ] - Cache key.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Result, see set method.
+    #  @return None - If the result isn't cached.
+    def get(self, cacheKey):
+
+        resultFile = self._getResultFile(cacheKey)
+
+        entry = mMecoRelease.cacheLib.readJson(resultFile)
+        if not isinstance(entry, dict):
+            return None
+
+        # Modification time orders results for eviction
+        try:
+            os.utime(resultFile, None)
+        except OSError:
+            pass
+
+        return entry
+
+    #
+    ## @brief Store a result.
+    #
+    #  @param cacheKey [ str  | None | in  ] - Cache key.
+    #  @param entry    [ dict | None | in  ] - Result with result, success, failure and infos keys.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Whether the result has been stored.
+    def set(self, cacheKey, entry):
+
+        try:
+            mMecoRelease.cacheLib.writeJson(self._getResultFile(cacheKey), entry)
+            if random.randrange(EVICTION_INTERVAL) == 0:
+                self._evict()
+        except (IOError, OSError):
+            return False
+
+        return True
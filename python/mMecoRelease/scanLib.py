@@ -0,0 +1,441 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/scanLib.py @brief [ FILE   ] - Release file enumeration module.
+## @package mMecoRelease.scanLib    @brief [ MODULE ] - Release file enumeration module.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORTS
+# ----------------------------------------------------------------------------------------------------
+import os
+import hashlib
+
+try:
+    from os import scandir as _scandir
+except ImportError:
+    try:
+        from scandir import scandir as _scandir
+    except ImportError:
+        _scandir = None
+
+import mMecoRelease.cacheLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ int ] - Format of the release file list cache files.
+RELEASE_FILE_LIST_FORMAT = 2
+
+## [ tuple of str ] - Names of version control directories, which never contain release files and are never watched.
+VCS_DIRECTORY_NAMES      = ('.git', '.svn', '.hg')
+
+## [ dict ] - Release file lists scanned by this process, keys are package roots.
+_releaseFileLists        = {}
+
+#
+## @brief List entries of a directory.
+#
+#  os.scandir is used if available so directory entries that are not needed are never stated.
+#
+#  @param path [ str | None | in  ] - Path of the directory.
+#
+#  @exception OSError - If the directory can not be listed.
+#
+#  @return generator - Tuples of name, whether the entry is a directory and a callable that returns the stat result of the entry.
+def _listDirectory(path):
+
+    if _scandir:
+        for entry in _scandir(path):
+            yield entry.name, entry.is_dir(), entry.stat
+        return
+
+    for name in os.listdir(path):
+        entryPath = os.path.join(path, name)
+        yield name, os.path.isdir(entryPath), lambda entryPath=entryPath: os.stat(entryPath)
+
+#
+## @brief Get path of the cache file of a package.
+#
+#  @param packageRoot [ str | None | in  ] - Root of the package.
+#
+#  @exception N/A
+#
+#  @return str - Path.
+def _getCacheFile(packageRoot):
+
+    key = hashlib.sha1(packageRoot.encode('utf-8')).hexdigest()[:16]
+
+    return mMecoRelease.cacheLib.getCacheFile('releaseFiles.{}.json'.format(key))
+
+#
+## @brief Get modification time of a path.
+#
+#  @param path [ str | None | in  ] - Path.
+#
+#  @exception N/A
+#
+#  @return float - Modification time, None if the path doesn't exist.
+def _getMTime(path):
+
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+#
+## @brief Record modification times of a directory and all of its sub directories.
+#
+#  Directories are listed but files in them are never stated.
+#
+#  @param packageRoot     [ str  | None | in  ] - Root of the package.
+#  @param relativePath    [ str  | None | in  ] - Relative path of the directory.
+#  @param directoryMTimes [ dict | None | in  ] - Keys are relative paths, values are modification times, updated in place.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def _recordSubtreeMTimes(packageRoot, relativePath, directoryMTimes):
+
+    for directory, directoryNames, fileNames in os.walk(os.path.join(packageRoot, relativePath)):
+
+        directoryNames[:] = [name for name in directoryNames if not name in VCS_DIRECTORY_NAMES]
+
+        directoryMTimes[os.path.relpath(directory, packageRoot)] = _getMTime(directory)
+
+#
+## @brief [ CLASS ] - Class that holds release files of a package along with their stat results.
+#
+#  Instances hold plain data only, so they can be passed between processes and written to the cache.
+class ReleaseFileList(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param packageRoot     [ str         | None | in  ] - Root of the package.
+    #  @param packageVersion  [ str         | None | in  ] - Version of the package.
+    #  @param relativePaths   [ list of str | None | in  ] - Relative paths of the release files.
+    #  @param fileStats       [ dict        | None | in  ] - Keys are relative paths, values are tuples of size and modification time.
+    #  @param directoryMTimes [ dict        | None | in  ] - Keys are relative paths of watched directories, values are modification times.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self, packageRoot, packageVersion, relativePaths, fileStats, directoryMTimes):
+
+        ## [ str ] - Root of the package.
+        self._packageRoot     = packageRoot
+
+        ## [ str ] - Version of the package.
+        self._packageVersion  = packageVersion
+
+        ## [ list of str ] - Relative paths of the release files.
+        self._relativePaths   = relativePaths
+
+        ## [ dict ] - Keys are relative paths, values are tuples of size and modification time.
+        self._fileStats       = fileStats
+
+        ## [ dict ] - Keys are relative paths of watched directories, values are modification times.
+        self._directoryMTimes = directoryMTimes
+
+        ## [ set of str ] - Relative paths of the directories that contain release files and of their parents, computed once needed.
+        self._directories     = None
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Get root of the package.
+    #
+    #  @exception N/A
+    #
+    #  @return str - Path.
+    def packageRoot(self):
+
+        return self._packageRoot
+
+    #
+    ## @brief Get relative paths of the release files.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Paths.
+    def relativePaths(self):
+
+        return list(self._relativePaths)
+
+    #
+    ## @brief Get absolute paths of the release files.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Paths.
+    def absolutePaths(self):
+
+        return [os.path.join(self._packageRoot, relativePath) for relativePath in self._relativePaths]
+
+    #
+    ## @brief Get stat results of the release files.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are relative paths, values are tuples of size and modification time.
+    def fileStats(self):
+
+        return self._fileStats
+
+    #
+    ## @brief Get stat result of a release file.
+    #
+    #  @param relativePath [ str | None | in  ] - Relative path of the file.
+    #
+    #  @exception N/A
+    #
+    #  @return tuple - Size and modification time.
+    #  @return None  - If the file doesn't exist.
+    def getFileStat(self, relativePath):
+
+        return self._fileStats.get(relativePath)
+
+    #
+    ## @brief Get modification times of the watched directories.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are relative paths, values are modification times.
+    def directoryMTimes(self):
+
+        return self._directoryMTimes
+
+    #
+    ## @brief Get directories that contain release files and their parents, which are the directories the list is scanned from.
+    #
+    #  Nested directories without release files are watched for added files but aren't part of it.
+    #
+    #  @exception N/A
+    #
+    #  @return set of str - Relative paths, empty string stands for the package root.
+    def scannedDirectories(self):
+
+        if self._directories is None:
+            self._directories = set()
+
+            for relativePath in self._relativePaths:
+
+                directory = os.path.dirname(relativePath)
+
+                while not directory in self._directories:
+                    self._directories.add(directory)
+                    if not directory:
+                        break
+                    directory = os.path.dirname(directory)
+
+        return self._directories
+
+    #
+    ## @brief Whether files have been neither added nor removed since the list has been scanned.
+    #
+    #  Any file added to or removed from a directory changes the modification time of the directory,
+    #  so only the watched directories are stated.
+    #
+    #  @param packageVersion [ str | None | in  ] - Current version of the package.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def isValid(self, packageVersion):
+
+        if packageVersion != self._packageVersion:
+            return False
+
+        for directory, mtime in self._directoryMTimes.items():
+            if _getMTime(os.path.join(self._packageRoot, directory)) != mtime:
+                return False
+
+        return True
+
+    #
+    ## @brief Stat the release files again, as their content may change without changing the directories.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Whether all release files still exist.
+    def refresh(self):
+
+        fileStats = {}
+
+        for relativePath in self._relativePaths:
+
+            try:
+                fileStat = os.stat(os.path.join(self._packageRoot, relativePath))
+            except OSError:
+                return False
+
+            fileStats[relativePath] = (fileStat.st_size, fileStat.st_mtime)
+
+        self._fileStats = fileStats
+
+        return True
+
+    #
+    ## @brief Get content of the list to be written to the cache.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Content.
+    def toDict(self):
+
+        return {'format'          : RELEASE_FILE_LIST_FORMAT,
+                'packageRoot'     : self._packageRoot,
+                'packageVersion'  : self._packageVersion,
+                'relativePaths'   : self._relativePaths,
+                'directoryMTimes' : self._directoryMTimes}
+
+    #
+    ## @brief Create a list from the content read from the cache.
+    #
+    #  Stat results of the files are not cached, refresh method must be called before the list is used.
+    #
+    #  @param content [ dict | None | in  ] - Content.
+    #
+    #  @exception N/A
+    #
+    #  @return mMecoRelease.scanLib.ReleaseFileList - List.
+    #  @return None                                 - If the content is invalid.
+    @staticmethod
+    def fromDict(content):
+
+        if not isinstance(content, dict) or content.get('format') != RELEASE_FILE_LIST_FORMAT:
+            return None
+
+        try:
+            return ReleaseFileList(content['packageRoot'],
+                                   content['packageVersion'],
+                                   [str(relativePath) for relativePath in content['relativePaths']],
+                                   {},
+                                   dict([(str(directory), mtime) for directory, mtime in content['directoryMTimes'].items()]))
+        except (KeyError, AttributeError, TypeError):
+            return None
+
+#
+## @brief Scan the directories that contain release files of a package.
+#
+#  Each directory that contains release files is listed once. Stat results of the release files are kept,
+#  and modification times of these directories and of every directory below them are recorded so
+#  added or removed files can be detected later without listing them again. A file added to a
+#  directory only changes the modification time of that directory, so nested directories without
+#  release files are recorded as well.
+#
+#  @param packageRoot    [ str         | None | in  ] - Root of the package.
+#  @param packageVersion [ str         | None | in  ] - Version of the package.
+#  @param relativePaths  [ list of str | None | in  ] - Relative paths of the release files.
+#
+#  @exception N/A
+#
+#  @return mMecoRelease.scanLib.ReleaseFileList - List.
+def scanReleaseFiles(packageRoot, packageVersion, relativePaths):
+
+    filesByDirectory = {}
+
+    for relativePath in relativePaths:
+
+        directory, name = os.path.split(relativePath)
+        filesByDirectory.setdefault(directory, set()).add(name)
+
+        # Parents are scanned as well so new sub directories are detected
+        while directory:
+            directory = os.path.dirname(directory)
+            filesByDirectory.setdefault(directory, set())
+
+    fileStats       = {}
+    directoryMTimes = {}
+
+    for directory, names in filesByDirectory.items():
+
+        directoryPath              = os.path.join(packageRoot, directory)
+        directoryMTimes[directory] = _getMTime(directoryPath)
+
+        try:
+            entries = list(_listDirectory(directoryPath))
+        except OSError:
+            continue
+
+        for name, isDirectory, getStat in entries:
+
+            relativePath = os.path.join(directory, name)
+
+            try:
+                if isDirectory:
+                    if not relativePath in filesByDirectory and not name in VCS_DIRECTORY_NAMES:
+                        _recordSubtreeMTimes(packageRoot, relativePath, directoryMTimes)
+
+                elif name in names:
+                    fileStat                = getStat()
+                    fileStats[relativePath] = (fileStat.st_size, fileStat.st_mtime)
+
+            except OSError:
+                continue
+
+    return ReleaseFileList(packageRoot, packageVersion, list(relativePaths), fileStats, directoryMTimes)
+
+#
+## @brief Get release files of a package.
+#
+#  Release files are listed by the package only if none of the watched directories has changed
+#  since they have been listed by this process or a previous one.
+#
+#  @param package  [ mMecoPackage.packageLib.Package | None | in  ] - Package.
+#  @param useCache [ bool                            | True | in  ] - Whether to use cached release files.
+#
+#  @exception N/A
+#
+#  @return mMecoRelease.scanLib.ReleaseFileList - List.
+def getReleaseFileList(package, useCache=True):
+
+    packageRoot = package.path()
+    cacheFile   = _getCacheFile(packageRoot)
+
+    if useCache:
+
+        _releaseFileList = _releaseFileLists.get(packageRoot)
+        if not _releaseFileList:
+            _releaseFileList = ReleaseFileList.fromDict(mMecoRelease.cacheLib.readJson(cacheFile))
+
+        if _releaseFileList and _releaseFileList.packageRoot() == packageRoot and \
+           _releaseFileList.isValid(package.version()) and _releaseFileList.refresh():
+            _releaseFileLists[packageRoot] = _releaseFileList
+            return _releaseFileList
+
+    _releaseFileList = scanReleaseFiles(packageRoot, package.version(), package.getReleaseFiles(relative=True))
+
+    _releaseFileLists[packageRoot] = _releaseFileList
+
+    try:
+        mMecoRelease.cacheLib.writeJson(cacheFile, _releaseFileList.toDict())
+    except (IOError, OSError):
+        pass
+
+    return _releaseFileList
@@ -0,0 +1,211 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/traceLib.py @brief [ FILE   ] - Stage timing module.
+## @package mMecoRelease.traceLib    @brief [ MODULE ] - Stage timing module.
+#
+#  Timings are written in Chrome trace event format, which can be opened by chrome://tracing or Perfetto.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORTS
+# ----------------------------------------------------------------------------------------------------
+import os
+import time
+import threading
+import contextlib
+
+import mMecoRelease.cacheLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ int ] - Nothing is traced.
+LEVEL_NONE   = 0
+
+## [ int ] - Containers, processes and dependencies are traced.
+LEVEL_STAGES = 1
+
+## [ int ] - Copy of each file is traced as well.
+LEVEL_FILES  = 2
+
+#
+## @brief [ CLASS ] - Class that records timings of release stages.
+#
+#  Events are kept as plain dictionaries, so tracers can be passed between processes.
+class Tracer(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param level [ int | LEVEL_STAGES | in  ] - Trace level, LEVEL_STAGES or LEVEL_FILES.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self, level=LEVEL_STAGES):
+
+        ## [ int ] - Trace level.
+        self._level  = level
+
+        ## [ list of dict ] - Trace events.
+        self._events = []
+
+        ## [ threading.Lock ] - Lock that guards events, copy workers may add events.
+        self._lock   = threading.Lock()
+
+    #
+    ## @brief Get state to be pickled, lock can not be pickled.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - State.
+    def __getstate__(self):
+
+        return {'_level':self._level, '_events':self._events}
+
+    #
+    ## @brief Set state after being unpickled.
+    #
+    #  @param state [ dict | None | in  ] - State.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __setstate__(self, state):
+
+        self._level  = state['_level']
+        self._events = state['_events']
+        self._lock   = threading.Lock()
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Whether copy of each file is traced.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def tracesFiles(self):
+
+        return self._level >= LEVEL_FILES
+
+    #
+    ## @brief Add a complete event.
+    #
+    #  @param name      [ str   | None | in  ] - Name of the event.
+    #  @param category  [ str   | None | in  ] - Category of the event, such as container, process or dependency.
+    #  @param startTime [ float | None | in  ] - Start time, as returned by time.time.
+    #  @param endTime   [ float | None | in  ] - End time, as returned by time.time.
+    #  @param args      [ dict  | None | in  ] - Arguments displayed along with the event.
+    #  @param threadId  [ int   | None | in  ] - Identifier of the thread, current thread if None.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def addEvent(self, name, category, startTime, endTime, args=None, threadId=None):
+
+        event = {'name' : name,
+                 'cat'  : category,
+                 'ph'   : 'X',
+                 'ts'   : int(startTime * 1000000),
+                 'dur'  : max(0, int((endTime - startTime) * 1000000)),
+                 'pid'  : os.getpid(),
+                 'tid'  : threadId if threadId is not None else threading.current_thread().ident}
+
+        if args:
+            event['args'] = args
+
+        with self._lock:
+            self._events.append(event)
+
+    #
+    ## @brief Trace the code run in a with statement.
+    #
+    #  @param name     [ str  | None | in  ] - Name of the event.
+    #  @param category [ str  | None | in  ] - Category of the event.
+    #  @param args     [ dict | None | in  ] - Arguments displayed along with the event.
+    #
+    #  @exception N/A
+    #
+    #  @return contextmanager - Context manager.
+    @contextlib.contextmanager
+    def span(self, name, category, args=None):
+
+        startTime = time.time()
+
+        try:
+            yield
+        finally:
+            self.addEvent(name, category, startTime, time.time(), args)
+
+    #
+    ## @brief Get trace events.
+    #
+    #  @exception N/A
+    #
+    #  @return list of dict - Events.
+    def events(self):
+
+        with self._lock:
+            return list(self._events)
+
+#
+## @brief Trace the code run in a with statement if a tracer is given.
+#
+#  @param tracer   [ mMecoRelease.traceLib.Tracer | None | in  ] - Tracer, nothing is traced if None.
+#  @param name     [ str                          | None | in  ] - Name of the event.
+#  @param category [ str                          | None | in  ] - Category of the event.
+#  @param args     [ dict                         | None | in  ] - Arguments displayed along with the event.
+#
+#  @exception N/A
+#
+#  @return contextmanager - Context manager.
+@contextlib.contextmanager
+def span(tracer, name, category, args=None):
+
+    if not tracer:
+        yield
+        return
+
+    with tracer.span(name, category, args):
+        yield
+
+#
+## @brief Write trace events to a file in Chrome trace event format.
+#
+#  @param path   [ str          | None | in  ] - Path of the file.
+#  @param events [ list of dict | None | in  ] - Events.
+#
+#  @exception IOError - If the file can not be written.
+#  @exception OSError - If the file can not be written.
+#
+#  @return None - None.
+def writeTrace(path, events):
+
+    mMecoRelease.cacheLib.writeJson(os.path.abspath(path), {'traceEvents'     : sorted(events, key=lambda event: event['ts']),
+                                                            'displayTimeUnit' : 'ms'})
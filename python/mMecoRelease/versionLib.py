@@ -0,0 +1,244 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/versionLib.py @brief [ FILE   ] - Released version module.
+## @package mMecoRelease.versionLib    @brief [ MODULE ] - Released version module.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORTS
+# ----------------------------------------------------------------------------------------------------
+import os
+import re
+import errno
+import stat
+import time
+import shutil
+import socket
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ str ] - Infix of staging directory names, full name is .<version>.staging.<host>.<pid>
+STAGING_INFIX      = '.staging.'
+
+## [ int ] - Age in seconds after which staging directories of other hosts are considered stale.
+STALE_STAGING_AGE  = 24 * 60 * 60
+
+#
+## @brief Get sort key of given version so that versions can be ordered numerically.
+#
+#  @param version [ str | None | in  ] - Version, such as 1.10.2.
+#
+#  @exception N/A
+#
+#  @return tuple - Sort key.
+def getSortKey(version):
+
+    return tuple([(0, int(part), '') if part.isdigit() else (1, 0, part) for part in re.split(r'[.\-_]', version)])
+
+#
+## @brief Get released versions of a package, sorted from oldest to newest.
+#
+#  @param packageVersionsPath [ str | None | in  ] - Path that contains released version directories of a package.
+#
+#  @exception N/A
+#
+#  @return list of str - Versions.
+def getReleasedVersions(packageVersionsPath):
+
+    if not os.path.isdir(packageVersionsPath):
+        return []
+
+    versions = [version for version in os.listdir(packageVersionsPath)
+                if not version.startswith('.') and os.path.isdir(os.path.join(packageVersionsPath, version))]
+
+    return sorted(versions, key=getSortKey)
+
+#
+## @brief Get path of the most recent released version other than the new version.
+#
+#  @param newVersionPath [ str | None | in  ] - Path of the version being released.
+#
+#  @exception N/A
+#
+#  @return str  - Path of the previous version.
+#  @return None - If no other version has been released.
+def getPreviousVersionPath(newVersionPath):
+
+    newVersionPath      = os.path.normpath(newVersionPath)
+    packageVersionsPath = os.path.dirname(newVersionPath)
+    newVersion          = os.path.basename(newVersionPath)
+
+    versions = [version for version in getReleasedVersions(packageVersionsPath) if version != newVersion]
+    if not versions:
+        return None
+
+    return os.path.join(packageVersionsPath, versions[-1])
+
+#
+## @brief Remove a directory tree, including read only files.
+#
+#  @param path [ str | None | in  ] - Path of the directory.
+#
+#  @exception N/A
+#
+#  @return None - None.
+def removeTree(path):
+
+    def _onError(function, failedPath, excInfo):
+        os.chmod(failedPath, stat.S_IRWXU)
+        function(failedPath)
+
+    if os.path.isdir(path):
+        shutil.rmtree(path, onerror=_onError)
+
+#
+## @brief Get path of a hidden staging directory for the version being released.
+#
+#  Staging directory is created next to the version so publishing it is a rename on the same file system.
+#
+#  @param newVersionPath [ str | None | in  ] - Path of the version being released.
+#
+#  @exception N/A
+#
+#  @return str - Path.
+def getStagingPath(newVersionPath):
+
+    newVersionPath = os.path.normpath(newVersionPath)
+
+    return os.path.join(os.path.dirname(newVersionPath),
+                        '.{}{}{}.{}'.format(os.path.basename(newVersionPath), STAGING_INFIX, socket.gethostname(), os.getpid()))
+
+#
+## @brief Whether given staging directory has been left behind by an interrupted release.
+#
+#  @param stagingPath [ str | None | in  ] - Path of a staging directory.
+#
+#  @exception N/A
+#
+#  @return bool - Result.
+def isStagingPathStale(stagingPath):
+
+    try:
+        host, pid = os.path.basename(stagingPath).split(STAGING_INFIX, 1)[1].rsplit('.', 1)
+        pid       = int(pid)
+    except (IndexError, ValueError):
+        return False
+
+    if host == socket.gethostname() and os.name == 'posix':
+        if pid == os.getpid():
+            return False
+
+        try:
+            os.kill(pid, 0)
+        except OSError as error:
+            # EPERM means the process exists but belongs to another user
+            return error.errno != errno.EPERM
+
+        return False
+
+    try:
+        return time.time() - os.path.getmtime(stagingPath) > STALE_STAGING_AGE
+    except OSError:
+        return False
+
+#
+## @brief Get staging directories of the version being released left behind by interrupted releases.
+#
+#  @param newVersionPath [ str | None | in  ] - Path of the version being released.
+#
+#  @exception N/A
+#
+#  @return list of str - Paths, most recently modified first.
+def getStaleStagingPaths(newVersionPath):
+
+    newVersionPath      = os.path.normpath(newVersionPath)
+    packageVersionsPath = os.path.dirname(newVersionPath)
+    prefix              = '.{}{}'.format(os.path.basename(newVersionPath), STAGING_INFIX)
+
+    if not os.path.isdir(packageVersionsPath):
+        return []
+
+    stagingPaths = []
+
+    for name in os.listdir(packageVersionsPath):
+
+        stagingPath = os.path.join(packageVersionsPath, name)
+        if not name.startswith(prefix) or not isStagingPathStale(stagingPath):
+            continue
+
+        try:
+            stagingPaths.append((os.path.getmtime(stagingPath), stagingPath))
+        except OSError:
+            continue
+
+    return [stagingPath for mtime, stagingPath in sorted(stagingPaths, reverse=True)]
+
+#
+## @brief Remove staging directories left behind by interrupted releases.
+#
+#  @param packageVersionsPath [ str | None | in  ] - Path that contains released version directories of a package.
+#
+#  @exception N/A
+#
+#  @return list of str - Removed paths.
+def removeStaleStagingPaths(packageVersionsPath):
+
+    if not os.path.isdir(packageVersionsPath):
+        return []
+
+    removedPaths = []
+
+    for name in os.listdir(packageVersionsPath):
+
+        if not name.startswith('.') or not STAGING_INFIX in name:
+            continue
+
+        stagingPath = os.path.join(packageVersionsPath, name)
+        if not isStagingPathStale(stagingPath):
+            continue
+
+        try:
+            removeTree(stagingPath)
+        except OSError:
+            continue
+
+        removedPaths.append(stagingPath)
+
+    return removedPaths
+
+#
+## @brief Publish a staging directory as the released version with a single rename.
+#
+#  @param stagingPath    [ str | None | in  ] - Path of the staging directory.
+#  @param newVersionPath [ str | None | in  ] - Path of the version being released.
+#
+#  @exception OSError - If the version already exists or the rename fails.
+#
+#  @return None - None.
+def publish(stagingPath, newVersionPath):
+
+    if os.path.exists(newVersionPath):
+        raise OSError('Version has been released by another process meanwhile: {}'.format(newVersionPath))
+
+    os.rename(stagingPath, newVersionPath)
@@ -0,0 +1,379 @@
+#
+# Copyright 2020 Safak Oner.
+#
+# This library is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# ----------------------------------------------------------------------------------------------------
+# DESCRIPTION
+# ----------------------------------------------------------------------------------------------------
+## @file    mMecoRelease/watchLib.py @brief [ FILE   ] - Package tree watching module.
+## @package mMecoRelease.watchLib    @brief [ MODULE ] - Package tree watching module.
+#
+#  inotify is used on Linux, so nothing is stated while files don't change. Package tree is polled
+#  on other platforms or if inotify can not be used, such as when the watch limit has been reached.
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# IMPORTS
+# ----------------------------------------------------------------------------------------------------
+import os
+import sys
+import time
+import errno
+import select
+import struct
+
+try:
+    import ctypes
+    import ctypes.util
+except ImportError:
+    ctypes = None
+
+import mMecoRelease.scanLib
+
+
+#
+# ----------------------------------------------------------------------------------------------------
+# CODE
+# ----------------------------------------------------------------------------------------------------
+## [ tuple of str ] - Names of the directories that are never watched, same as the ones release files are never scanned from.
+IGNORED_DIRECTORY_NAMES = mMecoRelease.scanLib.VCS_DIRECTORY_NAMES
+
+## [ float ] - Seconds between two scans of the package tree when inotify is not available.
+POLL_INTERVAL           = 1.0
+
+## [ int ] - inotify event flags.
+IN_MODIFY               = 0x00000002
+IN_ATTRIB               = 0x00000004
+IN_CLOSE_WRITE          = 0x00000008
+IN_MOVED_FROM           = 0x00000040
+IN_MOVED_TO             = 0x00000080
+IN_CREATE               = 0x00000100
+IN_DELETE               = 0x00000200
+IN_DELETE_SELF          = 0x00000400
+IN_Q_OVERFLOW           = 0x00004000
+IN_IGNORED              = 0x00008000
+IN_ONLYDIR              = 0x01000000
+IN_ISDIR                = 0x40000000
+IN_CLOEXEC              = 0x00080000
+
+## [ int ] - inotify events watched directories are registered with.
+WATCH_MASK              = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | \
+                          IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR
+
+## [ str ] - Format of the fixed size part of an inotify event, wd, mask, cookie and length of the name.
+_EVENT_FORMAT           = 'iIII'
+
+## [ int ] - Size of the fixed size part of an inotify event.
+_EVENT_SIZE             = struct.calcsize(_EVENT_FORMAT)
+
+#
+## @brief Load C library functions of inotify.
+#
+#  @exception N/A
+#
+#  @return ctypes.CDLL - Library.
+#  @return None        - If inotify is not available.
+def _loadInotify():
+
+    if not ctypes or not sys.platform.startswith('linux'):
+        return None
+
+    try:
+        _libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    except OSError:
+        return None
+
+    if not hasattr(_libc, 'inotify_init1') or not hasattr(_libc, 'inotify_add_watch'):
+        return None
+
+    _libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+
+    return _libc
+
+#
+## @brief [ CLASS ] - Class to wait for changes in a package tree.
+class PackageWatcher(object):
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Constructor.
+    #
+    #  @param packageRoot [ str  | None  | in  ] - Root of the package.
+    #  @param usePolling  [ bool | False | in  ] - Whether to poll the package tree even if inotify is available.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def __init__(self, packageRoot, usePolling=False):
+
+        ## [ str ] - Root of the package.
+        self._packageRoot   = os.path.normpath(packageRoot)
+
+        ## [ ctypes.CDLL ] - C library inotify functions are called from, None if the package tree is polled.
+        self._libc          = None
+
+        ## [ int ] - inotify file descriptor, None if the package tree is polled.
+        self._descriptor    = None
+
+        ## [ dict ] - Keys are inotify watch descriptors, values are relative paths of the watched directories.
+        self._directories   = {}
+
+        ## [ dict ] - Keys are relative paths, values are tuples of size and modification time, used when polling.
+        self._snapshot      = None
+
+        _libc = None if usePolling else _loadInotify()
+
+        if _libc:
+            descriptor = _libc.inotify_init1(IN_CLOEXEC)
+            if descriptor >= 0:
+                self._libc       = _libc
+                self._descriptor = descriptor
+
+                if not self._addWatches(''):
+                    self.close()
+
+        if self._descriptor is None:
+            self._snapshot = self._takeSnapshot()
+
+    #
+    ## @brief Walk directories of the package tree, ignored directories are skipped.
+    #
+    #  @param relativePath [ str | None | in  ] - Relative path of the directory to start from.
+    #
+    #  @exception N/A
+    #
+    #  @return generator - Tuples of relative path of a directory and names of its files.
+    def _walk(self, relativePath):
+
+        for directory, directoryNames, fileNames in os.walk(os.path.join(self._packageRoot, relativePath)):
+
+            directoryNames[:] = [name for name in directoryNames if not name in IGNORED_DIRECTORY_NAMES]
+
+            directory = os.path.relpath(directory, self._packageRoot)
+
+            yield '' if directory == os.curdir else directory, fileNames
+
+    #
+    ## @brief Add inotify watches to a directory and its sub directories.
+    #
+    #  @param relativePath [ str        | None | in  ] - Relative path of the directory.
+    #  @param changedPaths [ set of str | None | in  ] - Files found in the directories are added, as they may have been created before being watched.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Whether all directories are watched, False if the watch limit has been reached.
+    def _addWatches(self, relativePath, changedPaths=None):
+
+        for directory, fileNames in self._walk(relativePath):
+
+            path = os.path.join(self._packageRoot, directory)
+            if not isinstance(path, bytes):
+                path = path.encode(sys.getfilesystemencoding())
+
+            watchDescriptor = self._libc.inotify_add_watch(self._descriptor, path, WATCH_MASK)
+            if watchDescriptor < 0:
+                if ctypes.get_errno() in (errno.ENOSPC, errno.ENOMEM):
+                    return False
+                # Directory has been removed meanwhile
+                continue
+
+            self._directories[watchDescriptor] = directory
+
+            if changedPaths is not None:
+                changedPaths.update([os.path.join(directory, name) for name in fileNames])
+
+        return True
+
+    #
+    ## @brief Read pending inotify events.
+    #
+    #  Package tree is polled from now on if a new directory can't be watched.
+    #
+    #  @exception N/A
+    #
+    #  @return set of str - Relative paths of the changed files and directories.
+    def _readEvents(self):
+
+        changedPaths = set()
+
+        try:
+            buffer = os.read(self._descriptor, 64 * 1024)
+        except OSError as error:
+            if error.errno == errno.EINTR:
+                return changedPaths
+            raise
+
+        offset = 0
+
+        while offset + _EVENT_SIZE <= len(buffer):
+
+            watchDescriptor, mask, cookie, length = struct.unpack_from(_EVENT_FORMAT, buffer, offset)
+            name   = buffer[offset + _EVENT_SIZE:offset + _EVENT_SIZE + length].split(b'\0', 1)[0]
+            offset = offset + _EVENT_SIZE + length
+
+            if not isinstance(name, str):
+                name = name.decode(sys.getfilesystemencoding())
+
+            if mask & IN_Q_OVERFLOW:
+                # Events have been dropped, whole package is considered changed
+                changedPaths.add('')
+                continue
+
+            directory = self._directories.get(watchDescriptor)
+            if directory is None:
+                continue
+
+            if mask & IN_IGNORED:
+                del self._directories[watchDescriptor]
+                continue
+
+            if name in IGNORED_DIRECTORY_NAMES:
+                continue
+
+            relativePath = os.path.join(directory, name) if name else directory
+            changedPaths.add(relativePath)
+
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                if not self._addWatches(relativePath, changedPaths):
+                    # Watch limit has been reached, package tree is polled from now on
+                    # so changes in the directories that can't be watched aren't missed
+                    self.close()
+                    self._snapshot = self._takeSnapshot()
+                    changedPaths.add('')
+                    break
+
+        return changedPaths
+
+    #
+    ## @brief Get size and modification time of all files in the package tree.
+    #
+    #  @exception N/A
+    #
+    #  @return dict - Keys are relative paths, values are tuples of size and modification time.
+    def _takeSnapshot(self):
+
+        snapshot = {}
+
+        for directory, fileNames in self._walk(''):
+            for name in fileNames:
+
+                relativePath = os.path.join(directory, name)
+
+                try:
+                    fileStat = os.stat(os.path.join(self._packageRoot, relativePath))
+                except OSError:
+                    continue
+
+                snapshot[relativePath] = (fileStat.st_size, fileStat.st_mtime)
+
+        return snapshot
+
+    #
+    ## @brief Scan the package tree and compare it to the previous scan.
+    #
+    #  @exception N/A
+    #
+    #  @return set of str - Relative paths of the changed files.
+    def _poll(self):
+
+        snapshot       = self._takeSnapshot()
+        changedPaths   = set([relativePath for relativePath, value in snapshot.items() if self._snapshot.get(relativePath) != value])
+        changedPaths.update(set(self._snapshot.keys()) - set(snapshot.keys()))
+        self._snapshot = snapshot
+
+        return changedPaths
+
+    #
+    ## @brief Wait for changes.
+    #
+    #  @param timeout [ float | None | in  ] - Seconds to wait, waits until a change if None.
+    #
+    #  @exception N/A
+    #
+    #  @return set of str - Relative paths of the changed files, empty if none has changed in time.
+    def _waitForChanges(self, timeout):
+
+        if self._descriptor is not None:
+            readable = select.select([self._descriptor], [], [], timeout)[0]
+            return self._readEvents() if readable else set()
+
+        startTime = time.time()
+
+        while True:
+            changedPaths = self._poll()
+            if changedPaths:
+                return changedPaths
+
+            if timeout is not None and time.time() - startTime >= timeout:
+                return changedPaths
+
+            time.sleep(POLL_INTERVAL if timeout is None else min(POLL_INTERVAL, timeout))
+
+    #
+    # ------------------------------------------------------------------------------------------------
+    # PUBLIC METHODS
+    # ------------------------------------------------------------------------------------------------
+    #
+    ## @brief Whether inotify is used rather than polling.
+    #
+    #  @exception N/A
+    #
+    #  @return bool - Result.
+    def usesInotify(self):
+
+        return self._descriptor is not None
+
+    #
+    ## @brief Wait until files change and no further change happens for a while.
+    #
+    #  Editors usually write a file in several steps, changes are collected until the tree is quiet
+    #  so they are reported once.
+    #
+    #  @param debounce [ float | 0.5 | in  ] - Seconds the package tree has to be quiet.
+    #
+    #  @exception N/A
+    #
+    #  @return list of str - Sorted relative paths of the changed files and directories, empty string stands for the whole package.
+    def wait(self, debounce=0.5):
+
+        changedPaths = self._waitForChanges(None)
+
+        while True:
+            pendingPaths = self._waitForChanges(debounce)
+            if not pendingPaths:
+                break
+
+            changedPaths.update(pendingPaths)
+
+        return sorted(changedPaths)
+
+    #
+    ## @brief Stop watching.
+    #
+    #  @exception N/A
+    #
+    #  @return None - None.
+    def close(self):
+
+        if self._descriptor is None:
+            return
+
+        os.close(self._descriptor)
+
+        self._descriptor  = None
+        self._directories = {}